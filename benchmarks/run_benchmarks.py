@@ -0,0 +1,329 @@
+"""Offline benchmark suite of gistyc (against the local stand-in of the GIST REST API).
+
+Usage:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --gists 1000 --files 100 --file-sizes-mb 1 --latency 0.02
+
+Each benchmark result contains the wall time, the number of REST API calls, the transferred bytes
+and a throughput, so regressions in speed and request counts can be tracked over time.
+"""
+
+# Import standard libraries
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as t
+
+# Run from a source checkout without installing the package: the repository root is added to
+# the module search path (of this and of the fresh interpreters of the import time benchmark)
+REPO_ROOT = str(pathlib.Path(__file__).resolve().parents[1])
+sys.path.insert(0, REPO_ROOT)
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, os.getenv("PYTHONPATH")]))
+
+# Import GISTyc
+from gistyc import GISTyc  # noqa: E402
+from gistyc.blocks import gist_body  # noqa: E402
+from gistyc.cli import dir_run  # noqa: E402
+from gistyc.testing import FakeGistAPI, import_time  # noqa: E402
+
+# Any token is accepted by the fake API
+AUTH_TOKEN = "benchmark"
+
+
+def _result(
+    name: str,
+    params: t.Dict[str, t.Any],
+    seconds: float,
+    calls: t.Sequence[t.Any],
+    items: int,
+    **extra: t.Any,
+) -> t.Dict[str, t.Any]:
+    """Create a benchmark result.
+
+    Parameters
+    ----------
+    name : str
+        Name of the benchmark.
+    params : dict
+        Parameters of the benchmark.
+    seconds : float
+        Wall time in seconds.
+    calls : sequence
+        Calls answered by the fake API (see FakeCall).
+    items : int
+        Number of processed items (GISTs, bytes or files) for the throughput.
+    **extra : t.Any
+        Further result values.
+
+    Returns
+    -------
+    dict
+        Benchmark result.
+
+    """
+    return {
+        "name": name,
+        "params": params,
+        "seconds": round(seconds, 6),
+        "requests": len(calls),
+        "bytes_sent": sum(call.bytes_sent for call in calls),
+        "bytes_received": sum(call.bytes_received for call in calls),
+        "throughput": round(items / seconds, 3) if seconds else None,
+        **extra,
+    }
+
+
+def bench_get_gists(gist_count: int, latency: float) -> t.List[t.Dict[str, t.Any]]:
+    """Benchmark the listing of all GISTs (cold and revalidated with the persistent index).
+
+    Parameters
+    ----------
+    gist_count : int
+        Number of GISTs.
+    latency : float
+        Latency of the fake API in seconds.
+
+    Returns
+    -------
+    list
+        Results of the cold listing, the cold indexed listing and the revalidated listing.
+
+    """
+    results = []
+    with FakeGistAPI(latency=latency) as fake_api, tempfile.TemporaryDirectory() as cache_dir:
+        fake_api.add_gists(gist_count)
+        params = {"gists": gist_count, "latency": latency}
+
+        for name, index_dir in (
+            ("get_gists", None),
+            ("get_gists_indexed_cold", cache_dir),
+            ("get_gists_indexed_warm", cache_dir),
+        ):
+            with GISTyc(AUTH_TOKEN, api_url=fake_api.url, cache_dir=index_dir) as gist_api:
+                first_call = len(fake_api.calls)
+                start_time = time.perf_counter()
+                gists = gist_api.get_gists()
+                seconds = time.perf_counter() - start_time
+            assert len(gists) == gist_count  # nosec
+            results.append(_result(name, params, seconds, fake_api.calls[first_call:], gist_count))
+
+    return results
+
+
+def bench_import_time(repeat: int = 5) -> t.List[t.Dict[str, t.Any]]:
+    """Benchmark the import of the package and of the CLI (python -X importtime).
+
+    Parameters
+    ----------
+    repeat : int, optional
+        Number of fresh interpreters; the fastest import is taken. The default is 5.
+
+    Returns
+    -------
+    list
+        Results of "import gistyc" and "import gistyc.cli".
+
+    """
+    results = []
+    for module in ("gistyc", "gistyc.cli"):
+        import_times = import_time(f"import {module}", repeat=repeat)
+        results.append(
+            _result(
+                f"import_{module.replace('.', '_')}",
+                {"repeat": repeat},
+                import_times[module],
+                [],
+                1,
+                modules=len(import_times),
+            )
+        )
+
+    return results
+
+
+def bench_readnparse(size_mb: int, block_lines: int = 50) -> t.Dict[str, t.Any]:
+    """Benchmark the parsing of a large file into code blocks.
+
+    Parameters
+    ----------
+    size_mb : int
+        Size of the file in MiB.
+    block_lines : int, optional
+        Number of lines per code block. The default is 50.
+
+    Returns
+    -------
+    dict
+        Result with the throughput in bytes per second and the peak memory.
+
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        # Write a synthetic Python file with code blocks
+        file_path = pathlib.Path(tmp_dir) / "large.py"
+        line = "print('gistyc benchmark line')  # " + "x" * 40 + "\n"
+        block = line * block_lines + "#%%\n"
+        with open(file_path, "w", encoding="utf-8") as file_obj:
+            for _ in range((size_mb << 20) // len(block) + 1):
+                file_obj.write(block)
+        size = file_path.stat().st_size
+
+        # Parse the file and measure the peak memory
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        data = gist_body(file_path)
+        seconds = time.perf_counter() - start_time
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return _result(
+        "readnparse_python_file",
+        {"size_mb": size_mb, "block_lines": block_lines},
+        seconds,
+        [],
+        size,
+        blocks=len(data["files"]),
+        peak_memory_bytes=peak_memory,
+    )
+
+
+def _invoke_dir_run(args: t.List[str]) -> None:
+    """Invoke the gistyc_dir CLI in-process (without its output).
+
+    Parameters
+    ----------
+    args : list
+        CLI arguments.
+
+    Returns
+    -------
+    None.
+
+    """
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        try:
+            dir_run.main(args, standalone_mode=False)
+        except SystemExit as error:
+            if error.code:
+                raise RuntimeError(f"gistyc_dir failed with exit code {error.code}") from error
+
+
+def bench_dir_run(file_count: int, latency: float, jobs: int = 8) -> t.List[t.Dict[str, t.Any]]:
+    """Benchmark gistyc_dir over a synthetic directory tree.
+
+    Three runs are measured: the initial run creates all GISTs, the second run skips all files
+    based on the sync manifest and the third run (--full) compares all files with their GISTs.
+
+    Parameters
+    ----------
+    file_count : int
+        Number of files in the tree.
+    latency : float
+        Latency of the fake API in seconds.
+    jobs : int, optional
+        Number of parallel workers. The default is 8.
+
+    Returns
+    -------
+    list
+        Results of the three runs.
+
+    """
+    results = []
+    with FakeGistAPI(latency=latency) as fake_api, tempfile.TemporaryDirectory() as tmp_dir:
+
+        # Write a tree of files with three code blocks each (100 files per directory)
+        tree = pathlib.Path(tmp_dir) / "tree"
+        for index in range(file_count):
+            file_path = tree / f"dir{index // 100}" / f"script{index}.py"
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(
+                f"import time\n#%%\nprint({index})\n#%%\nprint(time.time())\n", encoding="utf-8"
+            )
+
+        args = [
+            "--auth-token",
+            AUTH_TOKEN,
+            "--directory",
+            str(tree),
+            "--api-url",
+            fake_api.url,
+            "--cache-dir",
+            str(pathlib.Path(tmp_dir) / "cache"),
+            "--jobs",
+            str(jobs),
+            "--mutation-interval",
+            "0",
+        ]
+        params = {"files": file_count, "latency": latency, "jobs": jobs}
+        for name, extra_args in (
+            ("dir_run_create", []),
+            ("dir_run_unchanged", []),
+            ("dir_run_full", ["--full"]),
+        ):
+            first_call = len(fake_api.calls)
+            start_time = time.perf_counter()
+            _invoke_dir_run(args + extra_args)
+            seconds = time.perf_counter() - start_time
+            results.append(_result(name, params, seconds, fake_api.calls[first_call:], file_count))
+
+    return results
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    """Run the benchmarks and write the results as JSON.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Command line arguments. The default is None, i.e., sys.argv.
+
+    Returns
+    -------
+    int
+        Exit code.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gists", type=int, nargs="*", default=[1000, 10000])
+    parser.add_argument("--file-sizes-mb", type=int, nargs="*", default=[1, 10])
+    parser.add_argument("--files", type=int, nargs="*", default=[100, 1000, 5000])
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency of the fake API")
+    parser.add_argument("--jobs", type=int, default=8, help="Workers of gistyc_dir")
+    parser.add_argument("--output", default="-", help="Output file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = bench_import_time()
+    for gist_count in args.gists:
+        results.extend(bench_get_gists(gist_count, args.latency))
+    for size_mb in args.file_sizes_mb:
+        results.append(bench_readnparse(size_mb))
+    for file_count in args.files:
+        results.extend(bench_dir_run(file_count, args.latency, args.jobs))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+    report_json = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(report_json)
+    else:
+        pathlib.Path(args.output).write_text(report_json + "\n", encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,91 @@
-"""Main init."""
+"""Main init.
+
+The public classes and the cli module are imported on first access (see __getattr__), so
+"import gistyc" and the CLI startup do not pay for unused dependencies (e.g., aiohttp).
+"""
+
+# Import standard libraries
+import importlib
+import typing as t
 
 __project__ = "GISTyc"
 __author__ = "Dr.-Ing. Thomas Albin"
 __version__ = 1.3
 
-from gistyc.gistyc import GISTyc, GISTAmbiguityError
-from . import cli
+# Base URL of the GitHub REST API (default of the clients and the CLI)
+GITHUB_API_URL = "https://api.github.com"
+
+# Public name -> module of its definition
+_LAZY_ATTRIBUTES = {
+    "GISTyc": "gistyc.gistyc",
+    "GISTAmbiguityError": "gistyc.gistyc",
+    "GISTCatalog": "gistyc.gistyc",
+    "GISTNotFoundError": "gistyc.gistyc",
+    "AsyncGISTyc": "gistyc.aio",
+    "PlanItem": "gistyc.sync",
+    "SyncEngine": "gistyc.sync",
+    "SyncResult": "gistyc.sync",
+    "GISTMirror": "gistyc.mirror",
+    "MirrorResult": "gistyc.mirror",
+    "DirectoryWatcher": "gistyc.watch",
+    "CallLog": "gistyc.instrument",
+    "GISTEvent": "gistyc.instrument",
+    "StatsCollector": "gistyc.instrument",
+}
+
+# Submodules that are available as attributes
+_LAZY_MODULES = {"aio", "blocks", "cache", "cli", "gistyc", "index", "instrument", "mirror"}
+_LAZY_MODULES |= {"ratelimit", "sync", "testing", "watch"}
+
+__all__ = sorted(_LAZY_ATTRIBUTES) + ["cli"]
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from gistyc import cli
+    from gistyc.aio import AsyncGISTyc
+    from gistyc.gistyc import GISTAmbiguityError, GISTCatalog, GISTNotFoundError, GISTyc
+    from gistyc.instrument import CallLog, GISTEvent, StatsCollector
+    from gistyc.mirror import GISTMirror, MirrorResult
+    from gistyc.sync import PlanItem, SyncEngine, SyncResult
+    from gistyc.watch import DirectoryWatcher
+
+
+def __getattr__(name: str) -> t.Any:
+    """Import a public class or a submodule on first access.
+
+    Parameters
+    ----------
+    name : str
+        Attribute name.
+
+    Raises
+    ------
+    AttributeError
+        Exception raised if the attribute does not exist.
+
+    Returns
+    -------
+    t.Any
+        Class or module. It is cached in the module namespace.
+
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif name in _LAZY_MODULES:
+        value = importlib.import_module(f"gistyc.{name}")
+    else:
+        raise AttributeError(f"module 'gistyc' has no attribute '{name}'")
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> t.List[str]:
+    """List the module attributes, including the lazily imported ones.
+
+    Returns
+    -------
+    list
+        Attribute names.
+
+    """
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_MODULES)
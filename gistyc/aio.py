@@ -0,0 +1,547 @@
+"""Asyncio-native GISTyc client (requires aiohttp)."""
+
+# Import standard libraries
+import asyncio
+import json
+from pathlib import Path
+import typing as t
+
+# Import installed libraries (optional dependency)
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+# Import GISTyc
+from gistyc.blocks import diff_blocks, gist_body, gist_file_name, iter_blocks
+from gistyc.gistyc import (
+    GITHUB_API_URL,
+    GISTAmbiguityError,
+    GISTCatalog,
+    GISTNotFoundError,
+    last_page_number,
+)
+from gistyc.ratelimit import RateLimitBudget, RateLimiter
+
+
+class AsyncGISTyc:
+    """Access the GitHub GIST REST API with asyncio to create, update and delete GISTs.
+
+    AsyncGISTyc provides the same methods as GISTyc as coroutines. Parsing, diffing and file name
+    look-ups are shared with GISTyc. The number of concurrent requests is limited, so many files
+    can be processed with asyncio.gather, e.g.:
+
+        async with AsyncGISTyc(auth_token=AUTH_TOKEN, concurrency=8) as gist_api:
+            await asyncio.gather(*[gist_api.update_gist(file_name=k) for k in file_names])
+
+    """
+
+    def __init__(
+        self,
+        auth_token: str,
+        api_url: str = GITHUB_API_URL,
+        session: t.Optional["aiohttp.ClientSession"] = None,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        concurrency: int = 8,
+        rate_limiter: t.Optional[RateLimiter] = None,
+    ) -> None:
+        """Initiate the AsyncGISTyc class with the GitHub GIST REST API token.
+
+        Parameters
+        ----------
+        auth_token : str
+            Authentication token of the GitHub GIST REST API.
+        api_url : str, optional
+            Base URL of the REST API. The default is "https://api.github.com".
+        session : aiohttp.ClientSession, optional
+            Externally configured session that is used for all calls. The session is not closed
+            by AsyncGISTyc. The default is None, i.e., a pooled session is created on first use.
+        pool_size : int, optional
+            Maximum number of pooled connections. The default is 10.
+        timeout : float, optional
+            Total timeout of a request in seconds. The default is 30.0.
+        concurrency : int, optional
+            Maximum number of concurrent requests. The default is 8.
+        rate_limiter : RateLimiter, optional
+            Scheduler that tracks the rate limit budget, spaces content-creating requests and
+            retries rate limited requests. The default is None, i.e., RateLimiter().
+
+        Raises
+        ------
+        ImportError
+            Exception raised if aiohttp is not installed.
+
+        Returns
+        -------
+        None.
+
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncGISTyc requires aiohttp: pip install gistyc[async]")
+
+        # Set the authentication token, the REST API base url and the default header
+        self.auth_token = auth_token
+        self.api_url = api_url.rstrip("/")
+        self._headers = {"Authorization": f"token {auth_token}"}
+
+        # Set the connection pool settings. The session must be created within the event loop
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._owns_session = session is None
+        self._session = session
+
+        # Limit the number of concurrent requests. The semaphore is created within the event loop
+        self.concurrency = concurrency
+        self._semaphore: t.Optional[asyncio.Semaphore] = None
+
+        # Catalog of all GISTs; built by the first get_catalog call (the lock is created within
+        # the event loop) and kept up to date by all create, update and delete calls
+        self._catalog: t.Optional[GISTCatalog] = None
+        self._catalog_lock: t.Optional[asyncio.Lock] = None
+
+        # Set the scheduler of all REST API calls
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+    async def __aenter__(self) -> "AsyncGISTyc":
+        """Enter the asynchronous context manager.
+
+        Returns
+        -------
+        AsyncGISTyc
+            The instance itself.
+
+        """
+        return self
+
+    async def __aexit__(self, *exc_info: t.Any) -> None:
+        """Exit the asynchronous context manager and close the pooled connections.
+
+        Parameters
+        ----------
+        *exc_info : t.Any
+            Exception information (unused).
+
+        Returns
+        -------
+        None.
+
+        """
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled connections (only if the session has been created by AsyncGISTyc).
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """Return the HTTP session, which is created on first use.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            HTTP session.
+
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+        return self._session
+
+    async def _request(
+        self, method: str, path: str, **kwargs: t.Any
+    ) -> t.Tuple[int, t.Mapping[str, t.Any], t.Any]:
+        """Send a REST API call through the pooled session and the rate limit scheduler.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method, e.g., "GET".
+        path : str
+            REST API path, e.g., "/gists".
+        **kwargs : t.Any
+            Further keyword arguments for aiohttp.ClientSession.request.
+
+        Returns
+        -------
+        status : int
+            HTTP response code.
+        links : Mapping
+            Parsed "Link" header.
+        resp_data : t.Any
+            Decoded JSON response. None, if the response has no body.
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        attempt = 0
+        while True:
+
+            # Wait for the reserved time slot (without blocking the event loop)
+            await asyncio.sleep(self.rate_limiter.reserve(method))
+            async with self._semaphore:
+                async with self.session.request(
+                    method, f"{self.api_url}{path}", headers=self._headers, **kwargs
+                ) as resp:
+                    resp_text = await resp.text()
+
+            # Update the rate limit budget and retry the request if it has been rate limited (or
+            # failed with a server error)
+            retry_delay = self.rate_limiter.update(
+                resp.status, resp.headers, attempt, resp_text, method=method
+            )
+            if retry_delay is None:
+                resp_data = json.loads(resp_text) if resp_text else None
+
+                return resp.status, resp.links, resp_data
+
+            await asyncio.sleep(retry_delay)
+            attempt += 1
+
+    async def _get_raw(self, url: str) -> str:
+        """Get the complete content of a (truncated) GIST file through its raw URL.
+
+        Parameters
+        ----------
+        url : str
+            Raw URL of the GIST file.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            Exception raised if the content could not be fetched.
+
+        Returns
+        -------
+        str
+            File content.
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            async with self.session.get(url, headers=self._headers) as resp:
+                resp.raise_for_status()
+
+                return await resp.text()
+
+    @property
+    def rate_limit(self) -> RateLimitBudget:
+        """Return the current rate limit budget (as reported by the last response).
+
+        Returns
+        -------
+        RateLimitBudget
+            Limit, remaining requests, reset time and number of retries.
+
+        """
+        return self.rate_limiter.budget
+
+    async def get_gists(self) -> t.List[t.Dict]:
+        """Get all GISTs information like e.g., ID, url, meta information, etc.
+
+        The first page provides the number of pages. All remaining pages are then fetched
+        concurrently.
+
+        Returns
+        -------
+        resp_data : list
+            List of GISTs. Each GIST is a dictionary with miscellaneous data and meta data.
+
+        """
+        # Get the first page and the number of the last page
+        _, links, resp_data = await self._request("GET", "/gists?page=1&per_page=100")
+        last_page = last_page_number(links)
+
+        # Fetch the remaining pages concurrently; gather() keeps the order of the pages
+        pages = await asyncio.gather(
+            *[
+                self._request("GET", f"/gists?page={page}&per_page=100")
+                for page in range(2, last_page + 1)
+            ]
+        )
+        for _, _, resp_content in pages:
+            resp_data.extend(resp_content)
+
+        return resp_data
+
+    async def get_catalog(self, refresh: bool = False) -> GISTCatalog:
+        """Get a catalog of all GISTs for fast file name look-ups.
+
+        The catalog is built from the listing once and cached on the instance, see
+        GISTyc.get_catalog.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            Rebuild the catalog from the current listing. The default is False.
+
+        Returns
+        -------
+        GISTCatalog
+            Catalog of all GISTs.
+
+        """
+        if self._catalog_lock is None:
+            self._catalog_lock = asyncio.Lock()
+
+        # Concurrent look-ups wait for a single listing
+        async with self._catalog_lock:
+            if self._catalog is None or refresh:
+                self._catalog = GISTCatalog(await self.get_gists())
+
+            return self._catalog
+
+    async def _get_gist_id(self, file_name: Path, gist_id: t.Optional[str] = None) -> str:
+        """Get the GIST ID of a given file name (if applicable). Otherwise return the input GIST ID.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            File name path.
+        gist_id : str, optional
+            GIST ID. The default is None.
+
+        Raises
+        ------
+        GISTAmbiguityError
+            Exception raised if a file name has more than 1 GIST IDs.
+        GISTNotFoundError
+            Exception raised if no GIST contains the file name.
+
+        Returns
+        -------
+        str
+            File name corresponding GIST ID (or input GIST ID).
+
+        """
+        if gist_id is not None:
+            return gist_id
+
+        # A cached catalog is refreshed once on a miss (the GIST may have been created elsewhere)
+        core_file_name = gist_file_name(file_name)
+        cached = self._catalog is not None
+        gist_ids = (await self.get_catalog()).gist_ids(core_file_name)
+        if not gist_ids and cached:
+            gist_ids = (await self.get_catalog(refresh=True)).gist_ids(core_file_name)
+
+        if not gist_ids:
+            raise GISTNotFoundError(core_file_name, "No GIST found for the file name")
+        if len(gist_ids) > 1:
+            raise GISTAmbiguityError(gist_ids_list=gist_ids)
+
+        return gist_ids[0]
+
+    async def create_gist(
+        self, file_name: t.Union[Path, str], sep: t.Optional[str] = None
+    ) -> t.Dict:
+        """Create a GISTs from a given file.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        sep : str, optional
+            Code block separator. The default is None, i.e., the separator convention of the
+            file's language (see gistyc.blocks), e.g., '#%%' for Python files.
+
+        Returns
+        -------
+        resp_data : dict
+            GIST REST API response.
+
+        """
+        # Read the file (without blocking the event loop) and create the GIST
+        rest_api_data = await asyncio.get_running_loop().run_in_executor(
+            None, gist_body, file_name, sep
+        )
+        resp_status, _, resp_data = await self._request(
+            "POST", "/gists", data=json.dumps(rest_api_data)
+        )
+
+        # Add the new GIST to the catalog
+        if self._catalog is not None and resp_status < 400:
+            self._catalog.add(resp_data)
+
+        return resp_data
+
+    async def diff_gist(
+        self, file_name: t.Union[Path, str], gist_id: t.Optional[str] = None
+    ) -> t.Dict[str, t.Any]:
+        """Get the files (code blocks) of a local file that differ from its GIST.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        gist_id : str, optional
+            GIST ID that is needed if the file name appears more than once in the GIST repository.
+            The default is None.
+
+        Returns
+        -------
+        changed_files : dict
+            Changed and vanished (None) files (code blocks). Empty, if the GIST is unchanged.
+
+        """
+        _, changed_files, _ = await self._diff_gist(Path(file_name), gist_id)
+
+        return changed_files
+
+    async def _diff_gist(
+        self, file_name: Path, gist_id: t.Optional[str] = None
+    ) -> t.Tuple[str, t.Dict[str, t.Any], t.Dict]:
+        """Compare a local file with its GIST.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Absolute or relative path name of the file to read.
+        gist_id : str, optional
+            GIST ID. The default is None, i.e., the GIST is looked up by the file name.
+
+        Raises
+        ------
+        GISTNotFoundError
+            Exception raised if the GIST does not exist (anymore).
+        RuntimeError
+            Exception raised if the GIST could not be fetched.
+
+        Returns
+        -------
+        gist_id : str
+            GIST ID.
+        changed_files : dict
+            Changed files (code blocks), see gistyc.blocks.diff_files.
+        remote_gist : dict
+            Current GIST (REST API response).
+
+        """
+        gist_id = await self._get_gist_id(file_name, gist_id)
+        resp_status, _, remote_gist = await self._request("GET", f"/gists/{gist_id}")
+
+        # A deleted GIST is removed from the catalog
+        if resp_status == 404:
+            if self._catalog is not None:
+                self._catalog.remove(gist_id)
+            raise GISTNotFoundError(gist_id)
+        if resp_status >= 400:
+            message = (remote_gist or {}).get("message", "")
+            raise RuntimeError(f"GIST {gist_id} could not be fetched ({resp_status}): {message}")
+
+        # Get the complete contents of truncated files through their raw URLs (concurrently)
+        remote_files = remote_gist.get("files", {})
+        truncated_names = [name for name, file in remote_files.items() if file.get("truncated")]
+        contents = await asyncio.gather(
+            *[self._get_raw(remote_files[name]["raw_url"]) for name in truncated_names]
+        )
+        full_contents = dict(zip(truncated_names, contents))
+
+        # Stream and compare the code blocks without blocking the event loop
+        changed_files = await asyncio.get_running_loop().run_in_executor(
+            None,
+            diff_blocks,
+            iter_blocks(file_name),
+            remote_files,
+            gist_file_name(file_name),
+            full_contents.get,
+        )
+
+        return gist_id, changed_files, remote_gist
+
+    async def update_gist(
+        self,
+        file_name: t.Union[Path, str],
+        gist_id: t.Optional[str] = None,
+        files: t.Optional[t.Dict[str, t.Any]] = None,
+        force: bool = False,
+    ) -> t.Dict:
+        """Update a GISTs based on its file name or GIST ID. Unchanged GISTs are not updated.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        gist_id : str, optional
+            GIST ID that is needed if the file name appears more than once in the GIST repository.
+            The default is None.
+        files : dict, optional
+            Changed files as returned by diff_gist. The default is None, i.e., the changed files
+            are determined.
+        force : bool, optional
+            Send all files (code blocks), even if they are unchanged. The default is False.
+
+        Returns
+        -------
+        resp_data : dict
+            GIST REST API response (or the current GIST, if nothing changed).
+
+        """
+        file_name = Path(file_name)
+
+        # Get the GIST ID and the changed files (unless all files shall be sent); skip the update
+        # if nothing changed
+        if files is not None:
+            gist_id = await self._get_gist_id(file_name, gist_id)
+        elif force:
+            gist_id = await self._get_gist_id(file_name, gist_id)
+            files = (
+                await asyncio.get_running_loop().run_in_executor(None, gist_body, file_name, None)
+            )["files"]
+        else:
+            gist_id, files, remote_gist = await self._diff_gist(file_name, gist_id)
+            if not files:
+                return remote_gist
+
+        # Update the GIST
+        resp_status, _, resp_data = await self._request(
+            "PATCH", f"/gists/{gist_id}", data=json.dumps({"files": files})
+        )
+
+        # Update the GIST in the catalog
+        if self._catalog is not None and resp_status < 400:
+            self._catalog.add(resp_data)
+
+        return resp_data
+
+    async def delete_gist(
+        self, file_name: t.Optional[t.Union[Path, str]] = None, gist_id: t.Optional[str] = None
+    ) -> int:
+        """Delete a GIST based on its GIST ID or file name. One input parameter MUST be provided.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str, optional
+            File name of the corresponding GIST to be deleted. The default is None.
+        gist_id : str, optional
+            GIST ID to delete. The default is None
+
+        Returns
+        -------
+        resp_status : int
+            HTTP response code. A successful deletion shall return 204.
+
+        """
+        if file_name:
+            gist_id = await self._get_gist_id(Path(file_name), gist_id)
+
+        resp_status, _, _ = await self._request("DELETE", f"/gists/{gist_id}")
+
+        # Remove the GIST from the catalog
+        if self._catalog is not None and resp_status < 400:
+            self._catalog.remove(t.cast(str, gist_id))
+
+        return resp_status
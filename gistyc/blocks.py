@@ -0,0 +1,877 @@
+"""Streaming parser of code blocks with a registry of language specific splitters."""
+
+# Import standard libraries
+import json
+import os
+from pathlib import Path
+import re
+import typing as t
+
+# Buffer size of the line reader in bytes
+BUFFER_SIZE = 1 << 16
+
+
+def block_file_name(core_file_name: str, index: int) -> str:
+    """Get the GIST file name of a code block.
+
+    Parameters
+    ----------
+    core_file_name : str
+        File name (without the path), e.g., "sample.py".
+    index : int
+        Index of the code block.
+
+    Returns
+    -------
+    str
+        File name of the first code block, otherwise the file name with the index as a suffix,
+        e.g., "sample_1.py".
+
+    """
+    if index == 0:
+        return core_file_name
+
+    core_path = Path(core_file_name)
+
+    return f"{core_path.stem}_{index}{core_path.suffix}"
+
+
+class BlockSplitter:
+    """Split source files of a language into code blocks at separator lines.
+
+    A line that matches the separator pattern (at the start of the line, e.g., "#%%" or
+    "#%% Plot") ends a code block; the separator line itself is not part of any block.
+
+    """
+
+    def __init__(self, language: str, separator: str, separator_line: str = "#%%") -> None:
+        """Initiate the splitter.
+
+        Parameters
+        ----------
+        language : str
+            Name of the language, e.g., "Python".
+        separator : str
+            Regular expression of a separator line. The expression is compiled once and matched
+            at the start of each line.
+        separator_line : str, optional
+            Separator line that is inserted between code blocks when they are joined again (see
+            join_blocks). The default is "#%%".
+
+        Returns
+        -------
+        None.
+
+        """
+        self.language = language
+        self.separator = re.compile(separator)
+        self.separator_line = separator_line
+
+    def __repr__(self) -> str:
+        """Return the representation of the splitter.
+
+        Returns
+        -------
+        str
+            Language and separator pattern.
+
+        """
+        return f"BlockSplitter({self.language!r}, {self.separator.pattern!r})"
+
+    def gist_file_name(self, file_name: t.Union[Path, str]) -> str:
+        """Get the GIST file name of the first code block of a file.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Path of the local file.
+
+        Returns
+        -------
+        str
+            File name without the path.
+
+        """
+        return Path(file_name).name
+
+    def iter_blocks(
+        self, file_name: t.Union[Path, str], buffer_size: int = BUFFER_SIZE
+    ) -> t.Iterator[t.Tuple[str, str]]:
+        """Read a file line by line and yield its code blocks one at a time.
+
+        Windows line endings are converted, so only a single code block is held in memory at
+        any time.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        buffer_size : int, optional
+            Buffer size of the line reader in bytes. The default is 64 KiB.
+
+        Returns
+        -------
+        Iterator
+            Tuples of the GIST file name (see block_file_name) and the content of each code
+            block.
+
+        """
+        core_file_name = self.gist_file_name(file_name)
+        is_separator = self.separator.match
+
+        # Open the file with universal newlines ("\r\n" -> "\n") and collect the lines of a block
+        with open(
+            file_name, "r", buffering=buffer_size, encoding="utf-8", newline=None
+        ) as file_obj:
+            index = 0
+            block_lines: t.List[str] = []
+            for line in file_obj:
+
+                # A separator line closes the current block
+                if is_separator(line):
+                    yield block_file_name(core_file_name, index), "".join(block_lines)
+                    index += 1
+                    block_lines = []
+                else:
+                    block_lines.append(line)
+
+            # The last block ends with the file
+            yield block_file_name(core_file_name, index), "".join(block_lines)
+
+    def join_blocks(self, contents: t.Iterable[str]) -> str:
+        """Join code blocks to the content of a single file (the reverse of iter_blocks).
+
+        Parameters
+        ----------
+        contents : iterable
+            Contents of the code blocks in the order of their index.
+
+        Returns
+        -------
+        str
+            File content with a separator line between two code blocks.
+
+        """
+        parts: t.List[str] = []
+        for content in contents:
+            if parts:
+                if parts[-1] and not parts[-1].endswith("\n"):
+                    parts.append("\n")
+                parts.append(f"{self.separator_line}\n")
+            parts.append(content)
+
+        return "".join(parts)
+
+
+class _JSONStream:
+    """Incremental reader of a JSON document.
+
+    The document is read in chunks. Values are either decoded (small values like the source of a
+    notebook cell) or skipped without building any objects (e.g., large embedded images).
+
+    """
+
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _STRUCTURE = re.compile(r'[\[\]{}"]')
+
+    def __init__(self, file_obj: t.TextIO, buffer_size: int = BUFFER_SIZE) -> None:
+        """Initiate the reader.
+
+        Parameters
+        ----------
+        file_obj : t.TextIO
+            Opened JSON file.
+        buffer_size : int, optional
+            Number of characters that are read at once. The default is 64 Ki.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._file_obj = file_obj
+        self._buffer_size = buffer_size
+        self._buffer = ""
+        self._pos = 0
+        self._mark: t.Optional[int] = None
+        self._decoder = json.JSONDecoder()
+
+    def _read(self) -> bool:
+        """Read the next chunk and drop the consumed part of the buffer.
+
+        The start of a value that is being decoded (see decode) is kept. While such a value
+        grows, the chunk size grows with the buffer, so the buffer is copied O(log n) times only.
+
+        Returns
+        -------
+        bool
+            False, if the end of the file has been reached.
+
+        """
+        keep = self._pos if self._mark is None else self._mark
+        chunk_size = self._buffer_size if self._mark is None else len(self._buffer) - keep
+        chunk = self._file_obj.read(max(chunk_size, self._buffer_size))
+        self._buffer = self._buffer[slice(keep, None)] + chunk
+        self._pos -= keep
+        if self._mark is not None:
+            self._mark -= keep
+
+        return bool(chunk)
+
+    @staticmethod
+    def _error(message: str) -> ValueError:
+        """Create the exception of an invalid document.
+
+        Parameters
+        ----------
+        message : str
+            Error description.
+
+        Returns
+        -------
+        ValueError
+            Exception to raise.
+
+        """
+        return ValueError(f"Invalid JSON document: {message}")
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character (without consuming it).
+
+        Returns
+        -------
+        str
+            Next character. Empty, if the end of the file has been reached.
+
+        """
+        while True:
+            self._pos = t.cast(t.Match, self._WHITESPACE.match(self._buffer, self._pos)).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume an expected structural character.
+
+        Parameters
+        ----------
+        char : str
+            Expected character, e.g., "{".
+
+        Raises
+        ------
+        ValueError
+            Exception raised if another character follows.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.peek() != char:
+            raise self._error(f"expected {char!r}")
+        self._pos += 1
+
+    def decode(self) -> t.Any:
+        """Decode the next value.
+
+        The end of a string, array or object is found first (the scan continues with each new
+        chunk), so a value that spans many chunks is decoded only once.
+
+        Raises
+        ------
+        ValueError
+            Exception raised if the value is invalid.
+
+        Returns
+        -------
+        t.Any
+            Decoded value.
+
+        """
+        if self.peek() in ('"', "[", "{"):
+            self._mark = self._pos
+            try:
+                self.skip_value()
+            finally:
+                start, self._mark = self._mark, None
+            try:
+                value, _ = self._decoder.raw_decode(self._buffer, start)
+            except json.JSONDecodeError as error:
+                raise self._error(str(error)) from error
+
+            return value
+
+        # Numbers and literals are short; a number at the end of the buffer may continue in the
+        # next chunk
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if not self._read():
+                    raise self._error(str(error)) from error
+                continue
+
+            if end == len(self._buffer) and self._read():
+                continue
+
+            self._pos = end
+
+            return value
+
+    def _skip_string(self) -> None:
+        """Skip a string (the reader is positioned at the opening quote).
+
+        Returns
+        -------
+        None.
+
+        """
+        self._pos += 1
+        while True:
+            match = self._STRING_SPECIAL.search(self._buffer, self._pos)
+
+            # Read more, if the string continues (or an escape sequence is cut off)
+            if match is None or match.end() == len(self._buffer):
+                self._pos = match.start() if match else len(self._buffer)
+                if not self._read():
+                    raise self._error("unterminated string")
+                continue
+
+            # Skip escaped characters, e.g., \"
+            if match.group() == "\\":
+                self._pos = match.end() + 1
+            else:
+                self._pos = match.end()
+                return
+
+    def skip_value(self) -> None:
+        """Skip the next value without decoding it.
+
+        Returns
+        -------
+        None.
+
+        """
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in ("[", "{"):
+            self.decode()
+            return
+
+        # Jump from one structural character to the next one and track the nesting depth
+        depth = 0
+        while True:
+            match = self._STRUCTURE.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                if not self._read():
+                    raise self._error("unterminated array or object")
+                continue
+
+            self._pos = match.start()
+            if match.group() == '"':
+                self._skip_string()
+                continue
+
+            self._pos += 1
+            depth += 1 if match.group() in "[{" else -1
+            if depth == 0:
+                return
+
+    def iter_object(self) -> t.Iterator[str]:
+        """Iterate over the keys of an object. Each value must be consumed by the caller.
+
+        Returns
+        -------
+        Iterator
+            Keys of the object.
+
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.decode()
+            self.expect(":")
+            yield key
+
+            # Continue with the next key or close the object
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("expected ',' or '}'")
+
+    def iter_array(self) -> t.Iterator[int]:
+        """Iterate over the elements of an array. Each element must be consumed by the caller.
+
+        Returns
+        -------
+        Iterator
+            Indices of the elements.
+
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            # Continue with the next element or close the array
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("expected ',' or ']'")
+
+
+def _join_source(source: t.Union[str, t.List[str]]) -> str:
+    """Join a multi-line notebook string (a string or a list of lines).
+
+    Parameters
+    ----------
+    source : str or list
+        Notebook string.
+
+    Returns
+    -------
+    str
+        Joined string.
+
+    """
+    return source if isinstance(source, str) else "".join(source)
+
+
+class NotebookSplitter(BlockSplitter):
+    """Split Jupyter notebooks (.ipynb) into code blocks; one block per code cell.
+
+    The notebook JSON is streamed: only the sources of the code cells (and optionally the text
+    outputs) are decoded. Embedded images and other outputs are skipped without being loaded. The
+    blocks are named like the blocks of a script, but keep the notebook suffix, so they do not
+    collide with a script of the same name, e.g., "tutorial.ipynb.py", "tutorial.ipynb_1.py", etc.
+
+    """
+
+    def __init__(self, suffix: str = ".py", strip_outputs: bool = True) -> None:
+        """Initiate the splitter.
+
+        Parameters
+        ----------
+        suffix : str, optional
+            Suffix of the GIST files. The default is ".py".
+        strip_outputs : bool, optional
+            Ignore all cell outputs. Otherwise, text outputs are appended to the code block as
+            comment lines. The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__("Jupyter", r"(?!)")
+        self.suffix = suffix
+        self.strip_outputs = strip_outputs
+
+    def __repr__(self) -> str:
+        """Return the representation of the splitter.
+
+        Returns
+        -------
+        str
+            Suffix of the GIST files and output flag.
+
+        """
+        return f"NotebookSplitter({self.suffix!r}, strip_outputs={self.strip_outputs!r})"
+
+    def gist_file_name(self, file_name: t.Union[Path, str]) -> str:
+        """Get the GIST file name of the first code cell of a notebook.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Path of the notebook.
+
+        Returns
+        -------
+        str
+            Notebook name with the suffix of the GIST files, e.g., "tutorial.ipynb.py".
+
+        """
+        return f"{Path(file_name).name}{self.suffix}"
+
+    @staticmethod
+    def _iter_output_texts(stream: _JSONStream) -> t.Iterator[str]:
+        """Iterate over the text outputs of a cell ("outputs" array).
+
+        Parameters
+        ----------
+        stream : _JSONStream
+            Reader that is positioned at the outputs array.
+
+        Returns
+        -------
+        Iterator
+            Stream texts and plain text representations of results.
+
+        """
+        for _ in stream.iter_array():
+            for key in stream.iter_object():
+                if key == "text":
+                    yield _join_source(stream.decode())
+                elif key == "data":
+                    for mime_type in stream.iter_object():
+                        if mime_type == "text/plain":
+                            yield _join_source(stream.decode())
+                        else:
+                            stream.skip_value()
+                else:
+                    stream.skip_value()
+
+    def _iter_code_cells(self, stream: _JSONStream) -> t.Iterator[str]:
+        """Iterate over the code cells of a notebook.
+
+        Parameters
+        ----------
+        stream : _JSONStream
+            Reader of the notebook.
+
+        Returns
+        -------
+        Iterator
+            Content of each code cell (source and optional text outputs).
+
+        """
+        for key in stream.iter_object():
+            if key != "cells":
+                stream.skip_value()
+                continue
+
+            for _ in stream.iter_array():
+                cell_type, source, outputs = None, "", []
+                for cell_key in stream.iter_object():
+                    if cell_key == "cell_type":
+                        cell_type = stream.decode()
+                    elif cell_key == "source":
+                        source = _join_source(stream.decode())
+                    elif cell_key == "outputs" and not self.strip_outputs:
+                        outputs = list(self._iter_output_texts(stream))
+                    else:
+                        stream.skip_value()
+
+                if cell_type != "code":
+                    continue
+
+                # Each block ends with a newline; outputs are appended as comment lines
+                content = source if not source or source.endswith("\n") else f"{source}\n"
+                for output in outputs:
+                    content += "".join(f"# {line}" for line in output.splitlines(keepends=True))
+                    content += "" if output.endswith("\n") else "\n"
+
+                yield content
+
+    def iter_blocks(
+        self, file_name: t.Union[Path, str], buffer_size: int = BUFFER_SIZE
+    ) -> t.Iterator[t.Tuple[str, str]]:
+        """Stream a notebook and yield its code cells one at a time.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the notebook to read.
+        buffer_size : int, optional
+            Number of characters that are read at once. The default is 64 Ki.
+
+        Returns
+        -------
+        Iterator
+            Tuples of the GIST file name (see block_file_name) and the content of each code
+            cell. A notebook without code cells yields a single empty block.
+
+        """
+        core_file_name = self.gist_file_name(file_name)
+        with open(file_name, "r", encoding="utf-8") as file_obj:
+            index = -1
+            cells = self._iter_code_cells(_JSONStream(file_obj, buffer_size))
+            for index, content in enumerate(cells):
+                yield block_file_name(core_file_name, index), content
+
+        if index == -1:
+            yield core_file_name, ""
+
+
+# Registry of the splitters; file suffix (lower case) -> splitter
+SPLITTERS: t.Dict[str, BlockSplitter] = {}
+
+# Splitter of Python files and files with an unregistered suffix (the original "#%%" convention;
+# register BlockSplitter("Python", r"#\s?%%") for ".py" to accept "# %%" as well)
+DEFAULT_SPLITTER = BlockSplitter("Python", r"#%%")
+
+
+def register_splitter(suffix: str, splitter: BlockSplitter) -> None:
+    """Register (or replace) the splitter of a file suffix.
+
+    Parameters
+    ----------
+    suffix : str
+        File suffix including the dot, e.g., ".sql". The suffix is case insensitive.
+    splitter : BlockSplitter
+        Splitter of the suffix. Formats without separator lines subclass BlockSplitter and
+        override iter_blocks.
+
+    Returns
+    -------
+    None.
+
+    """
+    SPLITTERS[suffix.lower()] = splitter
+
+
+def get_splitter(file_name: t.Union[Path, str]) -> BlockSplitter:
+    """Get the splitter of a file based on its suffix.
+
+    Parameters
+    ----------
+    file_name : pathlib.Path or str
+        File name.
+
+    Returns
+    -------
+    BlockSplitter
+        Registered splitter of the suffix or DEFAULT_SPLITTER.
+
+    """
+    return SPLITTERS.get(Path(file_name).suffix.lower(), DEFAULT_SPLITTER)
+
+
+def gist_file_name(file_name: t.Union[Path, str]) -> str:
+    """Get the GIST file name of the first code block of a file (see BlockSplitter).
+
+    Parameters
+    ----------
+    file_name : pathlib.Path or str
+        Path of the local file.
+
+    Returns
+    -------
+    str
+        GIST file name, e.g., "sample.py" for "sample.py" and "tutorial.ipynb.py" for
+        "tutorial.ipynb".
+
+    """
+    return get_splitter(file_name).gist_file_name(file_name)
+
+
+def iter_blocks(
+    file_name: t.Union[Path, str], sep: t.Optional[str] = None, buffer_size: int = BUFFER_SIZE
+) -> t.Iterator[t.Tuple[str, str]]:
+    """Read a file and yield its code blocks one at a time.
+
+    Parameters
+    ----------
+    file_name : pathlib.Path or str
+        Absolute or relative path name of the file to read.
+    sep : str, optional
+        Code block separator (a line starting with it ends a block; ignored for notebooks). The
+        default is None, i.e., the splitter of the file suffix is used (see get_splitter).
+    buffer_size : int, optional
+        Buffer size of the line reader in bytes. The default is 64 KiB.
+
+    Returns
+    -------
+    Iterator
+        Tuples of the GIST file name (see block_file_name) and the content of each code block.
+
+    """
+    splitter = get_splitter(file_name)
+    if sep is not None and not isinstance(splitter, NotebookSplitter):
+        splitter = BlockSplitter("", re.escape(sep))
+
+    return splitter.iter_blocks(file_name, buffer_size)
+
+
+def gist_body(file_name: t.Union[Path, str], sep: t.Optional[str] = None) -> t.Dict[t.Any, t.Any]:
+    """Read a source file and get the body of a create request.
+
+    Parameters
+    ----------
+    file_name : pathlib.Path or str
+        Absolute or relative path name of the file to read.
+    sep : str, optional
+        Code block separator. The default is None, i.e., the separator convention of the
+        file's language (see get_splitter), e.g., '#%%' for Python files.
+
+    Returns
+    -------
+    data : dict
+        Body for the REST API call.
+
+    """
+    # Read the file block by block. The python code (blocks) must be put into a dictionary
+    # that is later used as a JSON in the request REST API body; the GIST file names of the
+    # blocks get a consecutive, index depending number as a suffix
+    gist_code_dict = {
+        block_name: {"content": content} for block_name, content in iter_blocks(file_name, sep)
+    }
+
+    # Put the content in a dictionary for the REST API
+    data = {
+        "public": True,
+        "files": gist_code_dict,
+    }
+
+    return data
+
+
+def block_pattern(core_file_name: str) -> t.Pattern[str]:
+    """Get the pattern of all code block file names of a file.
+
+    Parameters
+    ----------
+    core_file_name : str
+        File name (without the path), e.g., "sample.py".
+
+    Returns
+    -------
+    re.Pattern
+        Pattern that matches the file name and the file names with a block suffix (e.g.,
+        "sample_1.py"). The block suffix is the first group.
+
+    """
+    core_path = Path(core_file_name)
+
+    return re.compile(rf"{re.escape(core_path.stem)}(_\d+)?{re.escape(core_path.suffix)}")
+
+
+def diff_files(
+    local_files: t.Dict[str, t.Dict],
+    remote_files: t.Dict[str, t.Dict],
+    core_file_name: str,
+) -> t.Dict[str, t.Optional[t.Dict]]:
+    """Build the files of an update request body from a local and a remote set of files.
+
+    Parameters
+    ----------
+    local_files : dict
+        Local files (code blocks), see gist_body.
+    remote_files : dict
+        Remote files of the GIST.
+    core_file_name : str
+        File name (without the path) of the local file.
+
+    Returns
+    -------
+    changed_files : dict
+        Added and modified files with their content, and removed code block files with None
+        (null in the request body deletes a GIST file). Empty, if nothing changed.
+
+    """
+    local_blocks = ((name, block["content"]) for name, block in local_files.items())
+
+    return diff_blocks(local_blocks, remote_files, core_file_name)
+
+
+def diff_blocks(
+    local_blocks: t.Iterable[t.Tuple[str, str]],
+    remote_files: t.Dict[str, t.Dict],
+    core_file_name: str,
+    fetch_content: t.Optional[t.Callable[[str], t.Optional[str]]] = None,
+) -> t.Dict[str, t.Optional[t.Dict]]:
+    """Build the files of an update request body from a stream of local code blocks.
+
+    Only changed blocks are kept, so unchanged blocks of a streamed file are dropped as soon
+    as they have been compared.
+
+    Parameters
+    ----------
+    local_blocks : iterable
+        Tuples of the GIST file name and the content of each local code block, see
+        gistyc.blocks.iter_blocks.
+    remote_files : dict
+        Remote files of the GIST.
+    core_file_name : str
+        File name (without the path) of the local file.
+    fetch_content : callable, optional
+        Function that gets the complete content of a truncated remote file by its name. The
+        default is None, i.e., truncated remote files are considered as changed.
+
+    Returns
+    -------
+    changed_files : dict
+        See diff_files.
+
+    """
+    # Compare the local code blocks with the remote contents. New files and truncated
+    # remote contents (that cannot be fetched) are considered as changed
+    changed_files: t.Dict[str, t.Optional[t.Dict]] = {}
+    local_names = set()
+    for block_name, content in local_blocks:
+        local_names.add(block_name)
+        remote_file = remote_files.get(block_name)
+        if remote_file is None:
+            remote_content = None
+        elif not remote_file.get("truncated"):
+            remote_content = remote_file["content"]
+        elif fetch_content is not None:
+            remote_content = fetch_content(block_name)
+        else:
+            remote_content = None
+        if remote_content is None or remote_content != content:
+            changed_files[block_name] = {"content": content}
+
+    # Remote code block files of the local file (file name or file name with a block suffix)
+    # that vanished locally, are deleted. Other files of the GIST are kept
+    pattern = block_pattern(core_file_name)
+    for remote_name in remote_files:
+        if remote_name not in local_names and pattern.fullmatch(remote_name):
+            changed_files[remote_name] = None
+
+    return changed_files
+
+
+def find_files(
+    directory: t.Union[Path, str], suffixes: t.Optional[t.Collection[str]] = None
+) -> t.Iterator[Path]:
+    """Find all files of registered suffixes within a directory (recursively, in a single pass).
+
+    Parameters
+    ----------
+    directory : pathlib.Path or str
+        Directory to scan.
+    suffixes : collection, optional
+        File suffixes to consider, e.g., {".py", ".sql"}. The default is None, i.e., all
+        registered suffixes.
+
+    Returns
+    -------
+    Iterator
+        Paths of the matching files.
+
+    """
+    suffixes = {suffix.lower() for suffix in (SPLITTERS if suffixes is None else suffixes)}
+    for dir_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            if os.path.splitext(file_name)[1].lower() in suffixes:
+                yield Path(dir_path, file_name)
+
+
+# Register the splitters of the supported languages
+register_splitter(".py", DEFAULT_SPLITTER)
+register_splitter(".sql", BlockSplitter("SQL", r"--\s?%%", "--%%"))
+register_splitter(".r", BlockSplitter("R", r"(#\s?%%|## ----)"))
+register_splitter(".jl", BlockSplitter("Julia", r"(#\s?%%|##\s*$)"))
+register_splitter(".sh", BlockSplitter("Shell", r"#\s?%%"))
+register_splitter(".bash", BlockSplitter("Shell", r"#\s?%%"))
+register_splitter(".ipynb", NotebookSplitter())
@@ -0,0 +1,369 @@
+"""Content cache of single GISTs (in memory and on disk)."""
+
+# Import standard libraries
+from collections import OrderedDict
+import contextlib
+import json
+import os
+from pathlib import Path
+import shutil
+import threading
+import typing as t
+from urllib.parse import quote
+
+
+def gist_revision(gist: t.Dict) -> t.Optional[str]:
+    """Get the revision (latest history version) of a GIST.
+
+    Parameters
+    ----------
+    gist : dict
+        GIST as returned by the REST API (single GIST).
+
+    Returns
+    -------
+    str or None
+        Revision SHA. None, if the GIST has no history.
+
+    """
+    history = gist.get("history") or [{}]
+
+    return history[0].get("version")
+
+
+class GISTContentCache:
+    """Cache of GISTs (including their file contents) keyed by GIST ID and revision.
+
+    A revision of a GIST never changes, so cached revisions are used without any REST API call.
+    For the latest revision, the ETag is stored as well: GISTyc revalidates it with a conditional
+    request that is answered with 304 (and no content) as long as the GIST is unchanged.
+
+    The most recently used entries are kept in memory (LRU). If a directory is given, all entries
+    are also stored on disk: <directory>/<GIST ID>/<revision>.json for the GISTs and
+    <directory>/<GIST ID>/<revision>/<file name> for lazily fetched file contents. Storing a new
+    latest revision removes the older revisions of the GIST from the disk.
+
+    """
+
+    def __init__(self, directory: t.Optional[t.Union[Path, str]] = None, max_entries: int = 64):
+        """Initiate the cache.
+
+        Parameters
+        ----------
+        directory : pathlib.Path or str, optional
+            Directory of the disk cache. The default is None, i.e., memory only.
+        max_entries : int, optional
+            Maximum number of entries (GISTs and file contents) in memory. The default is 64.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.directory = Path(directory).expanduser() if directory else None
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[t.Tuple[str, ...], t.Any]" = OrderedDict()
+        self._latest: t.Dict[str, t.Tuple[str, t.Optional[str]]] = {}
+
+    def _memory_get(self, key: t.Tuple[str, ...]) -> t.Any:
+        """Get an entry from memory and mark it as recently used.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+
+        Returns
+        -------
+        t.Any
+            Entry. None, if the entry is not in memory.
+
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+            return self._entries[key]
+
+    def _memory_put(self, key: t.Tuple[str, ...], value: t.Any) -> None:
+        """Put an entry into memory and evict the least recently used entries.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+        value : t.Any
+            Entry.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, gist_id: str, *parts: str) -> Path:
+        """Get a path within the disk cache (names are escaped).
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        *parts : str
+            Further path components.
+
+        Returns
+        -------
+        pathlib.Path
+            Path of the entry.
+
+        """
+        return Path(
+            t.cast(Path, self.directory), *(quote(part, safe="") for part in (gist_id, *parts))
+        )
+
+    @staticmethod
+    def _write(path: Path, text: str) -> None:
+        """Write a file atomically (concurrent readers never see a partial file).
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            File path.
+        text : str
+            File content.
+
+        Returns
+        -------
+        None.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def latest(self, gist_id: str) -> t.Optional[t.Tuple[str, t.Optional[str]]]:
+        """Get the latest cached revision of a GIST and its ETag.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        tuple or None
+            Revision and ETag. None, if the GIST is not cached.
+
+        """
+        with self._lock:
+            if gist_id in self._latest:
+                return self._latest[gist_id]
+
+        if self.directory is None:
+            return None
+
+        try:
+            latest = json.loads(self._path(gist_id, "latest.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._latest[gist_id] = (latest["revision"], latest.get("etag"))
+
+            return self._latest[gist_id]
+
+    def get(self, gist_id: str, revision: str) -> t.Optional[t.Dict]:
+        """Get a cached GIST revision.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA.
+
+        Returns
+        -------
+        dict or None
+            GIST. None, if the revision is not cached.
+
+        """
+        gist = self._memory_get(("gist", gist_id, revision))
+        if gist is not None or self.directory is None:
+            return t.cast(t.Optional[t.Dict], gist)
+
+        try:
+            gist = json.loads(self._path(gist_id, f"{revision}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._memory_put(("gist", gist_id, revision), gist)
+
+        return t.cast(t.Dict, gist)
+
+    def put(self, gist: t.Dict, etag: t.Optional[str] = None, latest: bool = True) -> None:
+        """Cache a GIST (single GIST response including the file contents).
+
+        Parameters
+        ----------
+        gist : dict
+            GIST as returned by the REST API.
+        etag : str, optional
+            ETag of the response. The default is None.
+        latest : bool, optional
+            The GIST is the latest revision. The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        revision = gist_revision(gist)
+        if revision is None:
+            return
+
+        self._memory_put(("gist", gist["id"], revision), gist)
+        if latest:
+            with self._lock:
+                self._latest[gist["id"]] = (revision, etag)
+
+        if self.directory is not None:
+            self._write(self._path(gist["id"], f"{revision}.json"), json.dumps(gist))
+            if latest:
+                latest_data = {"revision": revision, "etag": etag}
+                self._write(self._path(gist["id"], "latest.json"), json.dumps(latest_data))
+                self._prune(gist["id"], revision)
+
+    def _prune(self, gist_id: str, revision: str) -> None:
+        """Remove all revisions of a GIST except one from the disk cache.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA to keep.
+
+        Returns
+        -------
+        None.
+
+        """
+        keep = {"latest.json", quote(revision, safe=""), f"{quote(revision, safe='')}.json"}
+        try:
+            paths = [path for path in self._path(gist_id).iterdir() if path.name not in keep]
+        except OSError:
+            return
+
+        # Files that are written concurrently (*.tmp, see _write) are kept
+        for path in paths:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.suffix != ".tmp":
+                with contextlib.suppress(OSError):
+                    path.unlink()
+
+    def remove(self, gist_id: str) -> None:
+        """Remove all revisions of a (deleted) GIST from the cache.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self._latest.pop(gist_id, None)
+            for key in [key for key in self._entries if key[1] == gist_id]:
+                del self._entries[key]
+
+        if self.directory is not None:
+            shutil.rmtree(self._path(gist_id), ignore_errors=True)
+
+    def content_path(self, gist_id: str, revision: str, file_name: str) -> t.Optional[Path]:
+        """Get the disk cache path of the content of a GIST file (the file may not exist yet).
+
+        Large contents are streamed to this path instead of being held in memory.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA.
+        file_name : str
+            GIST file name.
+
+        Returns
+        -------
+        pathlib.Path or None
+            Path of the cached content. None, if the cache is memory only.
+
+        """
+        if self.directory is None:
+            return None
+
+        return self._path(gist_id, revision, file_name)
+
+    def get_content(self, gist_id: str, revision: str, file_name: str) -> t.Optional[str]:
+        """Get the cached content of a GIST file (e.g., a truncated file fetched by its raw URL).
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA.
+        file_name : str
+            GIST file name.
+
+        Returns
+        -------
+        str or None
+            File content. None, if the content is not cached.
+
+        """
+        content = self._memory_get(("content", gist_id, revision, file_name))
+        if content is not None or self.directory is None:
+            return t.cast(t.Optional[str], content)
+
+        try:
+            return self._path(gist_id, revision, file_name).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put_content(self, gist_id: str, revision: str, file_name: str, content: str) -> None:
+        """Cache the content of a GIST file.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA.
+        file_name : str
+            GIST file name.
+        content : str
+            File content.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.directory is None:
+            self._memory_put(("content", gist_id, revision, file_name), content)
+        else:
+            self._write(self._path(gist_id, revision, file_name), content)
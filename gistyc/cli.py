@@ -1,14 +1,135 @@
 """CLI for the GISTyc routines."""
 
 # Import standard libraries
+import json
 import pathlib
+import sys
 import typing as t
 
 # Import installed libraries
 import click
 
-# Import GISTyc
-from . import GISTyc
+# Import GISTyc. Only the modules of the option definitions are imported at module level; the
+# client, the engines and the instrumentation are imported by the commands (fast CLI startup)
+from . import GITHUB_API_URL
+from .blocks import SPLITTERS, find_files
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .instrument import StatsCollector
+    from .sync import SyncPlan
+
+
+def _cache_dir(cache_dir: t.Optional[str], no_cache: bool) -> t.Optional[pathlib.Path]:
+    """Get the directory of the persistent GIST index for the CLI routines.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        User provided cache directory.
+    no_cache : bool
+        Flag to disable the persistent GIST index.
+
+    Returns
+    -------
+    pathlib.Path or None
+        Cache directory. None, if the index is disabled.
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from .index import default_cache_dir
+
+    if no_cache:
+        return None
+
+    return pathlib.Path(cache_dir) if cache_dir else default_cache_dir()
+
+
+def _echo_plan(sync_plan: "SyncPlan", plan_format: str) -> None:
+    """Echo a sync plan as a table or as JSON.
+
+    Parameters
+    ----------
+    sync_plan : SyncPlan
+        Sync plan.
+    plan_format : str
+        "table" or "json".
+
+    Returns
+    -------
+    None.
+
+    """
+    if plan_format == "json":
+        click.echo(json.dumps(sync_plan.to_dict(), indent=2))
+        return
+
+    # One row per item, the conflicts and the estimated totals
+    click.echo(f"{'ACTION':<10} {'REQUESTS':>8} {'BYTES':>10}  {'GIST ID':<32}  FILE")
+    for item in sync_plan.items:
+        click.echo(
+            f"{item.action:<10} {item.requests:>8} {item.payload_bytes:>10}  "
+            f"{item.gist_id or '-':<32}  {item.file_name}"
+        )
+    for file_name, gist_ids in sync_plan.conflicts.items():
+        click.echo(f"{'CONFLICT':<10} {0:>8} {0:>10}  {', '.join(gist_ids):<32}  {file_name}")
+    click.echo(
+        f"{len(sync_plan.items)} files, {sync_plan.requests} requests, "
+        f"{sync_plan.payload_bytes} bytes (estimated), {len(sync_plan.conflicts)} conflicts"
+    )
+
+
+def _stats_collector(stats: bool, stats_json: t.Optional[t.TextIO]) -> t.Optional["StatsCollector"]:
+    """Get a collector of the request statistics (if requested).
+
+    Parameters
+    ----------
+    stats : bool
+        Flag to echo a summary.
+    stats_json : t.TextIO, optional
+        File to write the statistics to as JSON.
+
+    Returns
+    -------
+    StatsCollector or None
+        Statistics collector. None, if no statistics are requested.
+
+    """
+    if not stats and stats_json is None:
+        return None
+
+    # pylint: disable=import-outside-toplevel
+    from .instrument import StatsCollector
+
+    return StatsCollector()
+
+
+def _echo_stats(
+    collector: t.Optional["StatsCollector"], stats: bool, stats_json: t.Optional[t.TextIO]
+) -> None:
+    """Echo the request statistics as a summary and / or write them as JSON.
+
+    Parameters
+    ----------
+    collector : StatsCollector, optional
+        Statistics collector. None, if no statistics are requested.
+    stats : bool
+        Flag to echo a summary (to stderr).
+    stats_json : t.TextIO, optional
+        File to write the statistics to as JSON.
+
+    Returns
+    -------
+    None.
+
+    """
+    if collector is None:
+        return
+
+    if stats:
+        click.echo(collector.summary(), err=True)
+    if stats_json is not None:
+        json.dump(collector.to_dict(), stats_json, indent=2)
+        stats_json.write("\n")
 
 
 # Set click commands
@@ -19,8 +140,36 @@ from . import GISTyc
 @click.option("-t", "--auth-token", help="GIST REST API token")
 @click.option("-f", "--file-name", help="Absolute or relative file name path")
 @click.option("-id", "--gist-id", default=None, help="GIST ID")
+@click.option(
+    "--cache-dir", envvar="GISTYC_CACHE_DIR", default=None, help="Directory of the GIST index"
+)
+@click.option("--no-cache", is_flag=True, help="Flag: Do not use the persistent GIST index")
+@click.option(
+    "--api-url",
+    envvar="GISTYC_API_URL",
+    default=GITHUB_API_URL,
+    show_default=True,
+    help="Base URL of the REST API",
+)
+@click.option("--stats", is_flag=True, help="Flag: Print a summary of the request statistics")
+@click.option(
+    "--stats-json",
+    type=click.File("w"),
+    default=None,
+    help="Write the request statistics as JSON to a file ('-' for stdout)",
+)
 def run(
-    create: bool, update: bool, delete: bool, auth_token: str, file_name: str, gist_id: str
+    create: bool,
+    update: bool,
+    delete: bool,
+    auth_token: str,
+    file_name: str,
+    gist_id: str,
+    cache_dir: t.Optional[str],
+    no_cache: bool,
+    api_url: str,
+    stats: bool,
+    stats_json: t.Optional[t.TextIO],
 ) -> None:
     """CLI routine to call the GISTyc API to create, update and delete a GIST.
 
@@ -40,65 +189,178 @@ def run(
         Absolute or relative file path. Required for create and update
     gist_id : str
         GIST ID for the update routine (if file name is ambiguous) and delete routine.
+    cache_dir : str, optional
+        Directory of the persistent GIST index. Default: ~/.cache/gistyc.
+    no_cache : bool
+        Flag to disable the persistent GIST index.
+    api_url : str
+        Base URL of the REST API, e.g., of a GitHub Enterprise server or a local stand-in.
+    stats : bool
+        Flag to print a summary of the request statistics (latency per endpoint, bytes, listing
+        pages, parse times and cache hits) to stderr.
+    stats_json : t.TextIO, optional
+        File to write the request statistics to as JSON.
 
     Returns
     -------
     None.
 
     """
-    # Set the GISTys class
-    gist_api = GISTyc(auth_token=auth_token)
+    # pylint: disable=import-outside-toplevel
+    from .gistyc import GISTyc
+    from .instrument import GISTEvent
 
-    # Create GIST routine
-    if create:
+    # Collect the request statistics (if requested)
+    collector = _stats_collector(stats, stats_json)
 
-        # Create a GIST with the sample file
-        response_data = gist_api.create_gist(file_name=file_name)
+    # Set the GISTys class (the pooled connections are closed at the end)
+    with GISTyc(
+        auth_token=auth_token,
+        api_url=api_url,
+        cache_dir=_cache_dir(cache_dir, no_cache),
+        hooks=[collector] if collector else None,
+    ) as gist_api:
 
-        # Echo the resposen back to the terminal
-        click.echo(str(response_data))
+        # Create GIST routine
+        if create:
 
-    # Update GIST routine
-    elif update:
+            # Create a GIST with the sample file
+            response_data = gist_api.create_gist(file_name=file_name)
 
-        # If not GIST ID is provided: use only the file name
-        if not gist_id:
-            response_data = gist_api.update_gist(file_name=file_name)
+            # Echo the resposen back to the terminal
+            click.echo(str(response_data))
 
-        # Else, use the GIST ID
-        else:
-            response_data = gist_api.update_gist(file_name=file_name, gist_id=gist_id)
+        # Update GIST routine
+        elif update:
 
-        # Echo the resposen back to the terminal
-        click.echo(str(response_data))
+            # Track a skipped update (nothing changed) through the instrumentation hooks
+            unchanged_files: t.List[str] = []
 
-    # Delete GIST routine
-    elif delete:
+            def _track_unchanged(event: GISTEvent) -> None:
+                """Record the file of an "unchanged" event."""
+                if event.kind == "unchanged":
+                    unchanged_files.append(event.name)
 
-        # If not GIST ID is provided: use only the file name
-        if not gist_id:
-            response_int = gist_api.delete_gist(file_name=file_name)
+            gist_api.add_hook(_track_unchanged)
 
-        # Else, use the GIST ID
-        else:
-            response_int = gist_api.delete_gist(gist_id=gist_id)
+            # If not GIST ID is provided: use only the file name
+            if not gist_id:
+                response_data = gist_api.update_gist(file_name=file_name)
+
+            # Else, use the GIST ID
+            else:
+                response_data = gist_api.update_gist(file_name=file_name, gist_id=gist_id)
+
+            # Echo the resposen back to the terminal (or that nothing changed)
+            if unchanged_files:
+                click.echo(f"UNCHANGED {file_name} (GIST {response_data['id']})")
+            else:
+                click.echo(str(response_data))
+
+        # Delete GIST routine
+        elif delete:
 
-        # Echo the resposen back to the terminal
-        click.echo(str(response_int))
+            # If not GIST ID is provided: use only the file name
+            if not gist_id:
+                response_int = gist_api.delete_gist(file_name=file_name)
+
+            # Else, use the GIST ID
+            else:
+                response_int = gist_api.delete_gist(gist_id=gist_id)
+
+            # Echo the resposen back to the terminal
+            click.echo(str(response_int))
+
+    _echo_stats(collector, stats, stats_json)
 
 
 # A second CLI tool to parse directories
 @click.command()
 @click.option("-t", "--auth-token", help="GIST REST API token")
-@click.option("-d", "--directory", help="Directory that contains Python scripts")
-def dir_run(auth_token: str, directory: t.Union[pathlib.Path, str]) -> None:
+@click.option("-d", "--directory", help="Directory that contains Python (and other) scripts")
+@click.option(
+    "--cache-dir", envvar="GISTYC_CACHE_DIR", default=None, help="Directory of the GIST index"
+)
+@click.option("--no-cache", is_flag=True, help="Flag: Do not use the persistent GIST index")
+@click.option(
+    "--api-url",
+    envvar="GISTYC_API_URL",
+    default=GITHUB_API_URL,
+    show_default=True,
+    help="Base URL of the REST API",
+)
+@click.option("-j", "--jobs", default=4, show_default=True, help="Number of parallel workers")
+@click.option(
+    "--mutation-interval",
+    envvar="GISTYC_MUTATION_INTERVAL",
+    default=1.0,
+    show_default=True,
+    help="Minimum interval in seconds between two create / update requests",
+)
+@click.option("--full", is_flag=True, help="Flag: Ignore the sync manifest and check all files")
+@click.option(
+    "--git-range", default=None, help="Sync only files changed in a git revision range, e.g. A..B"
+)
+@click.option(
+    "--name-status",
+    type=click.File("r"),
+    default=None,
+    help="Sync only files listed in a 'git diff --name-status [-z]' output file ('-' for stdin)",
+)
+@click.option(
+    "-s",
+    "--suffix",
+    "suffixes",
+    multiple=True,
+    default=(".py",),
+    show_default=True,
+    help=f"File suffix to sync (repeatable), out of {', '.join(sorted(SPLITTERS))}",
+)
+@click.option("--plan", is_flag=True, help="Flag: Print the sync plan without changing any GIST")
+@click.option(
+    "--plan-format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    show_default=True,
+    help="Output format of the sync plan",
+)
+@click.option("--stats", is_flag=True, help="Flag: Print a summary of the request statistics")
+@click.option(
+    "--stats-json",
+    type=click.File("w"),
+    default=None,
+    help="Write the request statistics as JSON to a file ('-' for stdout)",
+)
+def dir_run(
+    auth_token: str,
+    directory: t.Union[pathlib.Path, str],
+    cache_dir: t.Optional[str],
+    no_cache: bool,
+    api_url: str,
+    jobs: int,
+    mutation_interval: float,
+    full: bool,
+    git_range: t.Optional[str],
+    name_status: t.Optional[t.TextIO],
+    suffixes: t.Tuple[str, ...],
+    plan: bool,
+    plan_format: str,
+    stats: bool,
+    stats_json: t.Optional[t.TextIO],
+) -> None:
     """CLI routine to create / update GitHub gists based on a given directory.
 
     This CLI routine takes a directory as an input and iterates recursively through it to determine
-    all Python files. These files are then either created as a GIST or updated (if already
+    all Python files (and all files of other languages with a registered code block splitter, see
+    gistyc.blocks). These files are then either created as a GIST or updated (if already
     present). Please note that GISTs must be unambiguous with respect to their file name. The
     update routine considers only the file name, since the directory input provides only a list
-    of corresponding files.
+    of corresponding files. The files are processed in parallel; the exit code is 1 if any file
+    failed.
+
+    With a git revision range (or a "git diff --name-status" output), only the changed files of
+    the directory are processed: added and modified files are created / updated, the GISTs of
+    deleted files are deleted and the GISTs of renamed files are renamed.
 
     Parameters
     ----------
@@ -106,43 +368,384 @@ def dir_run(auth_token: str, directory: t.Union[pathlib.Path, str]) -> None:
         GIST REST API token.
     directory : t.Union[pathlib.Path, str]
         Direcotry containing Python files.
+    cache_dir : str, optional
+        Directory of the persistent GIST index. Default: ~/.cache/gistyc.
+    no_cache : bool
+        Flag to disable the persistent GIST index.
+    api_url : str
+        Base URL of the REST API, e.g., of a GitHub Enterprise server or a local stand-in.
+    jobs : int
+        Number of files that are processed in parallel.
+    mutation_interval : float
+        Minimum interval in seconds between two content-creating requests (see RateLimiter).
+    full : bool
+        Flag to ignore the sync manifest, i.e., all files are compared with their GISTs.
+    git_range : str, optional
+        Git revision range. Only the files changed within the range are processed.
+    name_status : t.TextIO, optional
+        Output of "git diff --name-status" (paths relative to the current working directory).
+        Only the listed files are processed.
+    suffixes : t.Tuple[str, ...]
+        File suffixes to process, e.g., (".py",) (the default of the CLI).
+    plan : bool
+        Flag to print the sync plan (actions, estimated requests and payload bytes) without any
+        content-creating request. The exit code is 1 if a file name has more than one GIST.
+    plan_format : str
+        Output format of the sync plan: "table" or "json".
+    stats : bool
+        Flag to print a summary of the request statistics (latency per endpoint, bytes, listing
+        pages, parse times and cache hits) to stderr.
+    stats_json : t.TextIO, optional
+        File to write the request statistics to as JSON.
 
     Returns
     -------
     None.
 
     """
-    # Set the GISTys class
-    gist_api = GISTyc(auth_token=auth_token)
+    # pylint: disable=import-outside-toplevel
+    from .gistyc import GISTyc
+    from .ratelimit import RateLimiter
+    from .sync import SyncEngine, SyncResult, git_name_status, parse_name_status
+
+    # Collect the request statistics (if requested)
+    collector = _stats_collector(stats, stats_json)
+
+    # Set the GISTys class (the pooled connections are closed at the end). Each worker needs a
+    # pooled connection
+    with GISTyc(
+        auth_token=auth_token,
+        api_url=api_url,
+        cache_dir=_cache_dir(cache_dir, no_cache),
+        pool_size=max(jobs, 10),
+        rate_limiter=RateLimiter(mutation_interval=mutation_interval),
+        hooks=[collector] if collector else None,
+    ) as gist_api:
+
+        # Set the directory as a pathlib Path
+        dir_path = pathlib.Path(directory)
+
+        # Echo each file and its action as soon as it is done
+        def _echo_result(result: SyncResult) -> None:
+            click.echo(f"{result.file_name}\n{result.action}")
+            if result.error:
+                click.echo(result.error, err=True)
+
+        # Create or update the GIST based on the file names within the given directory. Iterate
+        # through all files with the given suffixes (default: Python files) that are being found
+        # recursively (in a single pass) within the directory.
+        # The files are processed concurrently; unchanged files and GISTs are skipped. The GIST
+        # listing is only fetched if a changed file has no known GIST ID (see sync manifest)
+        sync_engine = SyncEngine(gist_api, jobs=jobs, use_manifest=not full)
+        suffixes = tuple(suffix if suffix.startswith(".") else f".{suffix}" for suffix in suffixes)
+
+        # Diff mode: process only the changed files within the directory
+        changes = None
+        if git_range is not None or name_status is not None:
+            if git_range is not None:
+                changes = git_name_status(dir_path, git_range)
+            else:
+                changes = parse_name_status(t.cast(t.TextIO, name_status).read())
+            dir_abs = dir_path.resolve()
+            changes = [
+                change
+                for change in changes
+                if any(
+                    dir_abs in path.resolve().parents
+                    for path in (change.path, change.old_path)
+                    if path is not None
+                )
+            ]
+
+        # Dry run: print the plan and stop
+        if plan:
+            if changes is None:
+                sync_plan = sync_engine.plan(find_files(dir_path, suffixes))
+            else:
+                sync_plan = sync_engine.plan_changes(changes, suffixes=suffixes)
+            _echo_plan(sync_plan, plan_format)
+            _echo_stats(collector, stats, stats_json)
+            if sync_plan.conflicts:
+                sys.exit(1)
+            return
+
+        if changes is None:
+            results = sync_engine.run(find_files(dir_path, suffixes), callback=_echo_result)
+        else:
+            results = sync_engine.run_changes(changes, suffixes=suffixes, callback=_echo_result)
 
-    # Set the directory as a pathlib Path
-    dir_path = pathlib.Path(directory)
+    # Echo the request statistics (if requested) and a simple echo string
+    _echo_stats(collector, stats, stats_json)
+    click.echo("DONE")
 
-    # Get a list of all gists
-    gists = gist_api.get_gists()
+    # Exit with an error code if any file failed
+    failed = [result for result in results if not result.ok]
+    if failed:
+        click.echo(f"{len(failed)} of {len(results)} files failed", err=True)
+        sys.exit(1)
 
-    # Create a list of all file names (since gists may contain more than 1 file one needs to
-    # flatten the list)
-    gist_files_dictfiles = [list(gist_item["files"].keys()) for gist_item in gists]
-    gist_files = [x for x in gist_files_dictfiles for x in x]
 
-    # Create or update the GIST based on the Python file names within the given directory
-    # Iterate through all Python files that are being found recursively within the directory.
-    for python_filepath in dir_path.rglob("*.py"):
+# A third CLI tool to mirror all GISTs to a directory
+@click.command()
+@click.option("-t", "--auth-token", help="GIST REST API token")
+@click.option("-d", "--directory", help="Mirror directory")
+@click.option(
+    "--cache-dir", envvar="GISTYC_CACHE_DIR", default=None, help="Directory of the GIST index"
+)
+@click.option("--no-cache", is_flag=True, help="Flag: Do not use the persistent GIST index")
+@click.option(
+    "--api-url",
+    envvar="GISTYC_API_URL",
+    default=GITHUB_API_URL,
+    show_default=True,
+    help="Base URL of the REST API",
+)
+@click.option("-j", "--jobs", default=8, show_default=True, help="Number of parallel downloads")
+@click.option("--full", is_flag=True, help="Flag: Fetch all GISTs, including unchanged ones")
+@click.option("--stats", is_flag=True, help="Flag: Print a summary of the request statistics")
+@click.option(
+    "--stats-json",
+    type=click.File("w"),
+    default=None,
+    help="Write the request statistics as JSON to a file ('-' for stdout)",
+)
+def pull_run(
+    auth_token: str,
+    directory: t.Union[pathlib.Path, str],
+    cache_dir: t.Optional[str],
+    no_cache: bool,
+    api_url: str,
+    jobs: int,
+    full: bool,
+    stats: bool,
+    stats_json: t.Optional[t.TextIO],
+) -> None:
+    """CLI routine to mirror all GISTs into a local directory.
 
-        # Echo the currently fetched file
-        click.echo(python_filepath)
+    Each GIST is written to <directory>/<GIST ID>/ and its code block files are reassembled into a
+    single file with separator lines. Only new and changed GISTs (based on their update datetime)
+    are fetched; the directories of deleted GISTs are removed. The exit code is 1 if any GIST
+    failed.
 
-        # Get the filename
-        python_filename = python_filepath.name
+    Parameters
+    ----------
+    auth_token : str
+        GIST REST API token.
+    directory : t.Union[pathlib.Path, str]
+        Mirror directory.
+    cache_dir : str, optional
+        Directory of the persistent GIST index. Default: ~/.cache/gistyc.
+    no_cache : bool
+        Flag to disable the persistent GIST index.
+    api_url : str
+        Base URL of the REST API, e.g., of a GitHub Enterprise server or a local stand-in.
+    jobs : int
+        Number of GISTs that are fetched in parallel.
+    full : bool
+        Flag to ignore the mirror state, i.e., all GISTs are fetched.
+    stats : bool
+        Flag to print a summary of the request statistics to stderr.
+    stats_json : t.TextIO, optional
+        File to write the request statistics to as JSON.
 
-        # If the file name exists in the GIST list, update it, otherwise create one
-        if python_filename in gist_files:
-            click.echo("UPDATE")
-            _ = gist_api.update_gist(file_name=python_filepath)
-        else:
-            click.echo("CREATE")
-            _ = gist_api.create_gist(file_name=python_filepath)
+    Returns
+    -------
+    None.
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from .gistyc import GISTyc
+    from .mirror import GISTMirror, MirrorResult
+
+    # Collect the request statistics (if requested)
+    collector = _stats_collector(stats, stats_json)
+
+    # Set the GISTys class (the pooled connections are closed at the end). Each worker needs a
+    # pooled connection
+    with GISTyc(
+        auth_token=auth_token,
+        api_url=api_url,
+        cache_dir=_cache_dir(cache_dir, no_cache),
+        pool_size=max(jobs, 10),
+        max_downloads=jobs,
+        hooks=[collector] if collector else None,
+    ) as gist_api:
+
+        # Echo each fetched, removed or failed GIST as soon as it is done
+        def _echo_result(result: MirrorResult) -> None:
+            if result.action != "UNCHANGED":
+                click.echo(f"{result.gist_id}\n{result.action}")
+            if result.error:
+                click.echo(result.error, err=True)
+
+        results = GISTMirror(gist_api, directory, jobs=jobs).run(full=full, callback=_echo_result)
+
+    # Echo the request statistics (if requested) and a simple echo string
+    _echo_stats(collector, stats, stats_json)
+    click.echo("DONE")
+
+    # Exit with an error code if any GIST failed
+    failed = [result for result in results if not result.ok]
+    if failed:
+        click.echo(f"{len(failed)} of {len(results)} GISTs failed", err=True)
+        sys.exit(1)
+
+
+# A fourth CLI tool to synchronise a directory continuously
+@click.command()
+@click.option("-t", "--auth-token", help="GIST REST API token")
+@click.option("-d", "--directory", help="Directory that contains Python (and other) scripts")
+@click.option(
+    "--cache-dir", envvar="GISTYC_CACHE_DIR", default=None, help="Directory of the GIST index"
+)
+@click.option("--no-cache", is_flag=True, help="Flag: Do not use the persistent GIST index")
+@click.option(
+    "--api-url",
+    envvar="GISTYC_API_URL",
+    default=GITHUB_API_URL,
+    show_default=True,
+    help="Base URL of the REST API",
+)
+@click.option("-j", "--jobs", default=4, show_default=True, help="Number of parallel workers")
+@click.option(
+    "--mutation-interval",
+    envvar="GISTYC_MUTATION_INTERVAL",
+    default=1.0,
+    show_default=True,
+    help="Minimum interval in seconds between two create / update requests",
+)
+@click.option(
+    "-s",
+    "--suffix",
+    "suffixes",
+    multiple=True,
+    default=(".py",),
+    show_default=True,
+    help=f"File suffix to sync (repeatable), out of {', '.join(sorted(SPLITTERS))}",
+)
+@click.option(
+    "--debounce",
+    default=0.3,
+    show_default=True,
+    help="Quiet time in seconds after the last change before the changed files are synced",
+)
+@click.option(
+    "--poll-interval",
+    default=0.5,
+    show_default=True,
+    help="Interval in seconds between two scans (polling only)",
+)
+@click.option("--polling", is_flag=True, help="Flag: Poll the file stats instead of using events")
+@click.option("--initial", is_flag=True, help="Flag: Sync all files once at the start")
+@click.option("--stats", is_flag=True, help="Flag: Print a summary of the request statistics")
+@click.option(
+    "--stats-json",
+    type=click.File("w"),
+    default=None,
+    help="Write the request statistics as JSON to a file ('-' for stdout)",
+)
+def watch_run(
+    auth_token: str,
+    directory: t.Union[pathlib.Path, str],
+    cache_dir: t.Optional[str],
+    no_cache: bool,
+    api_url: str,
+    jobs: int,
+    mutation_interval: float,
+    suffixes: t.Tuple[str, ...],
+    debounce: float,
+    poll_interval: float,
+    polling: bool,
+    initial: bool,
+    stats: bool,
+    stats_json: t.Optional[t.TextIO],
+) -> None:
+    """CLI routine to create / update GitHub gists continuously while files of a directory change.
+
+    The directory is watched with file system events (if watchdog is installed, see
+    gistyc[watch]) or by polling the file stats. Changed files are debounced and synchronised
+    like gistyc_dir does; only changed code blocks are sent. The GISTs of moved files are renamed;
+    deleted files drop their sync manifest entries (their GISTs are kept). The GIST catalog and
+    the pooled connections are kept in memory until the routine is interrupted (Ctrl+C).
 
-    # Return a simple echo string
+    Parameters
+    ----------
+    auth_token : str
+        GIST REST API token.
+    directory : t.Union[pathlib.Path, str]
+        Directory containing Python files.
+    cache_dir : str, optional
+        Directory of the persistent GIST index. Default: ~/.cache/gistyc.
+    no_cache : bool
+        Flag to disable the persistent GIST index.
+    api_url : str
+        Base URL of the REST API, e.g., of a GitHub Enterprise server or a local stand-in.
+    jobs : int
+        Number of files that are processed in parallel.
+    mutation_interval : float
+        Minimum interval in seconds between two content-creating requests (see RateLimiter).
+    suffixes : t.Tuple[str, ...]
+        File suffixes to sync, e.g., (".py",) (the default of the CLI).
+    debounce : float
+        Quiet time in seconds after the last change before a batch of files is synchronised.
+    poll_interval : float
+        Interval in seconds between two scans of the file stats (polling only).
+    polling : bool
+        Flag to poll the file stats, even if watchdog is installed.
+    initial : bool
+        Flag to synchronise all files once at the start.
+    stats : bool
+        Flag to print a summary of the request statistics to stderr (at the end).
+    stats_json : t.TextIO, optional
+        File to write the request statistics to as JSON (at the end).
+
+    Returns
+    -------
+    None.
+
+    """
+    # pylint: disable=import-outside-toplevel
+    from .gistyc import GISTyc
+    from .ratelimit import RateLimiter
+    from .sync import SyncEngine, SyncResult
+    from .watch import DirectoryWatcher
+
+    # Collect the request statistics (if requested)
+    collector = _stats_collector(stats, stats_json)
+
+    # Set the GISTys class (the pooled connections are kept open while watching)
+    with GISTyc(
+        auth_token=auth_token,
+        api_url=api_url,
+        cache_dir=_cache_dir(cache_dir, no_cache),
+        pool_size=max(jobs, 10),
+        rate_limiter=RateLimiter(mutation_interval=mutation_interval),
+        hooks=[collector] if collector else None,
+    ) as gist_api:
+
+        # Echo each synchronised file and its action as soon as it is done
+        def _echo_result(result: SyncResult) -> None:
+            if result.action != "UNCHANGED":
+                click.echo(f"{result.file_name}\n{result.action}")
+            if result.error:
+                click.echo(result.error, err=True)
+
+        suffixes = tuple(suffix if suffix.startswith(".") else f".{suffix}" for suffix in suffixes)
+        watcher = DirectoryWatcher(
+            SyncEngine(gist_api, jobs=jobs),
+            directory,
+            suffixes=suffixes,
+            debounce=debounce,
+            poll_interval=poll_interval,
+            use_watchdog=False if polling else None,
+        )
+        mode = "file system events" if watcher.use_watchdog else "polling"
+        click.echo(f"Watching {directory} ({mode}), press Ctrl+C to stop", err=True)
+        try:
+            watcher.run(callback=_echo_result, initial=initial)
+        except KeyboardInterrupt:
+            pass
+
+    # Echo the request statistics (if requested) and a simple echo string
+    _echo_stats(collector, stats, stats_json)
     click.echo("DONE")
@@ -1,11 +1,99 @@
 """Main GISTys script that contains all required parts of the module."""
 
 # Import standard libraries
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from dataclasses import dataclass
 import json
+import os
 from pathlib import Path
+import shutil
+import threading
+import time
 import typing as t
+from urllib.parse import parse_qs, urlparse
 
-import requests
+from gistyc import GITHUB_API_URL
+from gistyc.blocks import block_pattern, diff_blocks, gist_body, gist_file_name, iter_blocks
+from gistyc.cache import GISTContentCache, gist_revision
+from gistyc.index import GISTIndex
+from gistyc.instrument import GISTEvent, Hook, endpoint_name
+from gistyc.ratelimit import RateLimitBudget, RateLimiter
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+    from gistyc.sync import PlanItem, SyncResult
+
+# Contents of larger GIST files are truncated in the GIST response (about 1 MB)
+TRUNCATED_SIZE = 1 << 20
+
+# Chunk size of streamed raw file downloads
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+def last_page_number(links: t.Mapping[str, t.Any]) -> int:
+    """Get the last page number from the pagination "Link" header of a listing response.
+
+    Parameters
+    ----------
+    links : Mapping
+        Parsed "Link" header of a paginated REST API response (e.g., requests.Response.links).
+
+    Returns
+    -------
+    int
+        Number of the last page. 1, if the response has no "last" link.
+
+    """
+    # The "last" link is only present if more than 1 page exists
+    last_url = links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+
+    return int(parse_qs(urlparse(str(last_url)).query)["page"][0])
+
+
+@dataclass
+class RequestStats:
+    """Accumulated statistics of the REST API calls within a measurement (see GISTyc.measure).
+
+    Attributes
+    ----------
+    requests : int
+        Number of sent requests (including retries).
+    bytes_sent : int
+        Size of all request bodies in bytes.
+    latency : float
+        Accumulated response time of all requests in seconds (without scheduling delays).
+    status_code : int, optional
+        HTTP response code of the last request.
+
+    """
+
+    requests: int = 0
+    bytes_sent: int = 0
+    latency: float = 0.0
+    status_code: t.Optional[int] = None
+
+    def add(self, other: "RequestStats") -> None:
+        """Add the statistics of another measurement, e.g., of a pool worker.
+
+        Parameters
+        ----------
+        other : RequestStats
+            Statistics to add.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.requests += other.requests
+        self.bytes_sent += other.bytes_sent
+        self.latency += other.latency
+        if other.status_code is not None:
+            self.status_code = other.status_code
 
 
 class GISTAmbiguityError(Exception):
@@ -47,6 +135,186 @@ class GISTAmbiguityError(Exception):
         return f"{self.message}\nIDs: " + ", ".join(self.gist_ids_list)
 
 
+class GISTNotFoundError(Exception):
+    """Exception for GISTs that do not exist (anymore), e.g., deleted by another client."""
+
+    def __init__(self, gist_id: str, message: str = "GIST not found") -> None:
+        """Initiate the Exception class.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        message : str, optional
+            Default exception message. The default is "GIST not found".
+
+        Returns
+        -------
+        None.
+
+        """
+        # Set the instances; GIST ID and message
+        self.gist_id = gist_id
+        self.message = message
+
+        # Super call itself to create message
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """Modify the message function.
+
+        Returns
+        -------
+        str
+            Exception message.
+
+        """
+        return f"{self.message}: {self.gist_id}"
+
+
+class GISTCatalog:
+    """Hash-based look-up structure of a GIST listing.
+
+    The catalog is built once from a listing (see GISTyc.get_gists) and maps file names to GIST
+    IDs and GIST IDs to file names. File names that occur in more than one GIST are detected
+    while building the catalog.
+
+    """
+
+    def __init__(self, gists: t.Iterable[t.Dict] = ()) -> None:
+        """Initiate the catalog from a GIST listing.
+
+        Parameters
+        ----------
+        gists : iterable
+            GISTs as returned by the REST API. The default is an empty listing.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Set the file name -> GIST IDs index, the GIST ID -> file names index and the ambiguous
+        # file names (file name -> GIST IDs). The catalog is shared by worker threads
+        self._lock = threading.RLock()
+        self._gist_ids: t.Dict[str, t.List[str]] = {}
+        self._files: t.Dict[str, t.List[str]] = {}
+        self.ambiguous: t.Dict[str, t.List[str]] = {}
+
+        for gist in gists:
+            self.add(gist)
+
+    def __contains__(self, file_name: object) -> bool:
+        """Check whether a file name is present in any GIST.
+
+        Parameters
+        ----------
+        file_name : object
+            GIST file name (without a path).
+
+        Returns
+        -------
+        bool
+            True, if the file name is present.
+
+        """
+        with self._lock:
+            return file_name in self._gist_ids
+
+    def __len__(self) -> int:
+        """Get the number of GISTs.
+
+        Returns
+        -------
+        int
+            Number of GISTs in the catalog.
+
+        """
+        with self._lock:
+            return len(self._files)
+
+    def add(self, gist: t.Dict) -> None:
+        """Add a (created or updated) GIST to the catalog.
+
+        Parameters
+        ----------
+        gist : dict
+            GIST as returned by the REST API.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+
+            # An updated GIST may have a different set of files
+            self.remove(gist["id"])
+
+            self._files[gist["id"]] = list(gist["files"])
+            for file_name in gist["files"]:
+                gist_ids = self._gist_ids.setdefault(file_name, [])
+                gist_ids.append(gist["id"])
+                if len(gist_ids) > 1:
+                    self.ambiguous[file_name] = gist_ids
+
+    def remove(self, gist_id: str) -> None:
+        """Remove a (deleted) GIST from the catalog.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            for file_name in self._files.pop(gist_id, []):
+                gist_ids = self._gist_ids[file_name]
+                gist_ids.remove(gist_id)
+                if len(gist_ids) < 2:
+                    self.ambiguous.pop(file_name, None)
+                if not gist_ids:
+                    del self._gist_ids[file_name]
+
+    def gist_ids(self, file_name: str) -> t.List[str]:
+        """Get the IDs of all GISTs that contain a file name.
+
+        Parameters
+        ----------
+        file_name : str
+            GIST file name (without a path).
+
+        Returns
+        -------
+        list
+            List of GIST IDs. Empty, if the file name is not present.
+
+        """
+        with self._lock:
+            return list(self._gist_ids.get(file_name, []))
+
+    def files(self, gist_id: str) -> t.List[str]:
+        """Get the file names of a GIST.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        list
+            List of file names. Empty, if the GIST is not present.
+
+        """
+        with self._lock:
+            return list(self._files.get(gist_id, []))
+
+
 class GISTyc:
     """Access the GitHub GIST REST API functions to create, update and delete GISTs.
 
@@ -59,13 +327,62 @@ class GISTyc:
 
     """
 
-    def __init__(self, auth_token: str) -> None:
+    def __init__(
+        self,
+        auth_token: str,
+        api_url: str = GITHUB_API_URL,
+        session: t.Optional["requests.Session"] = None,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        timeout: t.Union[float, t.Tuple[float, float]] = (5.0, 30.0),
+        retries: int = 3,
+        cache_dir: t.Optional[t.Union[Path, str]] = None,
+        rate_limiter: t.Optional[RateLimiter] = None,
+        content_cache: t.Optional[GISTContentCache] = None,
+        max_downloads: int = 4,
+        hooks: t.Optional[t.Iterable[Hook]] = None,
+    ) -> None:
         """Initiate the GISTys class with the GitHub GIST REST API token.
 
+        All REST API calls share one HTTP session with a pool of keep-alive connections. Use the
+        class as a context manager (or call close()) to release the pooled connections.
+
         Parameters
         ----------
         auth_token : str
             Authentication token of the GitHub GIST REST API.
+        api_url : str, optional
+            Base URL of the REST API, e.g., a local stand-in server for testing. The default is
+            "https://api.github.com".
+        session : requests.Session, optional
+            Externally configured session (or a session with a custom transport adapter) that is
+            used for all calls. The session is not closed by GISTyc. The default is None, i.e., a
+            pooled session is created.
+        pool_size : int, optional
+            Maximum number of pooled connections per host. The default is 10.
+        keep_alive : bool, optional
+            Keep connections alive between calls. The default is True.
+        timeout : float or tuple, optional
+            Request timeout in seconds; either a single value or a (connect, read) tuple. The
+            default is (5.0, 30.0).
+        retries : int, optional
+            Number of retries for connection errors and server errors (5xx) of idempotent calls.
+            The default is 3.
+        cache_dir : pathlib.Path or str, optional
+            Directory of the persistent GIST index (see GISTIndex). If set, GIST listings are
+            revalidated with conditional requests and file name look-ups are served from the
+            index. The default is None, i.e., no index.
+        rate_limiter : RateLimiter, optional
+            Scheduler that tracks the rate limit budget, spaces content-creating requests and
+            retries rate limited requests. The default is None, i.e., RateLimiter().
+        content_cache : GISTContentCache, optional
+            Cache of single GISTs and their file contents (see get_gist). The default is None,
+            i.e., a cache in <cache_dir>/content or a memory-only cache if no cache_dir is set.
+        max_downloads : int, optional
+            Maximum number of concurrent raw file downloads (of all threads). The default is 4.
+        hooks : iterable, optional
+            Instrumentation hooks that are called with every event (see add_hook). The default is
+            None.
 
         Returns
         -------
@@ -75,64 +392,417 @@ class GISTyc:
         # Set the authentication token
         self.auth_token = auth_token
 
+        # Set the REST API base url and the request timeout
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+
         # Set the default header for the REST API
         self._headers = {"Authorization": f"token {auth_token}"}
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+
+        # Use the injected session as it is. Otherwise, a session with a connection pool and a
+        # retry policy is created on first use (see session)
+        self._owns_session = session is None
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._pool_size = pool_size
+        self._retries = retries
+
+        # Open the persistent GIST index of the token's account (if requested)
+        self.index = GISTIndex.for_token(auth_token, cache_dir, self.api_url) if cache_dir else None
+
+        # Catalog of all GISTs; built by the first get_catalog call and kept up to date by all
+        # create, update, rename and delete calls
+        self._catalog: t.Optional[GISTCatalog] = None
+        self._catalog_lock = threading.Lock()
+
+        # Set the cache of single GISTs (keyed by GIST ID and revision)
+        if content_cache is None:
+            content_dir = Path(cache_dir).expanduser() / "content" if cache_dir else None
+            content_cache = GISTContentCache(content_dir)
+        self.content_cache = content_cache
+
+        # Bound the concurrent raw file downloads (large files are streamed to disk)
+        self.max_downloads = max_downloads
+        self._download_slots = threading.BoundedSemaphore(max_downloads)
+
+        # Set the scheduler of all REST API calls
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # Request statistics of the active measurement of each thread (see measure). Pool
+        # workers add their statistics to the measurement of the calling thread
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        # Set the instrumentation hooks
+        self.hooks: t.List[Hook] = list(hooks or [])
+
+    def __enter__(self) -> "GISTyc":
+        """Enter the context manager.
+
+        Returns
+        -------
+        GISTyc
+            The instance itself.
+
+        """
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        """Exit the context manager and close the pooled connections.
+
+        Parameters
+        ----------
+        *exc_info : t.Any
+            Exception information (unused).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled connections (if the session has been created by GISTyc) and the index.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
+
+        if self.index is not None:
+            self.index.close()
 
     @staticmethod
-    def _readnparse_python_file(
-        file_name: t.Union[Path, str], sep: str = "#%%"
-    ) -> t.Dict[t.Any, t.Any]:
-        """Read a Python file and returns a REST API - ready body.
+    def _create_session(pool_size: int, retries: int) -> "requests.Session":
+        """Create an HTTP session with a connection pool and a retry policy for server errors.
+
+        requests is imported here, so importing gistyc and constructing GISTyc stay cheap (e.g.,
+        for CLI calls that do not send any request).
 
         Parameters
         ----------
-        file_name : pathlib.Path or str
-            Absolute or relative path name of the file to read.
-        sep : str
-            Python code block separator. Default is '#%%'
+        pool_size : int
+            Number of pooled connections.
+        retries : int
+            Number of retries of failed connections and server errors.
 
         Returns
         -------
-        data : dict
-            Body for the REST API call.
+        requests.Session
+            HTTP session.
 
         """
-        # Set the filename as a Path
-        file_name = Path(file_name)
+        # pylint: disable=import-outside-toplevel
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    @property
+    def session(self) -> "requests.Session":
+        """Return the HTTP session, which is created on first use (thread-safe).
 
-        # Open the file and read the content. The entire content is stored in a single string.
-        with open(file_name, "r") as file_obj:
-            file_content = file_obj.read()
+        Returns
+        -------
+        requests.Session
+            HTTP session.
 
-        # Get the file name without the path
-        core_file_name = file_name.name
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session(self._pool_size, self._retries)
 
-        # Split the python file content at the cell separator "#%%". The resulting list contains
-        # the code blocks as individual array elements
-        file_content_list = file_content.split(f"{sep}\n")
+        return self._session
 
-        # The python code (blocks) must be put into a dictionary that is later used as a JSON
-        # in the request REST API body
-        gist_code_dict = {}
+    def _request(self, method: str, path: str, **kwargs: t.Any) -> "requests.Response":
+        """Send a REST API call through the pooled session and the rate limit scheduler.
 
-        # Iterate through the list of code blocks
-        for index, k in enumerate(file_content_list):
+        Content-creating requests are spaced and rate limited requests (403 / 429) are retried
+        after the delay that is given by the server or by an exponential backoff.
 
-            # At the first index, simply add the content with the original file name ...
-            if index == 0:
-                gist_code_dict[core_file_name] = {"content": k}
+        Parameters
+        ----------
+        method : str
+            HTTP method, e.g., "GET".
+        path : str
+            REST API path, e.g., "/gists". Absolute URLs are used as they are.
+        **kwargs : t.Any
+            Further keyword arguments for requests.Session.request.
 
-            # ... all other GIST file names get a consecutive, index depending number as a suffix
-            else:
-                gist_code_dict[core_file_name.replace(".py", f"_{index}.py")] = {"content": k}
+        Returns
+        -------
+        resp : requests.Response
+            REST API response.
 
-        # Put the content in a dictionary for the REST API
-        data = {
-            "public": True,
-            "files": gist_code_dict,
-        }
+        """
+        # Set the url, the default headers and the timeout
+        url = path if path.startswith("http") else f"{self.api_url}{path}"
+        headers = {**self._headers, **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        while True:
+
+            # Wait for the reserved time slot and send the request
+            time.sleep(self.rate_limiter.reserve(method))
+            start_time = time.perf_counter()
+            resp = self.session.request(method, url, headers=headers, **kwargs)
+
+            # Add the request to the active measurement (if any) and to the hooks
+            latency = time.perf_counter() - start_time
+            body = kwargs.get("data") or b""
+            bytes_sent = len(body.encode("utf-8") if isinstance(body, str) else body)
+            stats = getattr(self._local, "stats", None)
+            if stats is not None:
+                stats.requests += 1
+                stats.bytes_sent += bytes_sent
+                stats.latency += latency
+                stats.status_code = resp.status_code
+            if self.hooks:
+                self._emit_request(method, url, resp, latency, bytes_sent, attempt, **kwargs)
+
+            # Update the rate limit budget and retry the request if it has been rate limited
+            retry_delay = self.rate_limiter.update(
+                resp.status_code,
+                resp.headers,
+                attempt,
+                resp.text if resp.status_code == 403 else "",
+            )
+            if retry_delay is None:
+                return resp
+
+            time.sleep(retry_delay)
+            attempt += 1
+
+    def add_hook(self, hook: Hook) -> None:
+        """Add an instrumentation hook.
+
+        The hook is called with a GISTEvent around every request (including retries), listing
+        page, parse and diff step and content cache look-up (see gistyc.instrument). Hooks are
+        called in the thread of the event and must be thread-safe, e.g., StatsCollector.
+
+        Parameters
+        ----------
+        hook : callable
+            Function that is called with each event.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.hooks.append(hook)
+
+    def _emit(self, kind: str, name: str, **kwargs: t.Any) -> None:
+        """Pass an instrumentation event to all hooks.
+
+        Parameters
+        ----------
+        kind : str
+            Kind of the event, see GISTEvent.
+        name : str
+            Name of the event, see GISTEvent.
+        **kwargs : t.Any
+            Further attributes of the event.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.hooks:
+            event = GISTEvent(kind, name, **kwargs)
+            for hook in self.hooks:
+                hook(event)
+
+    def _emit_request(
+        self,
+        method: str,
+        url: str,
+        resp: "requests.Response",
+        latency: float,
+        bytes_sent: int,
+        attempt: int,
+        stream: bool = False,
+        **_kwargs: t.Any,
+    ) -> None:
+        """Pass a request event to all hooks.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        url : str
+            Request URL.
+        resp : requests.Response
+            Response.
+        latency : float
+            Response time in seconds.
+        bytes_sent : int
+            Size of the request body in bytes.
+        attempt : int
+            Number of previous attempts (retries of rate limited requests).
+        stream : bool, optional
+            The response body is streamed. It is not consumed here; its size is taken from the
+            headers. The default is False.
+        **_kwargs : t.Any
+            Further (unused) keyword arguments of the request.
+
+        Returns
+        -------
+        None.
+
+        """
+        if stream:
+            bytes_received = int(resp.headers.get("Content-Length") or 0)
+        else:
+            bytes_received = len(resp.content or b"")
+
+        self._emit(
+            "request",
+            endpoint_name(method, url),
+            duration=latency,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            status_code=resp.status_code,
+            retry=attempt > 0,
+            url=url,
+        )
+
+    @contextlib.contextmanager
+    def _timed(self, kind: str, name: str) -> t.Iterator[None]:
+        """Emit an instrumentation event with the duration of a with-block.
+
+        Parameters
+        ----------
+        kind : str
+            Kind of the event, see GISTEvent.
+        name : str
+            Name of the event, see GISTEvent.
+
+        Returns
+        -------
+        Iterator
+            Nothing is yielded.
+
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._emit(kind, name, duration=time.perf_counter() - start_time)
+
+    @contextlib.contextmanager
+    def measure(self) -> t.Iterator[RequestStats]:
+        """Measure the REST API calls of the current thread within a with-block.
+
+        Calls of the pool workers that fetch listing pages and downloads for the current thread
+        are included.
+
+        Example:
+
+            with gist_api.measure() as stats:
+                gist_api.update_gist(file_name=FILEPATH)
+            print(stats.requests, stats.bytes_sent, stats.latency)
+
+        Returns
+        -------
+        Iterator
+            Statistics that are updated by every call within the block.
+
+        """
+        previous_stats = getattr(self._local, "stats", None)
+        self._local.stats = stats = RequestStats()
+        try:
+            yield stats
+        finally:
+            self._local.stats = previous_stats
+
+    def _carry_measurement(self, func: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+        """Wrap a function that runs in a pool worker to count its calls in the active measurement.
+
+        Parameters
+        ----------
+        func : callable
+            Function that is called by the pool workers.
+
+        Returns
+        -------
+        callable
+            Function that adds the statistics of its REST API calls to the measurement of the
+            current thread (or the function itself, if no measurement is active).
+
+        """
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            return func
+
+        def _measured(*args: t.Any) -> t.Any:
+            with self.measure() as worker_stats:
+                try:
+                    return func(*args)
+                finally:
+                    with self._stats_lock:
+                        stats.add(worker_stats)
+
+        return _measured
+
+    @property
+    def rate_limit(self) -> RateLimitBudget:
+        """Return the current rate limit budget (as reported by the last response).
+
+        Returns
+        -------
+        RateLimitBudget
+            Limit, remaining requests, reset time and number of retries.
+
+        """
+        return self.rate_limiter.budget
+
+    @staticmethod
+    def _readnparse_python_file(
+        file_name: t.Union[Path, str], sep: t.Optional[str] = None
+    ) -> t.Dict[t.Any, t.Any]:
+        """Read a source file and returns a REST API - ready body (see gistyc.blocks.gist_body).
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        sep : str, optional
+            Code block separator. The default is None, i.e., the separator convention of the
+            file's language (see gistyc.blocks), e.g., '#%%' for Python files.
+
+        Returns
+        -------
+        data : dict
+            Body for the REST API call.
 
-        return data
+        """
+        return gist_body(file_name, sep)
 
     def _get_gist_id(
         self, file_name: t.Optional[Path] = None, gist_id: t.Optional[str] = None
@@ -151,6 +821,8 @@ class GISTyc:
         ------
         GISTAmbiguityError
             Exception raised if a file name has more than 1 GIST IDs.
+        GISTNotFoundError
+            Exception raised if no GIST contains the file name.
 
         Returns
         -------
@@ -165,22 +837,18 @@ class GISTyc:
         # gist id
         elif isinstance(file_name, Path):
 
-            # Set a placeholder for the GIST IDs
-            gist_ids = []
-
-            # Get all GISTs
-            gist_list = self.get_gists()
-
-            # Iterate trough all GISTs
-            for _gist in gist_list:
-
-                # Check if the file name is present in the GIST
-                if file_name.name in _gist["files"]:
-
-                    # Append the corresponding GIST
-                    gist_ids.append(_gist["id"])
-
-            # If more than 1 GIST ID is present: raise an exception
+            # Look up the file name in the catalog. Building the catalog revalidates the index (if
+            # present) once per instance, so a stale index cannot hide a GIST that has been
+            # created elsewhere. A cached catalog is refreshed once on a miss
+            core_file_name = gist_file_name(file_name)
+            cached = self._catalog is not None
+            gist_ids = self.get_catalog().gist_ids(core_file_name)
+            if not gist_ids and cached:
+                gist_ids = self.get_catalog(refresh=True).gist_ids(core_file_name)
+
+            # If no or more than 1 GIST ID is present: raise an exception
+            if not gist_ids:
+                raise GISTNotFoundError(core_file_name, "No GIST found for the file name")
             if len(gist_ids) > 1:
                 raise GISTAmbiguityError(gist_ids_list=gist_ids)
 
@@ -190,45 +858,200 @@ class GISTyc:
 
         return gist_id_ret
 
-    def get_gists(self) -> t.List[t.Dict]:
+    def _get_gists_page(self, page: int, etag: t.Optional[str] = None) -> "requests.Response":
+        """Get a single page of the GIST listing.
+
+        Parameters
+        ----------
+        page : int
+            Page number (starting at 1).
+        etag : str, optional
+            ETag of a stored version of the page. If set, the request is conditional and an
+            unchanged page is answered with 304 (Not Modified). The default is None.
+
+        Raises
+        ------
+        requests.HTTPError
+            Exception raised if the page could not be fetched (after all retries). An incomplete
+            listing would hide existing GISTs.
+
+        Returns
+        -------
+        resp : requests.Response
+            REST API response.
+
+        """
+        # Per page: a max. value of 100 GISTs is requested
+        headers = {"If-None-Match": etag} if etag else {}
+        resp = self._request("GET", f"/gists?page={page}&per_page=100", headers=headers)
+        self._emit(
+            "page",
+            str(page),
+            duration=resp.elapsed.total_seconds(),
+            status_code=resp.status_code,
+            hit=resp.status_code == 304,
+        )
+        resp.raise_for_status()
+
+        return resp
+
+    def get_gists(self, max_workers: int = 8) -> t.List[t.Dict]:
         """Get all GISTs information like e.g., ID, url, meta information, etc.
 
+        The first page provides the number of pages (pagination "Link" header). All remaining
+        pages are then fetched concurrently. If an index is present, all pages are revalidated
+        with conditional requests and only changed pages are downloaded.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of pages that are fetched concurrently. The default is 8.
+
         Returns
         -------
         resp_data : list
             List of GISTs. Each GIST is a dictionary with miscellaneous data and meta data.
 
         """
-        # Set the REST API url to obtain the list of GISTs. PAGE will be replace later in a loop.
-        # Per page: a max. value of 100 GISTs is requested
-        _query_url = "https://api.github.com/gists?page=PAGE&per_page=100"
+        if self.index is not None:
+            return self._get_gists_indexed(self.index, max_workers)
 
-        # All GISTs shall be stored in this placeholder array
-        resp_data = []
+        # Get the first page and the number of the last page
+        resp = self._get_gists_page(1)
+        resp_data = resp.json()
+        last_page = last_page_number(resp.links)
+
+        # Fetch the remaining pages with a bounded worker pool. map() returns the pages in order,
+        # so the resulting list has the same (deterministic) order as a sequential walk
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1)) as executor:
+                pages = range(2, last_page + 1)
+                for resp in executor.map(self._carry_measurement(self._get_gists_page), pages):
+                    resp_data.extend(resp.json())
 
-        # To iterate through the GIST pages, set an inital counter that will incrementally increase
-        cntr = 0
+        return resp_data
 
-        # While condition: Iterate trough the GIST pages, until the response is empty
-        _resp_ansr = True
-        while _resp_ansr:
-            cntr += 1
+    def _get_gists_indexed(self, index: GISTIndex, max_workers: int) -> t.List[t.Dict]:
+        """Get all GISTs by revalidating the pages that are stored in the index.
 
-            # Get the GISTs for a particular page
-            resp = requests.get(_query_url.replace("PAGE", str(cntr)), headers=self._headers)
-            resp_content = resp.json()
+        Parameters
+        ----------
+        index : GISTIndex
+            GIST index.
+        max_workers : int
+            Maximum number of pages that are fetched concurrently.
 
-            # If the response is not empty, obtain the results and extend the placeholder array
-            if len(resp_content) > 0:
-                resp_data.extend(resp_content)
+        Returns
+        -------
+        resp_data : list
+            List of GISTs.
 
-            # Otherwise set the while condition to false
+        """
+
+        def _revalidate(page: int) -> "requests.Response":
+            return self._get_gists_page(page, etag=index.page_etag(page))
+
+        # Revalidate the first page. A 304 response may come without a "Link" header; in this
+        # case the number of stored pages is used
+        resp = _revalidate(1)
+        if resp.status_code == 304 and "last" not in resp.links:
+            last_page = max(index.page_count(), 1)
+        else:
+            last_page = last_page_number(resp.links)
+
+        # Revalidate the remaining pages concurrently
+        responses = {1: resp}
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1)) as executor:
+                pages = range(2, last_page + 1)
+                responses.update(
+                    zip(pages, executor.map(self._carry_measurement(_revalidate), pages))
+                )
+
+        # Store the changed pages (and drop pages behind the last page)
+        changed_pages = {
+            page: (resp.headers.get("ETag"), resp.json())
+            for page, resp in responses.items()
+            if resp.status_code != 304
+        }
+        if changed_pages or index.page_count() != last_page:
+            index.store_pages(changed_pages, last_page)
+
+        # Concatenate the pages in order
+        resp_data = []
+        for page in range(1, last_page + 1):
+            if page in changed_pages:
+                resp_data.extend(changed_pages[page][1])
             else:
-                _resp_ansr = False
+                resp_data.extend(index.get_page(page))
 
         return resp_data
 
-    def create_gist(self, file_name: t.Union[Path, str], sep: str = "#%%") -> t.List:
+    def get_catalog(self, max_workers: int = 8, refresh: bool = False) -> GISTCatalog:
+        """Get a catalog of all GISTs for fast file name look-ups.
+
+        The catalog is built from the listing once and cached on the instance. All create,
+        update, rename and delete calls of the instance keep it up to date.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of pages that are fetched concurrently. The default is 8.
+        refresh : bool, optional
+            Rebuild the catalog from the current listing, e.g., if GISTs have been changed by
+            other clients. The default is False.
+
+        Returns
+        -------
+        GISTCatalog
+            Catalog of all GISTs.
+
+        """
+        with self._catalog_lock:
+            if self._catalog is None or refresh:
+                self._catalog = GISTCatalog(self.get_gists(max_workers=max_workers))
+
+            return self._catalog
+
+    def _remember_gist(self, gist: t.Dict) -> None:
+        """Add a created / updated GIST to the index, the catalog and the content cache.
+
+        Parameters
+        ----------
+        gist : dict
+            GIST REST API response.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.index is not None:
+            self.index.upsert_gist(gist)
+        if self._catalog is not None:
+            self._catalog.add(gist)
+        self.content_cache.put(gist)
+
+    def _forget_gist(self, gist_id: str) -> None:
+        """Remove a deleted GIST from the index, the catalog and the content cache.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.index is not None:
+            self.index.remove_gist(gist_id)
+        if self._catalog is not None:
+            self._catalog.remove(gist_id)
+        self.content_cache.remove(gist_id)
+
+    def create_gist(self, file_name: t.Union[Path, str], sep: t.Optional[str] = None) -> t.Dict:
         """Create a GISTs from a given file.
 
         Use "#%%" as a block separator to create sub-GISTs / files from a single input file as
@@ -238,8 +1061,9 @@ class GISTyc:
         ----------
         file_name : pathlib.Path or str
             Absolute or relative path name of the file to read.
-        sep : str
-            Python code block separator. Default is '#%%'
+        sep : str, optional
+            Code block separator. The default is None, i.e., the separator convention of the
+            file's language (see gistyc.blocks), e.g., '#%%' for Python files.
 
         Returns
         -------
@@ -248,22 +1072,386 @@ class GISTyc:
 
         """
         # Set the REST API url for creating a GIST
-        _query_url = "https://api.github.com/gists"
+        _query_url = "/gists"
 
         # Read the file and return the body for the REST API call
-        rest_api_data = self._readnparse_python_file(file_name, sep=sep)
+        with self._timed("parse", str(file_name)):
+            rest_api_data = self._readnparse_python_file(file_name, sep=sep)
 
         # Call the REST API and obtain the response
-        resp = requests.post(_query_url, headers=self._headers, data=json.dumps(rest_api_data))
+        resp = self._request("POST", _query_url, data=json.dumps(rest_api_data))
         resp_data = resp.json()
 
+        # Add the new GIST to the index, the catalog and the content cache
+        if resp.ok:
+            self._remember_gist(resp_data)
+
         return resp_data
 
-    def update_gist(self, file_name: t.Union[Path, str], gist_id: t.Optional[str] = None) -> t.List:
+    def get_gist(self, gist_id: str, revision: t.Optional[str] = None) -> t.Dict:
+        """Get a single GIST including its file contents (served from the content cache).
+
+        A cached revision is returned without any REST API call. The latest revision is
+        revalidated with a conditional request (If-None-Match); an unchanged GIST is answered
+        with 304 and the cached GIST is returned, i.e., the contents are only re-downloaded if
+        the revision changed. File contents that are truncated in the response are fetched
+        lazily, see get_file_content.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str, optional
+            Revision SHA (history version). The default is None, i.e., the latest revision.
+
+        Raises
+        ------
+        GISTNotFoundError
+            Exception raised if the GIST does not exist (anymore). It is removed from the index
+            and the catalog.
+
+        Returns
+        -------
+        gist : dict
+            GIST REST API response.
+
+        """
+        # A specific revision never changes
+        if revision is not None:
+            cached_gist = self.content_cache.get(gist_id, revision)
+            self._emit("cache", "gist", hit=cached_gist is not None)
+            if cached_gist is not None:
+                return cached_gist
+
+            resp = self._request("GET", f"/gists/{gist_id}/{revision}")
+            resp.raise_for_status()
+            gist: t.Dict = resp.json()
+            self.content_cache.put(gist, latest=False)
+
+            return gist
+
+        # Revalidate the latest cached revision (if any)
+        headers = {}
+        latest = self.content_cache.latest(gist_id)
+        cached_gist = self.content_cache.get(gist_id, latest[0]) if latest else None
+        if latest and latest[1] and cached_gist is not None:
+            headers["If-None-Match"] = latest[1]
+
+        resp = self._request("GET", f"/gists/{gist_id}", headers=headers)
+        self._emit("cache", "gist", hit=resp.status_code == 304 and cached_gist is not None)
+        if resp.status_code == 304 and cached_gist is not None:
+            return cached_gist
+
+        # A deleted GIST is removed from the index and the catalog
+        if resp.status_code == 404:
+            self._forget_gist(gist_id)
+            raise GISTNotFoundError(gist_id)
+
+        gist = resp.json()
+        if resp.ok:
+            self.content_cache.put(gist, etag=resp.headers.get("ETag"))
+
+        return gist
+
+    def get_file_content(
+        self, gist_id: str, file_name: str, revision: t.Optional[str] = None
+    ) -> t.Optional[str]:
+        """Get the complete content of a GIST file, even if it is truncated in the GIST response.
+
+        Truncated contents are fetched lazily through the raw URL of the file and cached by the
+        GIST revision.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        file_name : str
+            GIST file name.
+        revision : str, optional
+            Revision SHA (history version). The default is None, i.e., the latest revision.
+
+        Returns
+        -------
+        content : str or None
+            File content. None, if the GIST has no such file.
+
+        """
+        # Get the (cached) GIST and the file
+        gist = self.get_gist(gist_id, revision)
+        gist_file = gist.get("files", {}).get(file_name)
+        if gist_file is None:
+            return None
+        if not gist_file.get("truncated"):
+            return t.cast(str, gist_file["content"])
+
+        # Fetch the truncated content once per revision. With a disk cache, the content is
+        # streamed to the cache file
+        revision = gist_revision(gist) or ""
+        content = self.content_cache.get_content(gist_id, revision, file_name)
+        self._emit("cache", "content", hit=content is not None)
+        if content is None:
+            content_path = self.content_cache.content_path(gist_id, revision, file_name)
+            if content_path is not None:
+                self._download_raw(gist_file["raw_url"], content_path)
+                content = content_path.read_text(encoding="utf-8")
+            else:
+                with self._download_slots:
+                    resp = self._request("GET", gist_file["raw_url"])
+                resp.raise_for_status()
+                content = resp.text
+                self.content_cache.put_content(gist_id, revision, file_name, content)
+
+        return content
+
+    @staticmethod
+    def is_truncated(gist_file: t.Dict) -> bool:
+        """Check if the content of a GIST file is (possibly) incomplete in a REST API response.
+
+        Single GIST responses mark truncated contents. Listings (see get_gists) contain no
+        contents at all; a file is considered as truncated if its size exceeds TRUNCATED_SIZE.
+
+        Parameters
+        ----------
+        gist_file : dict
+            File of a GIST (single GIST response or listing).
+
+        Returns
+        -------
+        bool
+            True, if the content must be fetched through the raw URL of the file.
+
+        """
+        if "content" in gist_file:
+            return bool(gist_file.get("truncated"))
+
+        return bool(gist_file.get("size", 0) > TRUNCATED_SIZE)
+
+    def _download_raw(
+        self, raw_url: str, target: Path, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Path:
+        """Stream a raw file in chunks to disk (the content is never loaded completely).
+
+        The download is written to a temporary file that replaces the target at the end, so
+        the target is never incomplete. At most max_downloads downloads run concurrently.
+
+        Parameters
+        ----------
+        raw_url : str
+            Raw URL of the GIST file.
+        target : pathlib.Path
+            Target file path.
+        chunk_size : int, optional
+            Size of the chunks in bytes. The default is DOWNLOAD_CHUNK_SIZE.
+
+        Returns
+        -------
+        target : pathlib.Path
+            Target file path.
+
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        part_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.part")
+
+        try:
+            with self._download_slots, self._request("GET", raw_url, stream=True) as resp:
+                resp.raise_for_status()
+                with open(part_path, "wb") as part_file:
+                    for chunk in resp.iter_content(chunk_size):
+                        part_file.write(chunk)
+            os.replace(part_path, target)
+        finally:
+            if part_path.exists():
+                part_path.unlink()
+
+        return target
+
+    def download_file(
+        self,
+        gist_id: str,
+        file_name: str,
+        target: t.Union[Path, str],
+        revision: t.Optional[str] = None,
+    ) -> Path:
+        """Download a GIST file to disk. Truncated (large) contents are streamed in chunks.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        file_name : str
+            GIST file name.
+        target : pathlib.Path or str
+            Target file path.
+        revision : str, optional
+            Revision SHA (history version). The default is None, i.e., the latest revision.
+
+        Returns
+        -------
+        target : pathlib.Path
+            Target file path.
+
+        """
+        # Get the (cached) GIST and the file
+        target = Path(target)
+        gist = self.get_gist(gist_id, revision)
+        gist_file = gist["files"][file_name]
+
+        # Complete contents are written directly
+        if not self.is_truncated(gist_file):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "w", encoding="utf-8", newline="") as target_file:
+                target_file.write(gist_file["content"])
+
+            return target
+
+        # Truncated contents are copied from the disk cache or streamed from the raw URL
+        content_path = self.content_cache.content_path(
+            gist_id, gist_revision(gist) or "", file_name
+        )
+        if content_path is not None and content_path.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(content_path, target)
+
+            return target
+
+        return self._download_raw(gist_file["raw_url"], target)
+
+    def download_gist(
+        self,
+        gist_id: str,
+        directory: t.Union[Path, str],
+        revision: t.Optional[str] = None,
+    ) -> t.Dict[str, Path]:
+        """Download all files of a GIST to a directory.
+
+        The files are downloaded concurrently (at most max_downloads at a time); truncated
+        (large) contents are streamed in chunks to disk.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        directory : pathlib.Path or str
+            Target directory.
+        revision : str, optional
+            Revision SHA (history version). The default is None, i.e., the latest revision.
+
+        Returns
+        -------
+        dict
+            GIST file name -> target file path.
+
+        """
+        # Get the GIST once; the downloads use the cached GIST of the same revision
+        gist = self.get_gist(gist_id, revision)
+        revision = gist_revision(gist) or revision
+        file_names = list(gist.get("files", {}))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_downloads)) as executor:
+            target_paths = executor.map(
+                self._carry_measurement(
+                    lambda file_name: self.download_file(
+                        gist_id, file_name, Path(directory) / file_name, revision
+                    )
+                ),
+                file_names,
+            )
+
+            return dict(zip(file_names, target_paths))
+
+    def _fetch_gist(self, gist_id: str) -> t.Dict:
+        """Get a single GIST including its file contents (see get_gist).
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        resp_data : dict
+            GIST REST API response.
+
+        """
+        return self.get_gist(gist_id)
+
+    def _diff_gist(
+        self, file_name: Path, gist_id: t.Optional[str] = None
+    ) -> t.Tuple[str, t.Dict[str, t.Any], t.Dict]:
+        """Compare a local file with its GIST.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Absolute or relative path name of the file to read.
+        gist_id : str, optional
+            GIST ID. The default is None, i.e., the GIST is looked up by the file name.
+
+        Returns
+        -------
+        gist_id : str
+            GIST ID.
+        changed_files : dict
+            Changed files (code blocks), see gistyc.blocks.diff_files. Empty, if nothing changed.
+        remote_gist : dict
+            Current GIST (REST API response).
+
+        """
+        # Get the GIST ID and the current GIST
+        gist_id = self._get_gist_id(file_name=file_name, gist_id=gist_id)
+        remote_gist = self._fetch_gist(gist_id)
+        remote_files = remote_gist.get("files", {})
+
+        # Build the update files from the difference between the local and the remote files
+        # (truncated remote contents are fetched lazily and cached by the GIST revision)
+        revision = gist_revision(remote_gist)
+        with self._timed("diff", str(file_name)):
+            changed_files = diff_blocks(
+                iter_blocks(file_name),
+                remote_files,
+                gist_file_name(file_name),
+                lambda name: self.get_file_content(gist_id, name, revision),
+            )
+
+        return gist_id, changed_files, remote_gist
+
+    def diff_gist(
+        self, file_name: t.Union[Path, str], gist_id: t.Optional[str] = None
+    ) -> t.Dict[str, t.Any]:
+        """Get the files (code blocks) of a local file that differ from its GIST.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the file to read.
+        gist_id : str, optional
+            GIST ID that is needed if the file name appears more than once in the GIST repository.
+            The default is None.
+
+        Returns
+        -------
+        changed_files : dict
+            Files (code blocks) with a changed content and vanished code blocks (None), as used in
+            an update request body. Empty, if the GIST is unchanged.
+
+        """
+        _, changed_files, _ = self._diff_gist(Path(file_name), gist_id=gist_id)
+
+        return changed_files
+
+    def update_gist(
+        self,
+        file_name: t.Union[Path, str],
+        gist_id: t.Optional[str] = None,
+        files: t.Optional[t.Dict[str, t.Any]] = None,
+        force: bool = False,
+    ) -> t.Dict:
         """Update a GISTs based on its file name or GIST ID.
 
         If the file name is provided it is assumed that only one GIST corresponds to the input's
-        file name.
+        file name. Only files (code blocks) with a changed content are sent and vanished code
+        blocks are deleted. If nothing changed, no update request is sent, an "unchanged" event is
+        passed to the hooks and the current GIST is returned.
 
         Parameters
         ----------
@@ -272,6 +1460,11 @@ class GISTyc:
         gist_id : str, optional
             GIST ID that is needed if the file name appears more than once in the GIST repository.
             The default is None.
+        files : dict, optional
+            Changed files as returned by diff_gist. If provided, these files are sent without
+            comparing the GIST again. The default is None.
+        force : bool, optional
+            Send all files (code blocks), even if they are unchanged. The default is False.
 
         Returns
         -------
@@ -282,21 +1475,174 @@ class GISTyc:
         # Convert the file name to pathlib.Path
         file_name = Path(file_name)
 
-        # Get the GIST ID
-        gist_id = self._get_gist_id(file_name=file_name, gist_id=gist_id)
+        # Get the GIST ID and the changed files (unless all files shall be sent). The file is only
+        # read entirely if all files are sent; otherwise only the changed blocks are kept
+        if files is not None:
+            gist_id = self._get_gist_id(file_name=file_name, gist_id=gist_id)
+        elif force:
+            gist_id = self._get_gist_id(file_name=file_name, gist_id=gist_id)
+            with self._timed("parse", str(file_name)):
+                files = self._readnparse_python_file(file_name)["files"]
+        else:
+            gist_id, files, remote_gist = self._diff_gist(file_name, gist_id)
+
+            # Skip the update if nothing changed
+            if not files:
+                self._emit("unchanged", str(file_name))
+                return remote_gist
+        rest_api_data = {"public": True, "files": files}
 
         # Set the REST API url to update a GIST
-        _query_url = f"https://api.github.com/gists/{gist_id}"
+        _query_url = f"/gists/{gist_id}"
 
-        # Read and parse the file
-        rest_api_data = self._readnparse_python_file(file_name)
+        # Update the GIST and get the response
+        resp = self._request("PATCH", _query_url, data=json.dumps(rest_api_data))
+        resp_data = resp.json()
+
+        # Update the GIST in the index, the catalog and the content cache
+        if resp.ok:
+            self._remember_gist(resp_data)
+
+        return resp_data
+
+    def rename_gist(
+        self,
+        old_file_name: t.Union[Path, str],
+        file_name: t.Union[Path, str],
+        gist_id: t.Optional[str] = None,
+    ) -> t.Dict:
+        """Rename the files (code blocks) of a GIST after a local file has been renamed.
+
+        The GIST is kept (same ID, history and URL); its code block files are renamed and updated
+        with the content of the renamed local file.
+
+        Parameters
+        ----------
+        old_file_name : pathlib.Path or str
+            Previous file name (the file does not need to exist anymore).
+        file_name : pathlib.Path or str
+            Absolute or relative path name of the renamed file to read.
+        gist_id : str, optional
+            GIST ID that is needed if the previous file name appears more than once in the GIST
+            repository. The default is None.
+
+        Returns
+        -------
+        resp_data : dict
+            GIST REST API response.
+
+        """
+        # Convert the file names to pathlib.Path
+        old_file_name, file_name = Path(old_file_name), Path(file_name)
+
+        # Get the GIST ID (based on the previous file name) and the current GIST
+        gist_id = self._get_gist_id(file_name=old_file_name, gist_id=gist_id)
+        remote_files = self._fetch_gist(gist_id).get("files", {})
+
+        # Map the previous code block file names to the new ones (same block suffix)
+        new_path = Path(gist_file_name(file_name))
+        new_stem, new_suffix = new_path.stem, new_path.suffix
+        old_pattern = block_pattern(gist_file_name(old_file_name))
+        renames = {}
+        for remote_name in remote_files:
+            block_match = old_pattern.fullmatch(remote_name)
+            if block_match:
+                renames[f"{new_stem}{block_match.group(1) or ''}{new_suffix}"] = remote_name
+
+        # Compare the local code blocks with the renamed remote files
+        renamed_remote_files = {
+            new_name: remote_files[old_name] for new_name, old_name in renames.items()
+        }
+        changed_files = diff_blocks(iter_blocks(file_name), renamed_remote_files, new_path.name)
+
+        # Renamed files are addressed by their previous name; a new "filename" renames them
+        files: t.Dict[str, t.Optional[t.Dict]] = {}
+        for new_name, old_name in renames.items():
+            if new_name not in changed_files:
+                files[old_name] = {"filename": new_name}
+            elif changed_files[new_name] is None:
+                files[old_name] = None
+            else:
+                files[old_name] = {"filename": new_name, **t.cast(t.Dict, changed_files[new_name])}
+        files.update({name: block for name, block in changed_files.items() if name not in renames})
 
         # Update the GIST and get the response
-        resp = requests.patch(_query_url, headers=self._headers, data=json.dumps(rest_api_data))
+        resp = self._request("PATCH", f"/gists/{gist_id}", data=json.dumps({"files": files}))
         resp_data = resp.json()
 
+        # Update the GIST in the index, the catalog and the content cache
+        if resp.ok:
+            self._remember_gist(resp_data)
+
         return resp_data
 
+    def sync_many(
+        self,
+        file_names: t.Iterable[t.Union[Path, str]],
+        jobs: int = 4,
+        use_manifest: bool = True,
+        callback: t.Optional[t.Callable[["SyncResult"], None]] = None,
+    ) -> t.List["SyncResult"]:
+        """Create or update the GISTs of many files concurrently (see gistyc.sync.SyncEngine).
+
+        All GIST IDs are resolved from a single listing (only fetched if a changed file has no
+        known GIST ID) and unchanged files and GISTs are skipped.
+
+        Parameters
+        ----------
+        file_names : iterable
+            Absolute or relative path names of the files.
+        jobs : int, optional
+            Number of concurrently processed files. The default is 4.
+        use_manifest : bool, optional
+            Use the sync manifest of the index (if present). The default is True.
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done. The default is
+            None.
+
+        Returns
+        -------
+        list
+            SyncResult objects (action, GIST ID, HTTP response code, number of calls, bytes sent
+            and latency) in the order of the input files.
+
+        """
+        # Import the engine here; the sync module depends on this module
+        from gistyc.sync import SyncEngine  # pylint: disable=import-outside-toplevel
+
+        sync_engine = SyncEngine(self, jobs=jobs, use_manifest=use_manifest)
+
+        return sync_engine.run((Path(file_name) for file_name in file_names), callback=callback)
+
+    def apply(
+        self,
+        plan: t.Iterable["PlanItem"],
+        jobs: int = 4,
+        callback: t.Optional[t.Callable[["SyncResult"], None]] = None,
+    ) -> t.List["SyncResult"]:
+        """Execute a sync plan: create, update, rename and delete many GISTs concurrently.
+
+        Parameters
+        ----------
+        plan : iterable
+            gistyc.sync.PlanItem objects, e.g., PlanItem("DELETE", Path("old.py")).
+        jobs : int, optional
+            Number of concurrently processed items. The default is 4.
+        callback : callable, optional
+            Function that is called with each result as soon as an item is done. The default is
+            None.
+
+        Returns
+        -------
+        list
+            SyncResult objects in the order of the plan items.
+
+        """
+        # Import the engine here; the sync module depends on this module
+        from gistyc.sync import SyncEngine  # pylint: disable=import-outside-toplevel
+
+        return SyncEngine(self, jobs=jobs).apply(plan, callback=callback)
+
     def delete_gist(
         self, file_name: t.Optional[t.Union[Path, str]] = None, gist_id: t.Optional[str] = None
     ) -> int:
@@ -321,10 +1667,14 @@ class GISTyc:
             gist_id = self._get_gist_id(file_name=file_name, gist_id=gist_id)
 
         # Set the REST API url for deleting a GIST
-        _query_url = f"https://api.github.com/gists/{gist_id}"
+        _query_url = f"/gists/{gist_id}"
 
         # Delete the GIST and get the status code from the response
-        resp = requests.delete(_query_url, headers=self._headers)
+        resp = self._request("DELETE", _query_url)
         resp_status = resp.status_code
 
+        # Remove the GIST from the index and the catalog (also if it has already been deleted)
+        if resp.ok or resp_status == 404:
+            self._forget_gist(t.cast(str, gist_id))
+
         return resp_status
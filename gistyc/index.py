@@ -0,0 +1,390 @@
+"""Persistent on-disk index of the GIST listing."""
+
+# Import standard libraries
+from dataclasses import astuple, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import typing as t
+
+from gistyc import GITHUB_API_URL
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """State of a local file after its last synchronisation.
+
+    Attributes
+    ----------
+    path : str
+        Absolute path of the local file.
+    mtime_ns : int
+        Modification time of the file in nanoseconds.
+    size : int
+        Size of the file in bytes.
+    hash : str
+        SHA-256 hex digest of the file content.
+    gist_id : str
+        ID of the corresponding GIST.
+    revision : str, optional
+        GIST revision (history version) after the last update.
+
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    hash: str
+    gist_id: str
+    revision: t.Optional[str] = None
+
+
+def default_cache_dir() -> Path:
+    """Get the default cache directory of gistyc.
+
+    Returns
+    -------
+    pathlib.Path
+        $XDG_CACHE_HOME/gistyc or ~/.cache/gistyc.
+
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+
+    return Path(cache_home) / "gistyc"
+
+
+class GISTIndex:
+    """SQLite based index of the GIST listing.
+
+    The index stores every listing page together with its ETag. Subsequent listings revalidate
+    the pages with conditional requests (If-None-Match); an unchanged page is answered with 304
+    and does not count against the rate limit. Deleting or creating a GIST shifts the pages, so
+    the affected pages are re-downloaded automatically.
+
+    From the stored pages the index derives a filename -> GIST ID lookup table that contains the
+    description and the update datetime of each GIST as well.
+
+    """
+
+    def __init__(self, path: t.Union[Path, str]) -> None:
+        """Initiate (open or create) the index database.
+
+        Parameters
+        ----------
+        path : pathlib.Path or str
+            File path of the SQLite database.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Set the database path and create the parent directory
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The connection is shared between threads; all access is serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    page INTEGER PRIMARY KEY, etag TEXT, body TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS gists (
+                    gist_id TEXT PRIMARY KEY, description TEXT, updated_at TEXT,
+                    position INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS files (
+                    filename TEXT NOT NULL, gist_id TEXT NOT NULL,
+                    PRIMARY KEY (filename, gist_id)
+                );
+                CREATE INDEX IF NOT EXISTS files_gist_id ON files (gist_id);
+                CREATE TABLE IF NOT EXISTS manifest (
+                    path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL,
+                    hash TEXT NOT NULL, gist_id TEXT NOT NULL, revision TEXT
+                );
+                """)
+
+    @classmethod
+    def for_token(
+        cls,
+        auth_token: str,
+        cache_dir: t.Optional[t.Union[Path, str]] = None,
+        api_url: str = GITHUB_API_URL,
+    ) -> "GISTIndex":
+        """Open the index of the account that corresponds to an authentication token.
+
+        Parameters
+        ----------
+        auth_token : str
+            Authentication token of the GitHub GIST REST API. Only a hash of the token (and the
+            API URL) is used for the file name.
+        cache_dir : pathlib.Path or str, optional
+            Cache directory. The default is None, i.e., default_cache_dir().
+        api_url : str, optional
+            Base URL of the REST API. The same token may be valid for several servers (e.g.,
+            GitHub Enterprise), so each server has its own index. The default is GITHUB_API_URL.
+
+        Returns
+        -------
+        GISTIndex
+            Index of the account.
+
+        """
+        cache_dir = Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+        key = f"{api_url.rstrip('/')}\n{auth_token}"
+        token_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+        return cls(cache_dir / f"index_{token_hash}.sqlite")
+
+    def close(self) -> None:
+        """Close the database connection.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self._conn.close()
+
+    def page_etag(self, page: int) -> t.Optional[str]:
+        """Get the stored ETag of a listing page.
+
+        Parameters
+        ----------
+        page : int
+            Page number.
+
+        Returns
+        -------
+        str or None
+            ETag of the page. None, if the page is not stored.
+
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT etag FROM pages WHERE page = ?", (page,)).fetchone()
+
+        return row[0] if row else None
+
+    def page_count(self) -> int:
+        """Get the number of stored listing pages.
+
+        Returns
+        -------
+        int
+            Number of stored pages.
+
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(page) FROM pages").fetchone()
+
+        return row[0] or 0
+
+    def get_page(self, page: int) -> t.List[t.Dict]:
+        """Get a stored listing page.
+
+        Parameters
+        ----------
+        page : int
+            Page number.
+
+        Returns
+        -------
+        list
+            List of GISTs on the page. Empty, if the page is not stored.
+
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM pages WHERE page = ?", (page,)).fetchone()
+
+        return json.loads(row[0]) if row else []
+
+    def store_pages(
+        self, pages: t.Dict[int, t.Tuple[t.Optional[str], t.List[t.Dict]]], last_page: int
+    ) -> None:
+        """Store changed listing pages and rebuild the lookup tables.
+
+        Parameters
+        ----------
+        pages : dict
+            Changed pages. Page number -> (ETag, list of GISTs).
+        last_page : int
+            Number of the last page of the listing. Stored pages behind it are removed.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE page > ?", (last_page,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (page, etag, body) VALUES (?, ?, ?)",
+                [(page, etag, json.dumps(body)) for page, (etag, body) in pages.items()],
+            )
+
+            # Rebuild the lookup tables from all pages
+            self._conn.execute("DELETE FROM gists")
+            self._conn.execute("DELETE FROM files")
+            position = 0
+            for (body,) in self._conn.execute("SELECT body FROM pages ORDER BY page").fetchall():
+                for gist in json.loads(body):
+                    self._insert_gist(gist, position)
+                    position += 1
+
+    def _insert_gist(self, gist: t.Dict, position: int) -> None:
+        """Insert a GIST into the lookup tables (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        gist : dict
+            GIST as returned by the REST API.
+        position : int
+            Position of the GIST in the listing.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO gists (gist_id, description, updated_at, position) "
+            "VALUES (?, ?, ?, ?)",
+            (gist["id"], gist.get("description"), gist.get("updated_at"), position),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO files (filename, gist_id) VALUES (?, ?)",
+            [(filename, gist["id"]) for filename in gist.get("files", {})],
+        )
+
+    def upsert_gist(self, gist: t.Dict) -> None:
+        """Insert or update a created / updated GIST in the lookup tables.
+
+        Parameters
+        ----------
+        gist : dict
+            GIST as returned by the REST API.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE gist_id = ?", (gist["id"],))
+
+            # The most recently changed GIST is the first one of the listing
+            row = self._conn.execute("SELECT MIN(position) FROM gists").fetchone()
+            self._insert_gist(gist, (row[0] or 0) - 1)
+
+    def remove_gist(self, gist_id: str) -> None:
+        """Remove a deleted GIST from the lookup tables.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM gists WHERE gist_id = ?", (gist_id,))
+            self._conn.execute("DELETE FROM files WHERE gist_id = ?", (gist_id,))
+
+    def lookup(self, filename: str) -> t.List[t.Dict[str, t.Any]]:
+        """Get all GISTs that contain a file name.
+
+        Parameters
+        ----------
+        filename : str
+            GIST file name (without a path).
+
+        Returns
+        -------
+        list
+            List of dictionaries with the keys "id", "description" and "updated_at".
+
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT gists.gist_id, gists.description, gists.updated_at FROM files "
+                "JOIN gists ON gists.gist_id = files.gist_id WHERE files.filename = ? "
+                "ORDER BY gists.position",
+                (filename,),
+            ).fetchall()
+
+        return [{"id": row[0], "description": row[1], "updated_at": row[2]} for row in rows]
+
+    def get_manifest(self, paths: t.Iterable[str]) -> t.Dict[str, ManifestEntry]:
+        """Get the sync manifest entries of local files.
+
+        Parameters
+        ----------
+        paths : iterable
+            Absolute paths of the local files.
+
+        Returns
+        -------
+        dict
+            Path -> manifest entry. Files without an entry are omitted.
+
+        """
+        paths = list(paths)
+        entries = {}
+        with self._lock:
+            for offset in range(0, len(paths), 500):
+                chunk = paths[slice(offset, offset + 500)]
+                rows = self._conn.execute(
+                    "SELECT path, mtime_ns, size, hash, gist_id, revision FROM manifest "
+                    f"WHERE path IN ({', '.join('?' * len(chunk))})",  # nosec
+                    chunk,
+                ).fetchall()
+                entries.update({row[0]: ManifestEntry(*row) for row in rows})
+
+        return entries
+
+    def store_manifest(self, entries: t.Iterable[ManifestEntry]) -> None:
+        """Store (insert or replace) sync manifest entries.
+
+        Parameters
+        ----------
+        entries : iterable
+            Manifest entries.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO manifest (path, mtime_ns, size, hash, gist_id, revision) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [astuple(entry) for entry in entries],
+            )
+
+    def remove_manifest(self, paths: t.Iterable[str]) -> None:
+        """Remove the sync manifest entries of local files.
+
+        Parameters
+        ----------
+        paths : iterable
+            Absolute paths of the local files.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM manifest WHERE path = ?", [(path,) for path in paths]
+            )
@@ -0,0 +1,378 @@
+"""Instrumentation events of GISTyc and a built-in statistics collector."""
+
+# Import standard libraries
+from bisect import bisect_left
+from dataclasses import dataclass
+import re
+import threading
+import typing as t
+from urllib.parse import urlparse
+
+# Upper bounds (in seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(frozen=True)
+class GISTEvent:
+    """Instrumentation event that is passed to the hooks of GISTyc (see GISTyc.add_hook).
+
+    Attributes
+    ----------
+    kind : str
+        "request" (every sent request, including retries), "page" (listing page), "parse"
+        (reading and splitting a local file), "diff" (comparing a local file with its GIST),
+        "cache" (content cache look-up) or "unchanged" (an update that has been skipped, since
+        nothing changed).
+    name : str
+        Endpoint of a request (e.g., "GET /gists/{gist_id}"), page number, file name or cache
+        entry ("gist" or "content").
+    duration : float
+        Duration in seconds.
+    bytes_sent : int
+        Size of the request body in bytes.
+    bytes_received : int
+        Size of the response body in bytes.
+    status_code : int, optional
+        HTTP response code.
+    retry : bool
+        The request is a retry of a rate limited request.
+    hit : bool, optional
+        A cache look-up or a conditional request (page) has been answered without content.
+    url : str, optional
+        Full URL of a request (the name is the endpoint with placeholders).
+
+    """
+
+    kind: str
+    name: str
+    duration: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    status_code: t.Optional[int] = None
+    retry: bool = False
+    hit: t.Optional[bool] = None
+    url: t.Optional[str] = None
+
+
+# Type of an instrumentation hook
+Hook = t.Callable[[GISTEvent], None]
+
+# GIST REST API path after the path prefix of the API URL (e.g., "/api/v3" of GitHub Enterprise)
+_GISTS_PATH_PATTERN = re.compile(r"/gists(?:/.*)?$")
+
+# Path segments of the GIST REST API that are replaced by placeholders
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"^/gists/[^/]+/[0-9a-f]{40}$"), "/gists/{gist_id}/{revision}"),
+    (re.compile(r"^/gists/(?!starred$|public$)[^/]+$"), "/gists/{gist_id}"),
+)
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """Get the endpoint of a request with placeholders for the IDs (for aggregated statistics).
+
+    Parameters
+    ----------
+    method : str
+        HTTP method, e.g., "GET".
+    url : str
+        Request URL or REST API path. A path prefix of the API URL (e.g., "/api/v3" of GitHub
+        Enterprise) is removed.
+
+    Returns
+    -------
+    str
+        Endpoint, e.g., "GET /gists/{gist_id}". Requests to other hosts than the REST API (e.g.,
+        raw file downloads) are summarised as "GET raw".
+
+    """
+    parsed_url = urlparse(url)
+    path = parsed_url.path.rstrip("/") or "/"
+    gists_path = _GISTS_PATH_PATTERN.search(path)
+    if "githubusercontent" in parsed_url.netloc or (gists_path is None and "/raw/" in path):
+        return f"{method} raw"
+    if gists_path is not None:
+        path = gists_path.group(0)
+
+    for pattern, placeholder in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            path = placeholder
+            break
+
+    return f"{method} {path}"
+
+
+class StatsCollector:
+    """Hook that aggregates the instrumentation events (thread-safe).
+
+    Collected are a latency histogram per endpoint, the bytes sent and received, the number of
+    retries, the fetched and revalidated listing pages, the parse and diff times and the cache
+    hits and misses. Add the collector with GISTyc.add_hook (or the hooks argument of GISTyc) and
+    print stats.summary() or store stats.to_dict() at the end.
+
+    """
+
+    def __init__(self) -> None:
+        """Initiate an empty collector.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._lock = threading.Lock()
+        self.endpoints: t.Dict[str, t.Dict[str, t.Any]] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.pages = {"fetched": 0, "not_modified": 0}
+        self.timings = {"parse": 0.0, "diff": 0.0}
+        self.files = {"parse": 0, "diff": 0}
+        self.cache = {"hits": 0, "misses": 0}
+
+    def __call__(self, event: GISTEvent) -> None:
+        """Add an event.
+
+        Parameters
+        ----------
+        event : GISTEvent
+            Instrumentation event.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            if event.kind == "request":
+                self._add_request(event)
+            elif event.kind == "page":
+                self.pages["not_modified" if event.hit else "fetched"] += 1
+            elif event.kind in self.timings:
+                self.timings[event.kind] += event.duration
+                self.files[event.kind] += 1
+            elif event.kind == "cache":
+                self.cache["hits" if event.hit else "misses"] += 1
+
+    def _add_request(self, event: GISTEvent) -> None:
+        """Add a request event (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        event : GISTEvent
+            Request event.
+
+        Returns
+        -------
+        None.
+
+        """
+        endpoint = self.endpoints.setdefault(
+            event.name,
+            {
+                "requests": 0,
+                "latency": 0.0,
+                "max_latency": 0.0,
+                "histogram": [0] * (len(LATENCY_BUCKETS) + 1),
+                "status_codes": {},
+            },
+        )
+        endpoint["requests"] += 1
+        endpoint["latency"] += event.duration
+        endpoint["max_latency"] = max(endpoint["max_latency"], event.duration)
+        endpoint["histogram"][bisect_left(LATENCY_BUCKETS, event.duration)] += 1
+        status_code = str(event.status_code)
+        endpoint["status_codes"][status_code] = endpoint["status_codes"].get(status_code, 0) + 1
+
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.retries += int(event.retry)
+
+    @property
+    def requests(self) -> int:
+        """Get the number of sent requests.
+
+        Returns
+        -------
+        int
+            Number of requests of all endpoints (including retries).
+
+        """
+        with self._lock:
+            return sum(endpoint["requests"] for endpoint in self.endpoints.values())
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Convert the statistics to a JSON serialisable dictionary.
+
+        Returns
+        -------
+        dict
+            Statistics. The histogram buckets are labelled by their upper bound in milliseconds.
+
+        """
+        bucket_labels = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + [
+            f">{LATENCY_BUCKETS[-1] * 1000:g}ms"
+        ]
+        with self._lock:
+            endpoints = {
+                name: {
+                    **{key: value for key, value in endpoint.items() if key != "histogram"},
+                    "status_codes": dict(endpoint["status_codes"]),
+                    "histogram": dict(zip(bucket_labels, endpoint["histogram"])),
+                }
+                for name, endpoint in sorted(self.endpoints.items())
+            }
+
+            return {
+                "requests": sum(endpoint["requests"] for endpoint in endpoints.values()),
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "retries": self.retries,
+                "pages": dict(self.pages),
+                "timings": dict(self.timings),
+                "files": dict(self.files),
+                "cache": dict(self.cache),
+                "endpoints": endpoints,
+            }
+
+    def summary(self) -> str:
+        """Get a human readable summary of the statistics.
+
+        Returns
+        -------
+        str
+            Multi-line summary with one line per endpoint.
+
+        """
+        stats = self.to_dict()
+        lines = [
+            f"{stats['requests']} requests, {stats['retries']} retries, "
+            f"{stats['bytes_sent']} bytes sent, {stats['bytes_received']} bytes received",
+            f"listing pages: {stats['pages']['fetched']} fetched, "
+            f"{stats['pages']['not_modified']} not modified",
+            f"parse: {stats['files']['parse']} files in {stats['timings']['parse']:.3f} s, "
+            f"diff: {stats['files']['diff']} files in {stats['timings']['diff']:.3f} s",
+            f"cache: {stats['cache']['hits']} hits, {stats['cache']['misses']} misses",
+            f"{'ENDPOINT':<36} {'REQUESTS':>8} {'MEAN [ms]':>10} {'MAX [ms]':>10}",
+        ]
+        for name, endpoint in stats["endpoints"].items():
+            mean_latency = endpoint["latency"] / endpoint["requests"] * 1000
+            lines.append(
+                f"{name:<36} {endpoint['requests']:>8} {mean_latency:>10.1f} "
+                f"{endpoint['max_latency'] * 1000:>10.1f}"
+            )
+
+        return "\n".join(lines)
+
+
+class CallLog:
+    """Hook that records every sent request (thread-safe), e.g., to assert request budgets.
+
+    Each entry is the request event of a call (including retries and raw downloads) with its
+    endpoint, URL, bytes sent and received, status code and duration. Add the log with
+    GISTyc.add_hook and inspect log.calls, log.count() or log.format() afterwards; see also
+    gistyc.testing.assert_max_calls.
+
+    """
+
+    def __init__(self) -> None:
+        """Initiate an empty log.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._lock = threading.Lock()
+        self.calls: t.List[GISTEvent] = []
+
+    def __call__(self, event: GISTEvent) -> None:
+        """Add an event (only request events are recorded).
+
+        Parameters
+        ----------
+        event : GISTEvent
+            Instrumentation event.
+
+        Returns
+        -------
+        None.
+
+        """
+        if event.kind == "request":
+            with self._lock:
+                self.calls.append(event)
+
+    def __len__(self) -> int:
+        """Get the number of recorded calls.
+
+        Returns
+        -------
+        int
+            Number of calls.
+
+        """
+        with self._lock:
+            return len(self.calls)
+
+    def clear(self) -> None:
+        """Remove all recorded calls.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self.calls.clear()
+
+    def count(self, endpoint: t.Optional[str] = None) -> int:
+        """Count the recorded calls of an endpoint or an HTTP method.
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Endpoint (e.g., "GET /gists", see endpoint_name) or HTTP method (e.g., "PATCH"). The
+            default is None, i.e., all calls.
+
+        Returns
+        -------
+        int
+            Number of matching calls.
+
+        """
+        with self._lock:
+            return sum(
+                endpoint in (None, call.name, call.name.split(" ", 1)[0]) for call in self.calls
+            )
+
+    def endpoints(self) -> t.Dict[str, int]:
+        """Count the recorded calls per endpoint.
+
+        Returns
+        -------
+        dict
+            Endpoint -> number of calls (sorted by the endpoint).
+
+        """
+        with self._lock:
+            names = [call.name for call in self.calls]
+
+        return {name: names.count(name) for name in sorted(set(names))}
+
+    def format(self) -> str:
+        """Format the recorded calls as a trace with one line per call.
+
+        Returns
+        -------
+        str
+            Trace lines "METHOD URL STATUS SENT/RECEIVED bytes DURATION ms" in call order.
+
+        """
+        with self._lock:
+            calls = list(self.calls)
+
+        return "\n".join(
+            f"{call.name.split(' ', 1)[0]} {call.url or call.name} {call.status_code} "
+            f"{call.bytes_sent}/{call.bytes_received} bytes {call.duration * 1000:.1f} ms"
+            for call in calls
+        )
@@ -0,0 +1,310 @@
+"""Incremental mirror of all GISTs to a local directory."""
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+import threading
+import typing as t
+
+# Import GISTyc
+from gistyc.blocks import SPLITTERS, get_splitter
+from gistyc.cache import gist_revision
+from gistyc.gistyc import GISTyc
+
+# Pattern of a code block file name, e.g., "sample_1.py" (stem, index, suffix)
+BLOCK_NAME_PATTERN = re.compile(r"(.+)_(\d+)(\.[^.]*)?")
+
+
+@dataclass
+class MirrorResult:
+    """Result of mirroring a single GIST.
+
+    Attributes
+    ----------
+    gist_id : str
+        GIST ID.
+    action : str
+        "CREATE", "UPDATE", "UNCHANGED", "DELETE" or "ERROR".
+    files : list
+        Paths of the written local files.
+    error : str, optional
+        Error message (action "ERROR" only).
+
+    """
+
+    gist_id: str
+    action: str
+    files: t.List[Path] = field(default_factory=list)
+    error: t.Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Check whether the GIST has been mirrored successfully.
+
+        Returns
+        -------
+        bool
+            True, if no error occurred.
+
+        """
+        return self.action != "ERROR"
+
+
+def group_gist_files(file_names: t.Iterable[str]) -> t.Dict[str, t.List[str]]:
+    """Group the files of a GIST into local files (the reverse of the code block split).
+
+    A file "name_N.suffix" is a code block of "name.suffix" if the GIST contains this file as
+    well and a splitter is registered for the suffix (see gistyc.blocks.SPLITTERS). All other
+    files (e.g., "notes_1.txt" next to "notes.txt") are local files on their own.
+
+    Parameters
+    ----------
+    file_names : iterable
+        GIST file names.
+
+    Returns
+    -------
+    dict
+        Local file name -> GIST file names of its code blocks (ordered by the block index).
+
+    """
+    file_names = set(file_names)
+    indexed_blocks: t.Dict[str, t.List[t.Tuple[int, str]]] = {}
+    for file_name in file_names:
+        core_file_name, index = file_name, 0
+        match = BLOCK_NAME_PATTERN.fullmatch(file_name)
+        if match and (match.group(3) or "").lower() in SPLITTERS:
+            core_candidate = f"{match.group(1)}{match.group(3)}"
+            if core_candidate in file_names:
+                core_file_name, index = core_candidate, int(match.group(2))
+        indexed_blocks.setdefault(core_file_name, []).append((index, file_name))
+
+    return {
+        core_file_name: [file_name for _, file_name in sorted(blocks)]
+        for core_file_name, blocks in sorted(indexed_blocks.items())
+    }
+
+
+class GISTMirror:
+    """Mirror all GISTs of an account to a local directory tree.
+
+    Each GIST is written to <directory>/<GIST ID>/; code block files are reassembled into a
+    single file with separator lines (e.g., "sample.py", "sample_1.py" -> "sample.py"). The
+    update datetime of each mirrored GIST is stored in a state file, so subsequent runs fetch
+    only new and changed GISTs (one REST API call each, besides the listing) and remove the
+    directories of deleted GISTs. The GISTs are fetched concurrently.
+
+    """
+
+    # Name of the state file within the mirror directory
+    STATE_FILE_NAME = ".gistyc_mirror.json"
+
+    def __init__(self, gist_api: GISTyc, directory: t.Union[Path, str], jobs: int = 8) -> None:
+        """Initiate the mirror.
+
+        Parameters
+        ----------
+        gist_api : GISTyc
+            GISTyc instance that is used by all workers.
+        directory : pathlib.Path or str
+            Mirror directory.
+        jobs : int, optional
+            Number of concurrently fetched GISTs. The default is 8.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.gist_api = gist_api
+        self.directory = Path(directory)
+        self.jobs = max(jobs, 1)
+
+    @property
+    def state_path(self) -> Path:
+        """Get the path of the state file.
+
+        Returns
+        -------
+        pathlib.Path
+            Path of the state file (GIST ID -> update datetime).
+
+        """
+        return self.directory / self.STATE_FILE_NAME
+
+    def load_state(self) -> t.Dict[str, str]:
+        """Load the update datetimes of the mirrored GISTs.
+
+        Returns
+        -------
+        dict
+            GIST ID -> update datetime. Empty, if nothing has been mirrored yet.
+
+        """
+        try:
+            return t.cast(t.Dict[str, str], json.loads(self.state_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return {}
+
+    def _store_state(self, state: t.Dict[str, str]) -> None:
+        """Store the update datetimes of the mirrored GISTs (atomically).
+
+        Parameters
+        ----------
+        state : dict
+            GIST ID -> update datetime.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._write_text(self.state_path, json.dumps(state, indent=0, sort_keys=True))
+
+    @staticmethod
+    def _write_text(path: Path, content: str) -> None:
+        """Write a text file atomically and unchanged (no newline conversion).
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            File path.
+        content : str
+            File content.
+
+        Returns
+        -------
+        None.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, path)
+
+    def mirror_gist(self, gist_id: str) -> MirrorResult:
+        """Fetch a GIST and write its (reassembled) files to <directory>/<GIST ID>/.
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+
+        Returns
+        -------
+        MirrorResult
+            Result with the action "CREATE" or "UPDATE" and the written files.
+
+        """
+        gist_dir = self.directory / gist_id
+        action = "UPDATE" if gist_dir.is_dir() else "CREATE"
+        gist_dir.mkdir(parents=True, exist_ok=True)
+
+        # Get the GIST with its file contents
+        gist = self.gist_api.get_gist(gist_id)
+        revision = gist_revision(gist)
+        gist_files = gist.get("files", {})
+
+        # Write each local file. A single truncated file is streamed to disk; code blocks are
+        # joined with the separator line of the file's language (see group_gist_files)
+        written_files = []
+        for core_file_name, block_names in group_gist_files(gist_files).items():
+            target = gist_dir / core_file_name
+            if len(block_names) == 1 and self.gist_api.is_truncated(gist_files[core_file_name]):
+                self.gist_api.download_file(gist_id, core_file_name, target, revision)
+            else:
+                contents = (
+                    self.gist_api.get_file_content(gist_id, block_name, revision) or ""
+                    for block_name in block_names
+                )
+                self._write_text(target, get_splitter(core_file_name).join_blocks(contents))
+            written_files.append(target)
+
+        # Remove local files that vanished from the GIST
+        for path in gist_dir.iterdir():
+            if path not in written_files and path.is_file():
+                path.unlink()
+
+        return MirrorResult(gist_id, action, written_files)
+
+    def run(
+        self,
+        full: bool = False,
+        callback: t.Optional[t.Callable[[MirrorResult], None]] = None,
+    ) -> t.List[MirrorResult]:
+        """Mirror all GISTs. Unchanged GISTs are skipped, deleted GISTs are removed locally.
+
+        The state file is updated even if the run is interrupted, so the next run resumes with
+        the GISTs that have not been mirrored yet.
+
+        Parameters
+        ----------
+        full : bool, optional
+            Fetch all GISTs, regardless of the state file (deleted GISTs are removed as well).
+            The default is False.
+        callback : callable, optional
+            Function that is called with each result as soon as a GIST is done (in the calling
+            thread). The default is None.
+
+        Returns
+        -------
+        results : list
+            Results of all GISTs (in the order of the listing) and of the deleted GISTs.
+
+        """
+        # Get the listing (concurrently fetched or revalidated pages) and the mirror state. A
+        # full run ignores the state for the change detection, but still prunes deleted GISTs
+        gists = self.gist_api.get_gists()
+        state = self.load_state()
+        results: t.Dict[str, MirrorResult] = {}
+
+        def _set_result(result: MirrorResult) -> None:
+            results[result.gist_id] = result
+            if callback is not None:
+                callback(result)
+
+        # Skip GISTs with an unchanged update datetime
+        changed_gists = []
+        for gist in gists:
+            unchanged = not full and state.get(gist["id"]) == gist["updated_at"]
+            if unchanged and (self.directory / gist["id"]).is_dir():
+                _set_result(MirrorResult(gist["id"], "UNCHANGED"))
+            else:
+                changed_gists.append(gist)
+
+        # Remove the directories of deleted GISTs
+        listed_ids = {gist["id"] for gist in gists}
+        for gist_id in [gist_id for gist_id in state if gist_id not in listed_ids]:
+            shutil.rmtree(self.directory / gist_id, ignore_errors=True)
+            del state[gist_id]
+            _set_result(MirrorResult(gist_id, "DELETE"))
+
+        # Fetch and write the changed GISTs concurrently
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = {
+                    executor.submit(self.mirror_gist, gist["id"]): gist for gist in changed_gists
+                }
+                for future in as_completed(futures):
+                    gist = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as error:  # pylint: disable=broad-except
+                        result = MirrorResult(gist["id"], "ERROR", error=str(error))
+                    else:
+                        state[gist["id"]] = gist["updated_at"]
+                    _set_result(result)
+        finally:
+            self._store_state(state)
+
+        ordered_ids = [gist["id"] for gist in gists] + [
+            gist_id for gist_id in results if gist_id not in listed_ids
+        ]
+
+        return [results[gist_id] for gist_id in ordered_ids if gist_id in results]
@@ -0,0 +1,247 @@
+"""Rate-limit aware scheduling of GitHub REST API calls."""
+
+# Import standard libraries
+from dataclasses import dataclass, replace
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+import typing as t
+
+# HTTP methods of content-creating requests (subject to GitHub's secondary rate limits)
+MUTATING_METHODS = frozenset(("POST", "PATCH", "PUT", "DELETE"))
+
+# HTTP methods that may be retried after a server error (same as the urllib3 retry policy of
+# GISTyc; e.g., a retried POST could create a GIST twice) and the retried server errors
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+SERVER_ERRORS = frozenset((500, 502, 503, 504))
+
+
+@dataclass(frozen=True)
+class RateLimitBudget:
+    """Rate limit budget as reported by the last REST API response.
+
+    Attributes
+    ----------
+    limit : int, optional
+        Maximum number of requests per hour (X-RateLimit-Limit).
+    remaining : int, optional
+        Number of remaining requests (X-RateLimit-Remaining).
+    reset : float, optional
+        UTC epoch seconds of the next budget reset (X-RateLimit-Reset).
+    retries : int
+        Number of retried requests so far.
+
+    """
+
+    limit: t.Optional[int] = None
+    remaining: t.Optional[int] = None
+    reset: t.Optional[float] = None
+    retries: int = 0
+
+
+def _parse_retry_after(value: t.Optional[str]) -> t.Optional[float]:
+    """Parse a Retry-After header: delay in seconds or an HTTP date.
+
+    Parameters
+    ----------
+    value : str, optional
+        Header value, e.g., "120" or "Wed, 21 Oct 2015 07:28:00 GMT".
+
+    Returns
+    -------
+    float or None
+        Delay in seconds (0.0 for a past date). None, if the header is missing or invalid.
+
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    # Dates without a time zone are UTC (HTTP dates are always GMT)
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+
+    return max(retry_date.timestamp() - time.time(), 0.0)
+
+
+class RateLimiter:
+    """Central scheduler of REST API calls.
+
+    The scheduler tracks the rate limit budget, spaces content-creating requests by a minimum
+    interval and decides whether (and when) a rate limited request (403 / 429) or, if the method
+    is provided, an idempotent request with a server error (5xx) is retried. It does not sleep
+    itself, but returns delays, so it can be shared by threads and coroutines.
+
+    """
+
+    def __init__(
+        self,
+        mutation_interval: float = 1.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        """Initiate the scheduler.
+
+        Parameters
+        ----------
+        mutation_interval : float, optional
+            Minimum interval in seconds between two content-creating requests. The default is 1.0.
+        max_retries : int, optional
+            Maximum number of retries of a rate limited request. The default is 5.
+        backoff_base : float, optional
+            Base delay in seconds of the exponential backoff. The default is 1.0.
+        backoff_max : float, optional
+            Maximum delay in seconds of a single retry. The default is 60.0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.mutation_interval = mutation_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._budget = RateLimitBudget()
+        self._next_mutation = 0.0
+
+    @property
+    def budget(self) -> RateLimitBudget:
+        """Return the current rate limit budget.
+
+        Returns
+        -------
+        RateLimitBudget
+            Snapshot of the budget.
+
+        """
+        with self._lock:
+            return self._budget
+
+    def reserve(self, method: str) -> float:
+        """Reserve a time slot for a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+
+        Returns
+        -------
+        delay : float
+            Delay in seconds before the request may be sent.
+
+        """
+        with self._lock:
+            now = time.time()
+            delay = 0.0
+
+            # Wait for the reset if the budget is exhausted
+            budget = self._budget
+            if budget.remaining == 0 and budget.reset is not None:
+                delay = max(budget.reset - now, 0.0)
+
+            # Space content-creating requests
+            if method.upper() in MUTATING_METHODS:
+                slot = max(now + delay, self._next_mutation)
+                self._next_mutation = slot + self.mutation_interval
+                delay = slot - now
+
+            return delay
+
+    def update(
+        self,
+        status: int,
+        headers: t.Mapping[str, str],
+        attempt: int,
+        message: str = "",
+        method: t.Optional[str] = None,
+    ) -> t.Optional[float]:
+        """Update the budget from a response and decide whether the request is retried.
+
+        Parameters
+        ----------
+        status : int
+            HTTP response code.
+        headers : Mapping
+            Response headers.
+        attempt : int
+            Number of previous attempts of the request.
+        message : str, optional
+            Response body (only needed for 403 responses). The default is "".
+        method : str, optional
+            HTTP method of the request. Server errors of idempotent requests are only retried if
+            it is provided. The default is None, i.e., server errors are left to the transport
+            (see the urllib3 retry policy of GISTyc).
+
+        Returns
+        -------
+        float or None
+            Delay in seconds before the request is retried. None, if the request shall not be
+            retried.
+
+        """
+        with self._lock:
+
+            # Update the budget from the rate limit headers (if present)
+            if "X-RateLimit-Remaining" in headers:
+                self._budget = replace(
+                    self._budget,
+                    limit=int(headers.get("X-RateLimit-Limit", 0)) or self._budget.limit,
+                    remaining=int(headers["X-RateLimit-Remaining"]),
+                    reset=float(headers.get("X-RateLimit-Reset", 0)) or self._budget.reset,
+                )
+
+            # Only rate limited requests are retried: 429 and 403 with an exhausted budget or a
+            # secondary rate limit. Server errors are retried for idempotent methods
+            secondary_limit = "Retry-After" in headers or "rate limit" in message.lower()
+            exhausted = self._budget.remaining == 0
+            rate_limited = status == 429 or (status == 403 and (exhausted or secondary_limit))
+            idempotent = method is not None and method.upper() in IDEMPOTENT_METHODS
+            server_error = idempotent and status in SERVER_ERRORS
+            if not (rate_limited or server_error) or attempt >= self.max_retries:
+                return None
+
+            self._budget = replace(self._budget, retries=self._budget.retries + 1)
+
+            # Use the server's delay, if provided ...
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+            if self._budget.remaining == 0 and self._budget.reset is not None:
+                return max(self._budget.reset - time.time(), 0.0) + 1.0
+
+        # ... otherwise an exponential backoff with jitter
+        return self.backoff(attempt)
+
+    def backoff(self, attempt: int) -> float:
+        """Compute the delay of a retry (exponential backoff with jitter).
+
+        Parameters
+        ----------
+        attempt : int
+            Number of previous attempts.
+
+        Returns
+        -------
+        float
+            Delay in seconds.
+
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+
+        return random.uniform(delay / 2, delay)  # nosec
@@ -0,0 +1,1205 @@
+"""Parallel synchronisation of local files with GISTs."""
+
+# Import standard libraries
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+import json
+import hashlib
+import os
+from pathlib import Path
+import re
+import subprocess  # nosec
+import threading
+import typing as t
+
+# Import GISTyc
+from gistyc.blocks import SPLITTERS, gist_body, gist_file_name
+from gistyc.gistyc import GISTAmbiguityError, GISTCatalog, GISTNotFoundError, GISTyc
+from gistyc.index import ManifestEntry
+
+
+@dataclass
+class SyncResult:
+    """Result of synchronising a single file.
+
+    Attributes
+    ----------
+    file_name : pathlib.Path
+        Path of the local file.
+    action : str
+        "CREATE", "UPDATE", "UNCHANGED", "RENAME", "DELETE" or "ERROR".
+    gist_id : str, optional
+        ID of the created / updated GIST.
+    error : str, optional
+        Error message (action "ERROR" only).
+    revision : str, optional
+        GIST revision (history version) after a create / update.
+    status_code : int, optional
+        HTTP response code of the last REST API call. None, if no call was needed.
+    requests : int
+        Number of REST API calls.
+    bytes_sent : int
+        Size of all request bodies in bytes.
+    latency : float
+        Accumulated response time of all REST API calls in seconds.
+
+    """
+
+    file_name: Path
+    action: str
+    gist_id: t.Optional[str] = None
+    error: t.Optional[str] = None
+    revision: t.Optional[str] = None
+    status_code: t.Optional[int] = None
+    requests: int = 0
+    bytes_sent: int = 0
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Check whether the file has been synchronised successfully.
+
+        Returns
+        -------
+        bool
+            True, if no error occurred.
+
+        """
+        return self.action != "ERROR"
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """Change of a local file between two git revisions.
+
+    Attributes
+    ----------
+    status : str
+        "A" (added), "M" (modified), "D" (deleted) or "R" (renamed).
+    path : pathlib.Path
+        Path of the file (the new path of a renamed file).
+    old_path : pathlib.Path, optional
+        Previous path of a renamed file.
+
+    """
+
+    status: str
+    path: Path
+    old_path: t.Optional[Path] = None
+
+
+@dataclass(frozen=True)
+class PlanItem:
+    """Single action of a sync plan (see SyncEngine.apply).
+
+    Attributes
+    ----------
+    action : str
+        "CREATE", "UPDATE" (creates the GIST if the file has none), "DIFF" (the file has a GIST,
+        but no sync manifest entry, so it is unknown whether it changed; it is compared with its
+        GIST and only updated if it changed), "DELETE", "RENAME" or "UNCHANGED" (no REST API
+        call).
+    file_name : pathlib.Path
+        Path of the local file (the new path of a renamed file).
+    gist_id : str, optional
+        GIST ID. The default is None, i.e., the ID is looked up by the (previous) file name.
+    old_file_name : pathlib.Path, optional
+        Previous path of a renamed file.
+    files : dict, optional
+        Changed files of an update (see GISTyc.diff_gist). The default is None, i.e., the files
+        are compared with the GIST.
+    requests : int
+        Estimated number of REST API calls (see SyncEngine.plan).
+    payload_bytes : int
+        Estimated size of the request bodies in bytes (see SyncEngine.plan).
+
+    """
+
+    action: str
+    file_name: Path
+    gist_id: t.Optional[str] = None
+    old_file_name: t.Optional[Path] = None
+    files: t.Optional[t.Dict[str, t.Any]] = None
+    requests: int = 0
+    payload_bytes: int = 0
+
+
+@dataclass
+class SyncPlan:
+    """Sync plan that has been computed without any content-creating request.
+
+    Attributes
+    ----------
+    items : list
+        Plan items (see PlanItem); can be executed with SyncEngine.apply.
+    conflicts : dict
+        Files with more than one GIST (file path -> GIST IDs) and files that share their GIST file
+        name with other files of the plan (file path -> paths of the other files). These files
+        are not planned.
+
+    """
+
+    items: t.List[PlanItem] = field(default_factory=list)
+    conflicts: t.Dict[Path, t.List[str]] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        """Return the estimated number of REST API calls.
+
+        Returns
+        -------
+        int
+            Sum of the estimated calls of all items.
+
+        """
+        return sum(item.requests for item in self.items)
+
+    @property
+    def payload_bytes(self) -> int:
+        """Return the estimated size of all request bodies.
+
+        Returns
+        -------
+        int
+            Sum of the estimated request body sizes of all items in bytes.
+
+        """
+        return sum(item.payload_bytes for item in self.items)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Convert the plan to a JSON-serializable dictionary.
+
+        Returns
+        -------
+        dict
+            Items, conflicts and the estimated totals.
+
+        """
+        return {
+            "items": [
+                {
+                    "action": item.action,
+                    "file_name": str(item.file_name),
+                    "old_file_name": str(item.old_file_name) if item.old_file_name else None,
+                    "gist_id": item.gist_id,
+                    "requests": item.requests,
+                    "payload_bytes": item.payload_bytes,
+                }
+                for item in self.items
+            ],
+            "conflicts": {str(path): gist_ids for path, gist_ids in self.conflicts.items()},
+            "requests": self.requests,
+            "payload_bytes": self.payload_bytes,
+        }
+
+
+# C escapes of quoted paths in git outputs (besides octal escapes of bytes, e.g., "\303\244")
+_C_ESCAPES = dict(zip(b'abtnvfr"\\', b'\a\b\t\n\v\f\r"\\'))
+
+
+def _unquote_path(path: str) -> str:
+    r"""Unquote a path of a git output that has been quoted (e.g., non-ASCII characters or tabs).
+
+    Parameters
+    ----------
+    path : str
+        Path, possibly C-quoted, e.g., '"caf\303\251.py"'.
+
+    Returns
+    -------
+    str
+        Unquoted path, e.g., "café.py".
+
+    """
+    if len(path) < 2 or path[0] != '"' or path[-1] != '"':
+        return path
+
+    def _unescape(match: t.Match[bytes]) -> bytes:
+        escape = match.group(1)
+        if escape[:1].isdigit():
+            return bytes([int(escape, 8)])
+        return bytes([_C_ESCAPES.get(escape[0], escape[0])])
+
+    raw_path = re.sub(rb"\\([0-7]{3}|.)", _unescape, path[1:-1].encode("utf-8"))
+
+    return raw_path.decode("utf-8", "surrogateescape")
+
+
+def _name_status_records(text: str) -> t.Iterator[t.List[str]]:
+    """Split a "git diff --name-status" output into records (status and paths).
+
+    Parameters
+    ----------
+    text : str
+        Output with NUL separated fields (-z) or tab separated lines with C-quoted paths.
+
+    Returns
+    -------
+    Iterator
+        Fields of each change: status, path and, for renames and copies, the new path.
+
+    """
+    if "\0" not in text:
+        for line in text.splitlines():
+            fields = line.strip().split("\t")
+            yield fields[:1] + [_unquote_path(field) for field in fields[1:]]
+        return
+
+    # With -z, the paths are neither quoted nor tab separated; renames and copies have two paths
+    fields = text.split("\0")
+    position = 0
+    while position < len(fields):
+        status = fields[position].strip()
+        start = position + 1
+        end = start + (2 if status[:1].upper() in ("R", "C") else 1)
+        yield [status] + fields[start:end]
+        position = end
+
+
+def parse_name_status(text: str, root: t.Union[Path, str] = ".") -> t.List[FileChange]:
+    """Parse the output of "git diff --name-status" (preferably with -z).
+
+    Parameters
+    ----------
+    text : str
+        Output of "git diff --name-status -z" (NUL separated fields) or "git diff --name-status"
+        (tab separated, one change per line; quoted paths are unquoted).
+    root : pathlib.Path or str, optional
+        Directory the paths are relative to (the top level of the git repository). The default
+        is ".".
+
+    Returns
+    -------
+    changes : list
+        File changes. Copies are treated as added files; type changes as modified files.
+
+    """
+    changes = []
+    for fields in _name_status_records(text):
+        if len(fields) < 2:
+            continue
+
+        # Renames and copies have a similarity score, e.g., "R100", and two paths
+        status = fields[0][:1].upper()
+        if status == "R" and len(fields) == 3:
+            changes.append(FileChange("R", Path(root, fields[2]), Path(root, fields[1])))
+        elif status == "C" and len(fields) == 3:
+            changes.append(FileChange("A", Path(root, fields[2])))
+        elif status in ("A", "M", "T"):
+            changes.append(FileChange("M" if status == "T" else status, Path(root, fields[1])))
+        elif status == "D":
+            changes.append(FileChange("D", Path(root, fields[1])))
+
+    return changes
+
+
+def git_name_status(directory: t.Union[Path, str], rev_range: str) -> t.List[FileChange]:
+    """Get the changed files of a directory between two git revisions.
+
+    Parameters
+    ----------
+    directory : pathlib.Path or str
+        Directory within a git repository.
+    rev_range : str
+        Git revision range, e.g., "HEAD~1..HEAD" or "${{ github.event.before }}..HEAD".
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        Exception raised if git fails (e.g., unknown revisions).
+
+    Returns
+    -------
+    list
+        File changes (paths within the directory only), see parse_name_status.
+
+    """
+    # Get the top level of the repository; git reports all paths relative to it
+    top_level = subprocess.run(  # nosec
+        ["git", "-C", str(directory), "rev-parse", "--show-toplevel"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    # Get the changes with rename detection (NUL separated, so paths are not quoted)
+    name_status = subprocess.run(  # nosec
+        ["git", "-C", str(directory), "diff", "--name-status", "-z", "-M", rev_range, "--", "."],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return parse_name_status(name_status, top_level)
+
+
+class SyncEngine:
+    """Create / update GISTs of many files concurrently.
+
+    Reading, parsing, comparing and uploading the files is done by a bounded thread pool. The
+    content-creating requests (create and update) are spaced by the rate limit scheduler of the
+    GISTyc instance (see RateLimiter) to avoid GitHub's secondary rate limits.
+
+    If the GISTyc instance has an index, the state of each file (modification time, size, content
+    hash, GIST ID and revision) is stored in a sync manifest after the synchronisation. The next
+    run compares the file stats first and hashes only files with a changed stat. Files with an
+    unchanged content are skipped without any REST API call.
+
+    """
+
+    def __init__(self, gist_api: GISTyc, jobs: int = 4, use_manifest: bool = True) -> None:
+        """Initiate the sync engine.
+
+        Parameters
+        ----------
+        gist_api : GISTyc
+            GISTyc instance that is used by all workers.
+        jobs : int, optional
+            Number of concurrently processed files. The default is 4.
+        use_manifest : bool, optional
+            Use the sync manifest of the GISTyc index (if present). The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.gist_api = gist_api
+        self.jobs = max(jobs, 1)
+        self.manifest = gist_api.index if use_manifest else None
+
+        # Guard the shared catalog and serialise the look-up and creation of equal file names
+        self._catalog_lock = threading.Lock()
+        self._name_locks: t.Dict[str, threading.Lock] = {}
+
+    def _name_lock(self, file_name: Path) -> t.ContextManager[t.Any]:
+        """Get the lock of a GIST file name (look-up and creation of its GIST).
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+
+        Returns
+        -------
+        threading.Lock
+            Lock that is shared by all files with the same GIST file name.
+
+        """
+        with self._catalog_lock:
+            return self._name_locks.setdefault(gist_file_name(file_name), threading.Lock())
+
+    @staticmethod
+    def _name_conflicts(
+        file_names: t.Sequence[Path], known_ids: t.Mapping[Path, str]
+    ) -> t.Dict[Path, t.List[Path]]:
+        """Find the files that share their GIST file name with other files.
+
+        Such files (e.g., a/utils.py and b/utils.py) would be merged into a single GIST. Files
+        with a GIST ID in the sync manifest keep their GIST; the other files are conflicts.
+
+        Parameters
+        ----------
+        file_names : sequence
+            Paths of the local files.
+        known_ids : mapping
+            GIST IDs of the files with a manifest entry.
+
+        Returns
+        -------
+        dict
+            Conflicting file -> other files with the same GIST file name.
+
+        """
+        paths_by_name: t.Dict[str, t.List[Path]] = {}
+        for file_name in dict.fromkeys(file_names):
+            paths_by_name.setdefault(gist_file_name(file_name), []).append(file_name)
+
+        return {
+            file_name: [other for other in paths if other != file_name]
+            for paths in paths_by_name.values()
+            if len(paths) > 1
+            for file_name in paths
+            if file_name not in known_ids
+        }
+
+    @staticmethod
+    def _file_hash(file_name: Path) -> str:
+        """Compute the hash of a file content (read in chunks).
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+
+        Returns
+        -------
+        str
+            SHA-256 hex digest of the file content.
+
+        """
+        file_hash = hashlib.sha256()
+        with open(file_name, "rb") as file_obj:
+            for chunk in iter(lambda: file_obj.read(1 << 20), b""):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def _scan_file(
+        self, file_name: Path, entry: t.Optional[ManifestEntry]
+    ) -> t.Tuple[ManifestEntry, bool]:
+        """Compare a local file with its manifest entry.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+        entry : ManifestEntry, optional
+            Manifest entry of the last synchronisation.
+
+        Returns
+        -------
+        new_entry : ManifestEntry
+            Manifest entry with the current stat and hash (the hash is only computed if the stat
+            changed).
+        unchanged : bool
+            True, if the file content is unchanged since the last synchronisation.
+
+        """
+        stat = os.stat(file_name)
+        if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            return entry, True
+
+        file_hash = self._file_hash(file_name)
+        new_entry = ManifestEntry(
+            path=str(file_name.resolve()),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            hash=file_hash,
+            gist_id=entry.gist_id if entry else "",
+            revision=entry.revision if entry else None,
+        )
+
+        return new_entry, entry is not None and entry.hash == file_hash
+
+    def _measured(self, func: t.Callable[..., SyncResult], *args: t.Any) -> SyncResult:
+        """Call a sync function and add the statistics of its REST API calls to the result.
+
+        Parameters
+        ----------
+        func : callable
+            Function that returns a SyncResult.
+        *args : t.Any
+            Arguments of the function.
+
+        Returns
+        -------
+        SyncResult
+            Result with the request statistics.
+
+        """
+        with self.gist_api.measure() as stats:
+            result = func(*args)
+
+        return replace(
+            result,
+            status_code=stats.status_code,
+            requests=stats.requests,
+            bytes_sent=stats.bytes_sent,
+            latency=stats.latency,
+        )
+
+    def sync_file(
+        self,
+        file_name: Path,
+        gist_catalog: t.Optional[GISTCatalog],
+        gist_id: t.Optional[str] = None,
+    ) -> SyncResult:
+        """Create or update the GIST of a single file.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. Only needed if no GIST ID is provided.
+        gist_id : str, optional
+            Known GIST ID of the file. The default is None, i.e., the catalog is used.
+
+        Returns
+        -------
+        SyncResult
+            Result of the synchronisation (with request statistics). Exceptions are reported as
+            "ERROR".
+
+        """
+        return self._measured(self._sync_file, file_name, gist_catalog, gist_id)
+
+    def _sync_file(
+        self,
+        file_name: Path,
+        gist_catalog: t.Optional[GISTCatalog],
+        gist_id: t.Optional[str] = None,
+    ) -> SyncResult:
+        """Create or update the GIST of a single file (see sync_file).
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. Only needed if no GIST ID is provided.
+        gist_id : str, optional
+            Known GIST ID of the file. The default is None, i.e., the catalog is used. If the GIST
+            does not exist anymore, its manifest entry is removed and the catalog is used.
+
+        Returns
+        -------
+        SyncResult
+            Result of the synchronisation. Exceptions are reported as "ERROR".
+
+        """
+        try:
+            if gist_id:
+                try:
+                    return self._upsert_file(file_name, [gist_id], gist_catalog)
+                except GISTNotFoundError:
+
+                    # The GIST has been deleted remotely: drop the stale manifest entry and fall
+                    # back to the catalog (another GIST of the file name or a new GIST)
+                    if self.manifest is not None:
+                        self.manifest.remove_manifest([str(file_name.resolve())])
+                    if gist_catalog is None:
+                        gist_catalog = self.gist_api.get_catalog()
+                    with self._catalog_lock:
+                        gist_catalog.remove(gist_id)
+
+            # Look up the file name in the catalog and keep the catalog up to date, so a file
+            # that is processed later resolves a GIST created within this run without a listing
+            gist_catalog = t.cast(GISTCatalog, gist_catalog)
+            with self._name_lock(file_name):
+                with self._catalog_lock:
+                    gist_ids = gist_catalog.gist_ids(gist_file_name(file_name))
+
+                return self._upsert_file(file_name, gist_ids, gist_catalog)
+
+        except Exception as error:  # pylint: disable=broad-except
+            return SyncResult(file_name, "ERROR", error=str(error))
+
+    def _upsert_file(
+        self, file_name: Path, gist_ids: t.List[str], gist_catalog: t.Optional[GISTCatalog]
+    ) -> SyncResult:
+        """Update the GIST of a file or create a new one.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+        gist_ids : list
+            IDs of the GISTs of the file name. Empty, if a GIST shall be created.
+        gist_catalog : GISTCatalog, optional
+            Catalog that is updated with the created / updated GIST.
+
+        Raises
+        ------
+        GISTAmbiguityError
+            Exception raised if more than 1 GIST ID is given.
+
+        Returns
+        -------
+        SyncResult
+            Result of the synchronisation.
+
+        """
+        if len(gist_ids) > 1:
+            raise GISTAmbiguityError(gist_ids_list=gist_ids)
+
+        if gist_ids:
+
+            # Unchanged GISTs are skipped
+            changed_files = self.gist_api.diff_gist(file_name, gist_id=gist_ids[0])
+            if not changed_files:
+                return SyncResult(file_name, "UNCHANGED", gist_ids[0])
+
+            action = "UPDATE"
+            resp_data = self.gist_api.update_gist(
+                file_name=file_name, gist_id=gist_ids[0], files=changed_files
+            )
+        else:
+            action = "CREATE"
+            resp_data = self.gist_api.create_gist(file_name=file_name)
+
+        # Error responses of the REST API do not contain a GIST ID
+        if "id" not in resp_data:
+            return SyncResult(file_name, "ERROR", error=str(resp_data.get("message")))
+
+        # Update the catalog (code blocks may have been added or removed)
+        if gist_catalog is not None:
+            with self._catalog_lock:
+                gist_catalog.add(resp_data)
+
+        revision = (resp_data.get("history") or [{}])[0].get("version")
+
+        return SyncResult(file_name, action, resp_data["id"], revision=revision)
+
+    def run(
+        self,
+        file_names: t.Iterable[Path],
+        gist_catalog: t.Optional[GISTCatalog] = None,
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> t.List[SyncResult]:
+        """Create or update the GISTs of all files.
+
+        Parameters
+        ----------
+        file_names : iterable
+            Paths of the local files.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. The default is None, i.e., the catalog is fetched (only if a
+            changed file has no known GIST ID).
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done (in the calling
+            thread). The default is None.
+
+        Returns
+        -------
+        results : list
+            Results in the order of the input files.
+
+        """
+        file_names = list(file_names)
+        results: t.List[t.Optional[SyncResult]] = [None] * len(file_names)
+
+        def _set_result(index: int, result: SyncResult) -> None:
+            results[index] = result
+            if callback is not None:
+                callback(result)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+
+            # Compare the files with the manifest: stat all files and hash only the files with a
+            # changed stat
+            new_entries: t.Dict[int, ManifestEntry] = {}
+            if self.manifest is not None:
+                paths = [str(file_name.resolve()) for file_name in file_names]
+                entries = self.manifest.get_manifest(paths)
+                scans = {
+                    executor.submit(self._scan_file, file_name, entries.get(path)): index
+                    for index, (file_name, path) in enumerate(zip(file_names, paths))
+                }
+                for scan in as_completed(scans):
+                    index = scans[scan]
+                    try:
+                        new_entries[index], unchanged = scan.result()
+                    except OSError as error:
+                        _set_result(index, SyncResult(file_names[index], "ERROR", error=str(error)))
+                        continue
+                    if unchanged:
+                        entry = new_entries[index]
+                        _set_result(
+                            index, SyncResult(file_names[index], "UNCHANGED", entry.gist_id)
+                        )
+
+            # Files that share their GIST file name with other files are not merged into one GIST
+            conflicts = self._name_conflicts(
+                file_names,
+                {
+                    file_names[index]: entry.gist_id
+                    for index, entry in new_entries.items()
+                    if entry.gist_id
+                },
+            )
+            for index, file_name in enumerate(file_names):
+                if results[index] is None and file_name in conflicts:
+                    others = ", ".join(str(other) for other in conflicts[file_name])
+                    message = f"GIST file name {gist_file_name(file_name)} is shared with {others}"
+                    _set_result(index, SyncResult(file_name, "ERROR", error=message))
+
+            # Get the catalog only if a changed file has no known GIST ID
+            candidates = [index for index, result in enumerate(results) if result is None]
+            if gist_catalog is None and any(
+                not (index in new_entries and new_entries[index].gist_id) for index in candidates
+            ):
+                gist_catalog = self.gist_api.get_catalog()
+
+            # Synchronise the changed files
+            futures = {
+                executor.submit(
+                    self.sync_file,
+                    file_names[index],
+                    gist_catalog,
+                    new_entries[index].gist_id if index in new_entries else None,
+                ): index
+                for index in candidates
+            }
+            for future in as_completed(futures):
+                _set_result(futures[future], future.result())
+
+        # Store the state of all successfully synchronised files in the manifest
+        if self.manifest is not None:
+            self.manifest.store_manifest(
+                replace(
+                    new_entries[index],
+                    gist_id=result.gist_id or new_entries[index].gist_id,
+                    revision=result.revision or new_entries[index].revision,
+                )
+                for index, result in enumerate(results)
+                if index in new_entries and result is not None and result.ok and result.gist_id
+            )
+
+        return [result for result in results if result is not None]
+
+    def _known_gist_id(self, file_name: Path) -> t.Optional[str]:
+        """Get the GIST ID of a file from the sync manifest.
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+
+        Returns
+        -------
+        str or None
+            GIST ID. None, if the file has no manifest entry (or no manifest is used).
+
+        """
+        if self.manifest is None:
+            return None
+
+        path = str(file_name.resolve())
+        entry = self.manifest.get_manifest([path]).get(path)
+
+        return entry.gist_id if entry is not None and entry.gist_id else None
+
+    def _item_gist_id(
+        self, item: PlanItem, gist_catalog: t.Optional[GISTCatalog]
+    ) -> t.Optional[str]:
+        """Get the GIST ID of a plan item (item, manifest, catalog).
+
+        Parameters
+        ----------
+        item : PlanItem
+            Plan item.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. Only needed if the ID is neither set nor in the manifest.
+
+        Raises
+        ------
+        GISTAmbiguityError
+            Exception raised if the file name has more than 1 GIST IDs.
+
+        Returns
+        -------
+        str or None
+            GIST ID. None, if the file has no GIST.
+
+        """
+        file_name = item.old_file_name or item.file_name
+        gist_id = item.gist_id or self._known_gist_id(file_name)
+        if gist_id is not None or gist_catalog is None:
+            return gist_id
+
+        gist_ids = gist_catalog.gist_ids(gist_file_name(file_name))
+        if len(gist_ids) > 1:
+            raise GISTAmbiguityError(gist_ids_list=gist_ids)
+
+        return gist_ids[0] if gist_ids else None
+
+    def _needs_lookup(self, item: PlanItem) -> bool:
+        """Check whether the GIST ID of a plan item must be looked up in the catalog.
+
+        Parameters
+        ----------
+        item : PlanItem
+            Plan item.
+
+        Returns
+        -------
+        bool
+            True, if the item updates, deletes or renames a GIST with an unknown ID.
+
+        """
+        if item.action not in ("UPDATE", "DIFF", "DELETE", "RENAME") or item.gist_id:
+            return False
+
+        return self._known_gist_id(item.old_file_name or item.file_name) is None
+
+    def _apply_item(self, item: PlanItem, gist_catalog: t.Optional[GISTCatalog]) -> SyncResult:
+        """Execute a single plan item.
+
+        Parameters
+        ----------
+        item : PlanItem
+            Plan item.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs.
+
+        Returns
+        -------
+        SyncResult
+            Result of the item. Exceptions are reported as "ERROR".
+
+        """
+        file_name = item.file_name
+        try:
+            if item.action == "UNCHANGED":
+                return SyncResult(file_name, "UNCHANGED", item.gist_id)
+            if item.action == "CREATE":
+                return self._sync_file(file_name, GISTCatalog())
+
+            gist_id = self._item_gist_id(item, gist_catalog)
+
+            # An update or a rename of a file without a GIST creates it; a deletion is skipped
+            if gist_id is None:
+                if item.action == "DELETE":
+                    return SyncResult(file_name, "UNCHANGED")
+                return self._sync_file(file_name, gist_catalog or GISTCatalog())
+
+            # A GIST that has already been deleted (404) is gone as well
+            if item.action == "DELETE":
+                resp_status = self.gist_api.delete_gist(gist_id=gist_id)
+                if resp_status not in (204, 404):
+                    return SyncResult(file_name, "ERROR", gist_id, error=f"HTTP {resp_status}")
+                return SyncResult(file_name, "DELETE", gist_id)
+
+            # Updates without changed files (and files with an unknown state) are compared with
+            # the GIST first
+            if item.action == "DIFF" or (item.action == "UPDATE" and item.files is None):
+                return self._sync_file(file_name, gist_catalog, gist_id)
+
+            if item.action == "RENAME":
+                resp_data = self.gist_api.rename_gist(
+                    t.cast(Path, item.old_file_name), file_name, gist_id=gist_id
+                )
+            elif item.action == "UPDATE":
+                resp_data = self.gist_api.update_gist(
+                    file_name=file_name, gist_id=gist_id, files=item.files
+                )
+            else:
+                raise ValueError(f"Unknown plan action: {item.action}")
+
+            # Error responses of the REST API do not contain a GIST ID
+            if "id" not in resp_data:
+                return SyncResult(file_name, "ERROR", error=str(resp_data.get("message")))
+            revision = (resp_data.get("history") or [{}])[0].get("version")
+
+            return SyncResult(file_name, item.action, gist_id, revision=revision)
+
+        except Exception as error:  # pylint: disable=broad-except
+            return SyncResult(file_name, "ERROR", error=str(error))
+
+    def apply(
+        self,
+        plan: t.Iterable[PlanItem],
+        gist_catalog: t.Optional[GISTCatalog] = None,
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> t.List[SyncResult]:
+        """Execute the items of a sync plan concurrently.
+
+        The GIST IDs of all items are resolved from the items, the sync manifest or a single
+        listing (only fetched if needed). Each result contains the request statistics of its
+        item (HTTP response code, number of calls, bytes sent and latency).
+
+        Parameters
+        ----------
+        plan : iterable
+            Plan items.
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. The default is None, i.e., the catalog is fetched (only if an
+            item has no known GIST ID).
+        callback : callable, optional
+            Function that is called with each result as soon as an item is done (in the calling
+            thread). The default is None.
+
+        Returns
+        -------
+        results : list
+            Results in the order of the plan items.
+
+        """
+        plan = list(plan)
+
+        # Get the catalog only if an item has no known GIST ID
+        if gist_catalog is None and any(self._needs_lookup(item) for item in plan):
+            gist_catalog = self.gist_api.get_catalog()
+
+        # Execute the items concurrently. The files are scanned before their upload, so the
+        # manifest stores the uploaded state (and files that vanish meanwhile are skipped)
+        scans: t.Dict[int, ManifestEntry] = {}
+
+        def _scan_n_apply(index: int, item: PlanItem) -> SyncResult:
+            if self.manifest is not None and item.action in ("CREATE", "UPDATE", "DIFF", "RENAME"):
+                try:
+                    scans[index] = self._scan_file(item.file_name, None)[0]
+                except OSError:
+                    pass
+
+            return self._measured(self._apply_item, item, gist_catalog)
+
+        results: t.List[t.Optional[SyncResult]] = [None] * len(plan)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(_scan_n_apply, index, item): index
+                for index, item in enumerate(plan)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if callback is not None:
+                    callback(t.cast(SyncResult, results[futures[future]]))
+
+        # Update the manifest: previous paths of deleted / renamed files are removed, created /
+        # updated / renamed / compared files are stored with their GIST ID
+        if self.manifest is not None:
+            self.manifest.remove_manifest(
+                str((item.old_file_name or item.file_name).resolve())
+                for item, result in zip(plan, results)
+                if result is not None and result.action in ("DELETE", "RENAME")
+            )
+            self.manifest.store_manifest(
+                replace(scans[index], gist_id=result.gist_id, revision=result.revision)
+                for index, result in enumerate(results)
+                if index in scans and result is not None and result.ok and result.gist_id
+            )
+
+        return [t.cast(SyncResult, result) for result in results]
+
+    @staticmethod
+    def _split_changes(
+        changes: t.Iterable[FileChange], suffixes: t.Optional[t.Collection[str]]
+    ) -> t.Tuple[t.List[Path], t.List[PlanItem]]:
+        """Split file changes into creates / updates and GIST renames / deletions.
+
+        Parameters
+        ----------
+        changes : iterable
+            File changes, see git_name_status and parse_name_status.
+        suffixes : collection, optional
+            Suffixes of the synchronised files. None for all suffixes with a registered splitter.
+
+        Returns
+        -------
+        upserts : list
+            Paths of the added and modified files.
+        removals : list
+            Plan items of the deleted ("DELETE") and renamed ("RENAME") files.
+
+        """
+        # Split the changes into GIST renames / deletions and creates / updates. A rename from or
+        # to an unsupported suffix is a deletion or an addition
+        suffixes = {suffix.lower() for suffix in (SPLITTERS if suffixes is None else suffixes)}
+        upserts: t.List[Path] = []
+        removals: t.List[PlanItem] = []
+        for change in changes:
+            old_matches = change.old_path is not None and change.old_path.suffix.lower() in suffixes
+            new_matches = change.path.suffix.lower() in suffixes
+            if change.status == "R" and old_matches and new_matches:
+                removals.append(PlanItem("RENAME", change.path, old_file_name=change.old_path))
+            elif change.status == "R" and old_matches:
+                removals.append(PlanItem("DELETE", t.cast(Path, change.old_path)))
+            elif change.status in ("A", "M", "R") and new_matches:
+                upserts.append(change.path)
+            elif change.status == "D" and new_matches:
+                removals.append(PlanItem("DELETE", change.path))
+
+        return upserts, removals
+
+    @staticmethod
+    def _payload_size(file_name: Path) -> int:
+        """Compute the size of the request body of a file (create or full update).
+
+        Parameters
+        ----------
+        file_name : pathlib.Path
+            Path of the local file.
+
+        Returns
+        -------
+        int
+            Size of the JSON request body in bytes.
+
+        """
+        return len(json.dumps(gist_body(file_name)).encode("utf-8"))
+
+    def plan(
+        self,
+        file_names: t.Iterable[Path] = (),
+        removals: t.Iterable[PlanItem] = (),
+        gist_catalog: t.Optional[GISTCatalog] = None,
+    ) -> SyncPlan:
+        """Compute a sync plan without any content-creating request (dry run).
+
+        The plan is built from the sync manifest (local hashing; see run) and a single (cached)
+        listing. Files with a known GIST whose content changed since the last run are planned as
+        updates. Files that have a GIST, but no manifest entry (e.g., the first run or a run
+        without a manifest), are planned as "DIFF": the listing has no contents, so only the
+        comparison with the GIST tells whether they changed. The estimates of both are upper
+        bounds (the GIST is compared first and only changed code blocks are sent).
+
+        Parameters
+        ----------
+        file_names : iterable, optional
+            Paths of the local files to create / update.
+        removals : iterable, optional
+            Plan items of deleted and renamed files (see run_changes).
+        gist_catalog : GISTCatalog, optional
+            Catalog of all GISTs. The default is None, i.e., the catalog is fetched (only if
+            needed).
+
+        Returns
+        -------
+        SyncPlan
+            Plan items with estimated REST API calls and payload sizes, and the conflicts
+            (files with more than one GIST).
+
+        """
+        file_names, removals = list(file_names), list(removals)
+        sync_plan = SyncPlan()
+
+        # Compare the files with the manifest (only files with a changed stat are hashed)
+        known_ids: t.Dict[Path, str] = {}
+        candidates = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            entries = (
+                self.manifest.get_manifest(str(file_name.resolve()) for file_name in file_names)
+                if self.manifest is not None
+                else {}
+            )
+            scans = executor.map(
+                lambda file_name: self._scan_file(file_name, entries.get(str(file_name.resolve()))),
+                file_names,
+            )
+            for file_name, (entry, unchanged) in zip(file_names, scans):
+                if unchanged:
+                    sync_plan.items.append(PlanItem("UNCHANGED", file_name, entry.gist_id))
+                    continue
+                if entry.gist_id:
+                    known_ids[file_name] = entry.gist_id
+                candidates.append(file_name)
+
+            # Get the catalog only if a file has no known GIST ID
+            if gist_catalog is None and (
+                len(known_ids) < len(candidates) or any(map(self._needs_lookup, removals))
+            ):
+                gist_catalog = self.gist_api.get_catalog()
+
+            # Files that share their GIST file name with other files are conflicts
+            name_conflicts = self._name_conflicts(file_names, known_ids)
+            for file_name in candidates:
+                if file_name in name_conflicts:
+                    sync_plan.conflicts[file_name] = [
+                        str(other) for other in name_conflicts[file_name]
+                    ]
+            candidates = [file_name for file_name in candidates if file_name not in name_conflicts]
+
+            # Plan the creates / updates and compute the payload sizes
+            payload_sizes = executor.map(self._payload_size, candidates)
+            for file_name, payload_size in zip(candidates, payload_sizes):
+                gist_ids = (
+                    [known_ids[file_name]]
+                    if file_name in known_ids
+                    else t.cast(GISTCatalog, gist_catalog).gist_ids(gist_file_name(file_name))
+                )
+                if len(gist_ids) > 1:
+                    sync_plan.conflicts[file_name] = gist_ids
+                elif gist_ids:
+                    sync_plan.items.append(
+                        PlanItem(
+                            "UPDATE" if file_name in known_ids else "DIFF",
+                            file_name,
+                            gist_ids[0],
+                            requests=2,
+                            payload_bytes=payload_size,
+                        )
+                    )
+                else:
+                    sync_plan.items.append(
+                        PlanItem("CREATE", file_name, requests=1, payload_bytes=payload_size)
+                    )
+
+        # Plan the deletions / renames; unknown GISTs are skipped (deletion) or created (rename)
+        for item in removals:
+            try:
+                gist_id = self._item_gist_id(item, gist_catalog)
+            except GISTAmbiguityError as error:
+                sync_plan.conflicts[item.old_file_name or item.file_name] = error.gist_ids_list
+                continue
+
+            if item.action == "DELETE":
+                action, requests, payload_size = (
+                    ("DELETE", 1, 0) if gist_id else ("UNCHANGED", 0, 0)
+                )
+            else:
+                action, requests = ("RENAME", 2) if gist_id else ("CREATE", 1)
+                payload_size = self._payload_size(item.file_name)
+            sync_plan.items.append(
+                replace(
+                    item,
+                    action=action,
+                    gist_id=gist_id,
+                    requests=requests,
+                    payload_bytes=payload_size,
+                )
+            )
+
+        return sync_plan
+
+    def plan_changes(
+        self, changes: t.Iterable[FileChange], suffixes: t.Optional[t.Collection[str]] = None
+    ) -> SyncPlan:
+        """Compute the sync plan of the changed files of a diff (dry run of run_changes).
+
+        Parameters
+        ----------
+        changes : iterable
+            File changes, see git_name_status and parse_name_status.
+        suffixes : collection, optional
+            Suffixes of the synchronised files. The default is None, i.e., all suffixes with a
+            registered splitter.
+
+        Returns
+        -------
+        SyncPlan
+            See plan.
+
+        """
+        upserts, removals = self._split_changes(changes, suffixes)
+
+        return self.plan(upserts, removals)
+
+    def run_changes(
+        self,
+        changes: t.Iterable[FileChange],
+        suffixes: t.Optional[t.Collection[str]] = None,
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> t.List[SyncResult]:
+        """Synchronise only the changed files of a diff (e.g., of a git revision range).
+
+        Added and modified files are created / updated, the GISTs of deleted files are deleted and
+        the GISTs of renamed files are renamed (the GIST ID is kept).
+
+        Parameters
+        ----------
+        changes : iterable
+            File changes, see git_name_status and parse_name_status.
+        suffixes : collection, optional
+            Suffixes of the synchronised files, e.g., {".py"}. The default is None, i.e., all
+            suffixes with a registered splitter (see gistyc.blocks).
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done. The default is
+            None.
+
+        Returns
+        -------
+        results : list
+            Results of the renamed / deleted files followed by the created / updated files.
+
+        """
+        upserts, removals = self._split_changes(changes, suffixes)
+
+        # Rename / delete the GISTs; the catalog is reused for the creates / updates
+        gist_catalog = None
+        if any(self._needs_lookup(item) for item in removals):
+            gist_catalog = self.gist_api.get_catalog()
+        results = self.apply(removals, gist_catalog, callback=callback) if removals else []
+
+        return results + self.run(upserts, gist_catalog, callback=callback)
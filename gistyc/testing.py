@@ -0,0 +1,849 @@
+"""Local stand-in of the GitHub GIST REST API for offline tests and benchmarks."""
+
+# Import standard libraries
+import contextlib
+from dataclasses import dataclass
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import re
+import subprocess  # nosec
+import sys
+import threading
+import time
+import typing as t
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+# Import GISTyc
+from gistyc.instrument import CallLog
+
+if t.TYPE_CHECKING:
+    from gistyc.gistyc import GISTyc
+
+# Contents of larger files are truncated in single GIST responses (like the GitHub REST API)
+DEFAULT_TRUNCATE_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class FakeCall:
+    """Request that has been answered by the fake GIST API.
+
+    Attributes
+    ----------
+    method : str
+        HTTP method.
+    path : str
+        Request path including the query.
+    status_code : int
+        HTTP response code.
+    bytes_sent : int
+        Size of the request body in bytes.
+    bytes_received : int
+        Size of the response body in bytes.
+
+    """
+
+    method: str
+    path: str
+    status_code: int
+    bytes_sent: int
+    bytes_received: int
+
+
+class FakeGistAPI:
+    """In-memory GIST REST API served by a local HTTP server (in a background thread).
+
+    The server implements the GIST endpoints used by gistyc: the paginated listing (with "Link"
+    headers and ETags for conditional requests), single GISTs (latest revision and specific
+    revisions, with ETags), raw file downloads, creation, update (including renames and file
+    deletions) and deletion. Each response carries rate limit headers; if the budget is exhausted,
+    requests are answered with 403. An optional latency is added to every request, and file
+    contents larger than the truncation threshold are truncated in single GIST responses.
+
+    Use the instance as a context manager (or call start and close) and pass its url as api_url
+    to GISTyc. GISTs can be added directly with add_gist and add_gists; fail_next injects errors
+    (e.g., server errors) into the next responses.
+
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        truncate_size: int = DEFAULT_TRUNCATE_SIZE,
+        rate_limit: int = 5000,
+        max_per_page: int = 100,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initiate the fake API (the server is started by start or the context manager).
+
+        Parameters
+        ----------
+        latency : float, optional
+            Delay in seconds that is added to every request. The default is 0.0.
+        truncate_size : int, optional
+            Maximum size of a file content in single GIST responses; larger contents are
+            truncated. The default is 1 MiB.
+        rate_limit : int, optional
+            Number of requests per hour; 304 responses are not counted. The default is 5000.
+        max_per_page : int, optional
+            Maximum page size of the listing. The default is 100.
+        host : str, optional
+            Host of the server. The default is "127.0.0.1".
+        port : int, optional
+            Port of the server. The default is 0, i.e., a free port.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.latency = latency
+        self.truncate_size = truncate_size
+        self.rate_limit = rate_limit
+        self.max_per_page = max_per_page
+
+        # State of all GISTs: GIST ID -> GIST; revision -> files of each GIST
+        self.gists: t.Dict[str, t.Dict] = {}
+        self.revisions: t.Dict[str, t.Dict[str, t.Dict]] = {}
+        self.calls: t.List[FakeCall] = []
+        self.remaining = rate_limit
+        self.reset = int(time.time()) + 3600
+
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._clock = 0.0
+        self._listing: t.Optional[t.List[t.Dict]] = None
+        self._failures: t.List[t.Tuple[int, t.Dict[str, str]]] = []
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: t.Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Get the base URL of the fake API.
+
+        Returns
+        -------
+        str
+            Base URL, e.g., "http://127.0.0.1:8080".
+
+        """
+        host, port = self._server.server_address[:2]
+
+        return f"http://{t.cast(str, host)}:{port}"
+
+    def start(self) -> "FakeGistAPI":
+        """Start the server in a background thread.
+
+        Returns
+        -------
+        FakeGistAPI
+            The instance itself.
+
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def close(self) -> None:
+        """Stop the server.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGistAPI":
+        """Start the server.
+
+        Returns
+        -------
+        FakeGistAPI
+            The instance itself.
+
+        """
+        return self.start()
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        """Stop the server.
+
+        Parameters
+        ----------
+        *exc_info : t.Any
+            Exception information (unused).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.close()
+
+    def _now(self) -> str:
+        """Get a strictly increasing timestamp (the lock must be held by the caller).
+
+        Returns
+        -------
+        str
+            ISO 8601 datetime with seconds precision (like the GitHub REST API).
+
+        """
+        self._clock = max(time.time(), self._clock + 1.0)
+
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self._clock))
+
+    def _store(self, gist: t.Dict) -> t.Dict:
+        """Add a new revision of a GIST (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        gist : dict
+            GIST with its files (the file contents are complete).
+
+        Returns
+        -------
+        gist : dict
+            GIST with the new revision at the top of its history.
+
+        """
+        revision = hashlib.sha1(  # nosec
+            json.dumps([gist["id"], gist["files"], len(gist["history"])], sort_keys=True).encode()
+        ).hexdigest()
+        gist["history"].insert(0, {"version": revision, "committed_at": gist["updated_at"]})
+        self.revisions.setdefault(gist["id"], {})[revision] = json.loads(json.dumps(gist))
+        self.gists[gist["id"]] = gist
+        self._listing = None
+
+        return gist
+
+    def add_gist(self, files: t.Dict[str, str], description: t.Optional[str] = None) -> str:
+        """Add a GIST directly to the state (without a request).
+
+        Parameters
+        ----------
+        files : dict
+            File name -> content.
+        description : str, optional
+            Description of the GIST. The default is None.
+
+        Returns
+        -------
+        gist_id : str
+            GIST ID.
+
+        """
+        with self._lock:
+            gist_id = f"{next(self._ids):032x}"
+            now = self._now()
+            gist: t.Dict[str, t.Any] = {
+                "id": gist_id,
+                "description": description,
+                "public": True,
+                "created_at": now,
+                "updated_at": now,
+                "files": {name: self._file(name, content) for name, content in files.items()},
+                "history": [],
+            }
+
+            return t.cast(str, self._store(gist)["id"])
+
+    def add_gists(self, count: int, files_per_gist: int = 1, file_size: int = 100) -> t.List[str]:
+        """Add synthetic GISTs directly to the state.
+
+        Parameters
+        ----------
+        count : int
+            Number of GISTs.
+        files_per_gist : int, optional
+            Number of files (code blocks) per GIST. The default is 1.
+        file_size : int, optional
+            Size of each file content in bytes. The default is 100.
+
+        Returns
+        -------
+        list
+            GIST IDs.
+
+        """
+        gist_ids = []
+        for index in range(count):
+            files = {
+                f"file{index}{f'_{block}' if block else ''}.py": "#" * (file_size - 1) + "\n"
+                for block in range(files_per_gist)
+            }
+            gist_ids.append(self.add_gist(files, description=f"GIST {index}"))
+
+        return gist_ids
+
+    @staticmethod
+    def _file(file_name: str, content: str) -> t.Dict:
+        """Create a GIST file.
+
+        Parameters
+        ----------
+        file_name : str
+            File name.
+        content : str
+            Content.
+
+        Returns
+        -------
+        dict
+            GIST file (raw_url is relative and completed for each response).
+
+        """
+        return {
+            "filename": file_name,
+            "type": "text/plain",
+            "size": len(content.encode("utf-8")),
+            "content": content,
+        }
+
+    def _present(self, gist: t.Dict, base_url: str, listing: bool) -> t.Dict:
+        """Present a GIST as a listing entry or as a single GIST response.
+
+        Parameters
+        ----------
+        gist : dict
+            Stored GIST.
+        base_url : str
+            Base URL of the server (for the raw URLs).
+        listing : bool
+            Present a listing entry (without contents and history).
+
+        Returns
+        -------
+        dict
+            GIST response.
+
+        """
+        revision = gist["history"][0]["version"]
+        files = {}
+        for file_name, gist_file in gist["files"].items():
+            response_file = {key: value for key, value in gist_file.items() if key != "content"}
+            response_file["raw_url"] = f"{base_url}/raw/{gist['id']}/{revision}/{quote(file_name)}"
+            if not listing:
+                content = gist_file["content"]
+                response_file["truncated"] = gist_file["size"] > self.truncate_size
+                response_file["content"] = (
+                    content.encode("utf-8")[: self.truncate_size].decode("utf-8", "ignore")
+                    if response_file["truncated"]
+                    else content
+                )
+            files[file_name] = response_file
+
+        response_gist = {key: value for key, value in gist.items() if key not in ("files",)}
+        response_gist["files"] = files
+        response_gist["url"] = f"{base_url}/gists/{gist['id']}"
+        if listing:
+            del response_gist["history"]
+
+        return response_gist
+
+    def _sorted_gists(self) -> t.List[t.Dict]:
+        """Get the GISTs ordered like the listing (the lock must be held by the caller).
+
+        Returns
+        -------
+        list
+            GISTs, the most recently updated first.
+
+        """
+        if self._listing is None:
+            self._listing = sorted(
+                self.gists.values(), key=lambda gist: (gist["updated_at"], gist["id"]), reverse=True
+            )
+
+        return self._listing
+
+    def fail_next(
+        self, status: int, headers: t.Optional[t.Dict[str, str]] = None, count: int = 1
+    ) -> None:
+        """Answer the next requests with an error (e.g., a server error or a secondary rate limit).
+
+        Parameters
+        ----------
+        status : int
+            HTTP response code, e.g., 503.
+        headers : dict, optional
+            Response headers, e.g., {"Retry-After": "1"}. The default is None.
+        count : int, optional
+            Number of failing requests. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self._failures.extend([(status, headers or {})] * count)
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        headers: t.Mapping[str, str],
+        body: bytes,
+        base_url: str,
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Answer a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        path : str
+            Request path including the query.
+        headers : Mapping
+            Request headers.
+        body : bytes
+            Request body.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            if self._failures:
+                status, failure_headers = self._failures.pop(0)
+                status, response_headers, response_body = _json_response(
+                    status, {"message": "Injected failure"}, failure_headers
+                )
+            else:
+                status, response_headers, response_body = self._route(
+                    method, path, headers, body, base_url
+                )
+            self.calls.append(FakeCall(method, path, status, len(body), len(response_body)))
+
+        return status, response_headers, response_body
+
+    def _rate_limit_headers(self) -> t.Dict[str, str]:
+        """Get the rate limit headers (the lock must be held by the caller).
+
+        Returns
+        -------
+        dict
+            X-RateLimit-* headers.
+
+        """
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset),
+            "X-RateLimit-Used": str(self.rate_limit - self.remaining),
+        }
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        headers: t.Mapping[str, str],
+        body: bytes,
+        base_url: str,
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Route a request to its endpoint (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        path : str
+            Request path including the query.
+        headers : Mapping
+            Request headers.
+        body : bytes
+            Request body.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        parsed_path = urlparse(path)
+        raw_match = re.fullmatch(r"/raw/([^/]+)/([^/]+)/(.+)", parsed_path.path)
+        if raw_match:
+            return self._get_raw(*(unquote(group) for group in raw_match.groups()))
+
+        if not headers.get("Authorization"):
+            return _json_response(401, {"message": "Requires authentication"})
+
+        # Reset the budget every hour; an exhausted budget is answered with 403
+        if time.time() >= self.reset:
+            self.remaining, self.reset = self.rate_limit, int(time.time()) + 3600
+        if self.remaining <= 0:
+            return _json_response(
+                403, {"message": "API rate limit exceeded"}, self._rate_limit_headers()
+            )
+
+        status, response_headers, response_body = self._route_api(
+            method, parsed_path.path, parse_qs(parsed_path.query), headers, body, base_url
+        )
+        if status != 304:
+            self.remaining -= 1
+        response_headers.update(self._rate_limit_headers())
+
+        return status, response_headers, response_body
+
+    def _route_api(
+        self,
+        method: str,
+        path: str,
+        query: t.Dict[str, t.List[str]],
+        headers: t.Mapping[str, str],
+        body: bytes,
+        base_url: str,
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Answer a REST API request (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        path : str
+            Request path without the query.
+        query : dict
+            Parsed query.
+        headers : Mapping
+            Request headers.
+        body : bytes
+            Request body.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        gist_match = re.fullmatch(r"/gists/([^/]+)(?:/([0-9a-f]{40}))?", path)
+        gist = self.gists.get(gist_match.group(1)) if gist_match else None
+
+        if path == "/gists" and method == "GET":
+            return self._get_listing(query, headers, base_url)
+        if path == "/gists" and method == "POST":
+            return self._create(json.loads(body or b"{}"), base_url)
+        if gist_match is None or gist is None:
+            return _json_response(404, {"message": "Not Found"})
+        if method == "GET" and gist_match.group(2):
+            revision_gist = self.revisions[gist["id"]].get(gist_match.group(2))
+            if revision_gist is None:
+                return _json_response(404, {"message": "Not Found"})
+            return _json_response(200, self._present(revision_gist, base_url, listing=False))
+        if method == "GET":
+            etag = f'"{gist["history"][0]["version"]}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return _json_response(200, self._present(gist, base_url, listing=False), {"ETag": etag})
+        if method == "PATCH":
+            return self._update(gist, json.loads(body or b"{}"), base_url)
+        if method == "DELETE":
+            del self.gists[gist["id"]]
+            self._listing = None
+            return 204, {}, b""
+
+        return _json_response(405, {"message": "Method Not Allowed"})
+
+    def _get_listing(
+        self, query: t.Dict[str, t.List[str]], headers: t.Mapping[str, str], base_url: str
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Answer a listing request (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        query : dict
+            Parsed query (page, per_page).
+        headers : Mapping
+            Request headers.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        per_page = min(max(int(query.get("per_page", ["30"])[0]), 1), self.max_per_page)
+        gists = self._sorted_gists()
+        last_page = max(-(-len(gists) // per_page), 1)
+        page_gists = [
+            self._present(gist, base_url, listing=True)
+            for gist in gists[slice((page - 1) * per_page, page * per_page)]
+        ]
+
+        # Pagination links and the ETag of the page
+        links = {"next": page + 1, "last": last_page} if page < last_page else {}
+        if page > 1:
+            links.update(first=1, prev=page - 1)
+        response_headers = {}
+        if links:
+            response_headers["Link"] = ", ".join(
+                f'<{base_url}/gists?page={link_page}&per_page={per_page}>; rel="{rel}"'
+                for rel, link_page in links.items()
+            )
+        response_body = json.dumps(page_gists).encode("utf-8")
+        etag = f'"{hashlib.md5(response_body).hexdigest()}"'  # nosec
+        response_headers["ETag"] = etag
+        if headers.get("If-None-Match") == etag:
+            return 304, response_headers, b""
+
+        return 200, {**response_headers, "Content-Type": "application/json"}, response_body
+
+    def _create(self, data: t.Dict, base_url: str) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Create a GIST (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        data : dict
+            Request body.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        files = {name: gist_file["content"] for name, gist_file in data.get("files", {}).items()}
+        if not files:
+            return _json_response(422, {"message": "Validation Failed"})
+        gist_id = self.add_gist(files, description=data.get("description"))
+
+        return _json_response(201, self._present(self.gists[gist_id], base_url, listing=False))
+
+    def _update(
+        self, gist: t.Dict, data: t.Dict, base_url: str
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Update (and rename or delete files of) a GIST (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        gist : dict
+            Stored GIST.
+        data : dict
+            Request body.
+        base_url : str
+            Base URL of the server.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        files = dict(gist["files"])
+        for file_name, gist_file in data.get("files", {}).items():
+            old_file = files.pop(file_name, None)
+            if gist_file is None:
+                continue
+            new_name = gist_file.get("filename") or file_name
+            content = gist_file.get("content", (old_file or {}).get("content"))
+            if content is None:
+                return _json_response(422, {"message": "Validation Failed"})
+            files[new_name] = self._file(new_name, content)
+
+        gist = {**gist, "files": files, "updated_at": self._now(), "history": gist["history"]}
+        if "description" in data:
+            gist["description"] = data["description"]
+
+        return _json_response(200, self._present(self._store(gist), base_url, listing=False))
+
+    def _get_raw(
+        self, gist_id: str, revision: str, file_name: str
+    ) -> t.Tuple[int, t.Dict[str, str], bytes]:
+        """Answer a raw file download (the lock must be held by the caller).
+
+        Parameters
+        ----------
+        gist_id : str
+            GIST ID.
+        revision : str
+            Revision SHA.
+        file_name : str
+            File name.
+
+        Returns
+        -------
+        tuple
+            HTTP response code, response headers and response body.
+
+        """
+        gist = self.revisions.get(gist_id, {}).get(revision)
+        if gist is None or file_name not in gist["files"]:
+            return 404, {"Content-Type": "text/plain"}, b"404: Not Found"
+
+        content = gist["files"][file_name]["content"].encode("utf-8")
+
+        return 200, {"Content-Type": "text/plain; charset=utf-8"}, content
+
+
+def _json_response(
+    status: int, data: t.Any, headers: t.Optional[t.Dict[str, str]] = None
+) -> t.Tuple[int, t.Dict[str, str], bytes]:
+    """Create a JSON response.
+
+    Parameters
+    ----------
+    status : int
+        HTTP response code.
+    data : t.Any
+        JSON serialisable response data.
+    headers : dict, optional
+        Further response headers. The default is None.
+
+    Returns
+    -------
+    tuple
+        HTTP response code, response headers and response body.
+
+    """
+    return (
+        status,
+        {**(headers or {}), "Content-Type": "application/json"},
+        json.dumps(data).encode(),
+    )
+
+
+def _make_handler(fake_api: FakeGistAPI) -> t.Type[BaseHTTPRequestHandler]:
+    """Create the request handler class of a fake API.
+
+    Parameters
+    ----------
+    fake_api : FakeGistAPI
+        Fake API that answers the requests.
+
+    Returns
+    -------
+    type
+        Request handler class (keep-alive connections).
+
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        """Request handler that passes all requests to the fake API."""
+
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: t.Any) -> None:  # pylint: disable=arguments-differ
+            """Suppress the request log."""
+
+        def _handle(self) -> None:
+            """Read the request, answer it and write the response."""
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            base_url = f"http://{self.headers.get('Host', '127.0.0.1')}"
+            status, headers, response_body = fake_api.handle(
+                self.command, self.path, t.cast(t.Mapping[str, str], self.headers), body, base_url
+            )
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(response_body)))
+            self.end_headers()
+            self.wfile.write(response_body)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    return _Handler
+
+
+@contextlib.contextmanager
+def assert_max_calls(
+    gist_api: "GISTyc", max_calls: int, endpoint: t.Optional[str] = None
+) -> t.Iterator[CallLog]:
+    """Assert an upper bound of the REST API calls of a GISTyc instance within a with-block.
+
+    The calls are traced with a CallLog hook (of all threads). If the block sends more calls than
+    allowed, an AssertionError with the trace of all calls is raised, so accidental additional
+    listings or per-file requests fail the tests.
+
+    Parameters
+    ----------
+    gist_api : GISTyc
+        GISTyc instance.
+    max_calls : int
+        Maximum number of calls (including retries).
+    endpoint : str, optional
+        Count only the calls of this endpoint (e.g., "GET /gists") or HTTP method (e.g., "PATCH").
+        The default is None, i.e., all calls.
+
+    Raises
+    ------
+    AssertionError
+        More calls than max_calls have been sent.
+
+    Returns
+    -------
+    Iterator
+        Log of the calls within the block.
+
+    """
+    call_log = CallLog()
+    gist_api.add_hook(call_log)
+    try:
+        yield call_log
+    finally:
+        gist_api.hooks.remove(call_log)
+
+    calls = call_log.count(endpoint)
+    if calls > max_calls:
+        scope = f" of {endpoint}" if endpoint else ""
+        raise AssertionError(
+            f"{calls} calls{scope} exceed the budget of {max_calls}:\n{call_log.format()}"
+        )
+
+
+def import_time(statement: str = "import gistyc", repeat: int = 3) -> t.Dict[str, float]:
+    """Measure the import times of a statement in fresh interpreters (python -X importtime).
+
+    Parameters
+    ----------
+    statement : str, optional
+        Python statement, e.g., "import gistyc.cli". The default is "import gistyc".
+    repeat : int, optional
+        Number of interpreter runs; the fastest time of each module is taken. The default is 3.
+
+    Returns
+    -------
+    dict
+        Imported module -> cumulative import time in seconds (including its own imports).
+
+    """
+    import_times: t.Dict[str, float] = {}
+    for _ in range(max(repeat, 1)):
+        process = subprocess.run(  # nosec
+            [sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+        # Lines: "import time: <self [us]> | <cumulative [us]> | <module>"
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or line.endswith("| imported package"):
+                continue
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                seconds = int(cumulative) / 1e6
+                module = module.strip()
+                import_times[module] = min(import_times.get(module, seconds), seconds)
+
+    return import_times
@@ -0,0 +1,448 @@
+"""Continuous synchronisation of a directory with its GISTs (watch mode)."""
+
+# Import standard libraries
+import importlib.util
+import os
+from pathlib import Path
+import threading
+import time
+import typing as t
+
+# Import GISTyc
+from gistyc.blocks import SPLITTERS, find_files
+from gistyc.gistyc import GISTCatalog
+from gistyc.sync import FileChange, PlanItem, SyncEngine, SyncResult
+
+# File system events of changed, moved and deleted files
+_CHANGE_EVENTS = {"created", "modified", "moved", "closed", "deleted"}
+
+# The optional dependency watchdog is imported when a watcher starts (not at import time)
+HAS_WATCHDOG = importlib.util.find_spec("watchdog") is not None
+
+
+class DirectoryWatcher:
+    """Watch a directory and synchronise changed files with their GISTs.
+
+    Changes are detected by file system events (inotify, FSEvents, ...) if watchdog is installed
+    and by polling the file stats otherwise. Bursts of events (e.g., an editor that saves several
+    times) are debounced and coalesced: the changed files are synchronised as a batch once no
+    event occurred for the debounce time. The GIST of a moved (renamed) file is renamed; a
+    deleted file (or a file moved to an unwatched suffix) drops its sync manifest entry, but its
+    GIST is kept. A batch that fails as a whole (e.g., a network error) is reported as "ERROR"
+    results and the watcher continues with the next batch.
+
+    The GISTyc instance of the sync engine (pooled connections, index and content cache) and the
+    GIST catalog stay in memory across the batches. The catalog is fetched once (with the first
+    batch) and kept up to date by the sync engine, so a change costs only the comparison with its
+    GIST and the update of the changed code blocks.
+
+    """
+
+    def __init__(
+        self,
+        sync_engine: SyncEngine,
+        directory: t.Union[Path, str],
+        suffixes: t.Optional[t.Collection[str]] = None,
+        debounce: float = 0.3,
+        poll_interval: float = 0.5,
+        use_watchdog: t.Optional[bool] = None,
+    ) -> None:
+        """Initiate the watcher (the directory is watched by run).
+
+        Parameters
+        ----------
+        sync_engine : SyncEngine
+            Sync engine that creates / updates the GISTs of the changed files.
+        directory : pathlib.Path or str
+            Directory to watch (recursively).
+        suffixes : collection, optional
+            File suffixes to consider, e.g., {".py", ".sql"}. The default is None, i.e., all
+            registered suffixes.
+        debounce : float, optional
+            Quiet time in seconds after the last event before a batch is synchronised. The
+            default is 0.3.
+        poll_interval : float, optional
+            Interval in seconds between two scans of the polling fallback. The default is 0.5.
+        use_watchdog : bool, optional
+            Use file system events (requires watchdog). The default is None, i.e., if watchdog is
+            installed.
+
+        Raises
+        ------
+        ImportError
+            Exception raised if file system events are requested, but watchdog is not installed.
+
+        Returns
+        -------
+        None.
+
+        """
+        if use_watchdog and not HAS_WATCHDOG:
+            raise ImportError("File system events require watchdog: pip install gistyc[watch]")
+
+        self.sync_engine = sync_engine
+        self.directory = Path(directory)
+        self.suffixes = {suffix.lower() for suffix in (SPLITTERS if suffixes is None else suffixes)}
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_watchdog = HAS_WATCHDOG if use_watchdog is None else use_watchdog
+        self.catalog: t.Optional[GISTCatalog] = None
+        self._refresh_catalog = False
+
+        # Pending paths with the time of their last event, the previous paths of moved files
+        # (destination -> source) and the file stats of the polling
+        self._condition = threading.Condition()
+        self._pending: t.Dict[Path, float] = {}
+        self._moves: t.Dict[Path, Path] = {}
+        self._stopped = threading.Event()
+        self._stats: t.Optional[t.Dict[Path, t.Tuple[int, int, int]]] = None
+
+    def notify(
+        self, path: t.Union[Path, str], old_path: t.Optional[t.Union[Path, str]] = None
+    ) -> None:
+        """Mark a file as changed, moved or deleted (called for each file system event).
+
+        Parameters
+        ----------
+        path : pathlib.Path or str
+            Path of the changed, deleted or moved (destination) file. Files with other suffixes
+            are ignored.
+        old_path : pathlib.Path or str, optional
+            Previous path of a moved file. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        path = Path(path)
+        if old_path is not None and Path(old_path).suffix.lower() in self.suffixes:
+            old_path = Path(old_path)
+        else:
+            old_path = None
+
+        # A file moved to another suffix is gone
+        if path.suffix.lower() not in self.suffixes:
+            if old_path is None:
+                return
+            path, old_path = old_path, None
+
+        with self._condition:
+            if old_path is not None:
+                self._pending.pop(old_path, None)
+                self._moves[path] = self._moves.pop(old_path, old_path)
+            self._pending[path] = time.monotonic()
+            self._condition.notify_all()
+
+    def scan(self) -> t.List[FileChange]:
+        """Scan the file stats of the directory and get the changed files (polling fallback).
+
+        The first scan records the stats only. A new file with the inode of a vanished file is a
+        moved file.
+
+        Returns
+        -------
+        list
+            Changes of the new ("A"), modified ("M"), moved ("R") and deleted ("D") files since
+            the last scan.
+
+        """
+        stats = {}
+        for file_name in find_files(self.directory, self.suffixes):
+            try:
+                file_stat = file_name.stat()
+            except OSError:
+                continue
+            stats[file_name] = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+        previous_stats, self._stats = self._stats, stats
+        if previous_stats is None:
+            return []
+
+        vanished = {
+            stat[2]: path for path, stat in previous_stats.items() if path not in stats and stat[2]
+        }
+        changes = []
+        for path, stat in stats.items():
+            if path not in previous_stats and stat[2] in vanished:
+                changes.append(FileChange("R", path, vanished.pop(stat[2])))
+            elif path not in previous_stats:
+                changes.append(FileChange("A", path))
+            elif previous_stats[path] != stat:
+                changes.append(FileChange("M", path))
+
+        return changes + [FileChange("D", path) for path in vanished.values()]
+
+    def _next_batch(self) -> t.List[FileChange]:
+        """Wait for changed files and return them once the events have been quiet.
+
+        Returns
+        -------
+        list
+            Changes of the pending files (sorted by path): existing files are modified ("M") or
+            moved ("R"), missing files are deleted ("D", with their path before any move). Empty,
+            if the watcher has been stopped.
+
+        """
+        with self._condition:
+            while not self._pending and not self._stopped.is_set():
+                self._condition.wait()
+
+            # Debounce: wait until no event occurred for the debounce time
+            while not self._stopped.is_set():
+                quiet_time = time.monotonic() - max(self._pending.values())
+                if quiet_time >= self.debounce:
+                    break
+                self._condition.wait(self.debounce - quiet_time)
+
+            if self._stopped.is_set():
+                return []
+            batch = sorted(self._pending)
+            moves, self._moves = self._moves, {}
+            self._pending.clear()
+
+        changes = []
+        for path in batch:
+            old_path = moves.get(path)
+            if not path.is_file():
+                changes.append(FileChange("D", old_path or path))
+            elif old_path is not None and old_path != path:
+                changes.append(FileChange("R", path, old_path))
+            else:
+                changes.append(FileChange("M", path))
+
+        return changes
+
+    def _get_catalog(self) -> GISTCatalog:
+        """Get the in-memory catalog (fetched on the first call and after a failed batch).
+
+        Returns
+        -------
+        GISTCatalog
+            Catalog of all GISTs.
+
+        """
+        if self.catalog is None:
+            self.catalog = self.sync_engine.gist_api.get_catalog(refresh=self._refresh_catalog)
+            self._refresh_catalog = False
+
+        return self.catalog
+
+    def sync(
+        self,
+        file_names: t.Iterable[Path],
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> t.List[SyncResult]:
+        """Synchronise files with the in-memory catalog (fetched on the first call).
+
+        Parameters
+        ----------
+        file_names : iterable
+            Paths of the changed files.
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done. The default is
+            None.
+
+        Returns
+        -------
+        list
+            Results in the order of the files.
+
+        """
+        catalog = self._get_catalog()
+
+        return self.sync_engine.run(file_names, catalog, callback=callback)
+
+    def sync_changes(
+        self,
+        changes: t.Iterable[FileChange],
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> t.List[SyncResult]:
+        """Synchronise changed, moved and deleted files with the in-memory catalog.
+
+        The GISTs of moved files are renamed (the GIST ID is kept). Deleted files drop their sync
+        manifest entries without any REST API call; their GISTs are kept.
+
+        Parameters
+        ----------
+        changes : iterable
+            File changes, see _next_batch and scan.
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done. The default is
+            None.
+
+        Returns
+        -------
+        list
+            Results of the moved files followed by the created / updated files.
+
+        """
+        changes = list(changes)
+        manifest = self.sync_engine.manifest
+        deleted = [str(change.path.resolve()) for change in changes if change.status == "D"]
+        if deleted and manifest is not None:
+            manifest.remove_manifest(deleted)
+
+        renames = [
+            PlanItem("RENAME", change.path, old_file_name=change.old_path)
+            for change in changes
+            if change.status == "R"
+        ]
+        upserts = [change.path for change in changes if change.status in ("A", "M")]
+        if not renames and not upserts:
+            return []
+
+        catalog = self._get_catalog()
+        results = self.sync_engine.apply(renames, catalog, callback) if renames else []
+
+        return results + self.sync_engine.run(upserts, catalog, callback=callback)
+
+    def _sync_batch(
+        self,
+        changes: t.List[FileChange],
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+    ) -> None:
+        """Synchronise a batch of changes; a failed batch does not stop the watcher.
+
+        Errors of single files are reported by the sync engine. If the batch fails as a whole
+        (e.g., the listing or the sync manifest could not be accessed), each file of the batch is
+        reported as "ERROR" and the catalog is fetched again with the next batch.
+
+        Parameters
+        ----------
+        changes : list
+            File changes, see _next_batch.
+        callback : callable, optional
+            Function that is called with each result. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            self.sync_changes(changes, callback)
+        except Exception as error:  # pylint: disable=broad-except
+            self.catalog, self._refresh_catalog = None, True
+            if callback is not None:
+                for change in changes:
+                    callback(
+                        SyncResult(change.path, "ERROR", error=f"{type(error).__name__}: {error}")
+                    )
+
+    def _poll(self) -> None:
+        """Scan the directory periodically and notify the changed files (polling thread).
+
+        Returns
+        -------
+        None.
+
+        """
+        while not self._stopped.wait(self.poll_interval):
+            for change in self.scan():
+                self.notify(change.path, change.old_path)
+
+    def _start_observer(self) -> t.Any:
+        """Start a watchdog observer that notifies the changed files.
+
+        Returns
+        -------
+        watchdog.observers.Observer
+            Running observer.
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from watchdog.events import FileSystemEvent, FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _EventHandler(FileSystemEventHandler):
+            """Notify created, modified, moved and deleted files."""
+
+            def on_any_event(self, event: FileSystemEvent) -> None:
+                """Notify the file of an event (the destination and source of a move).
+
+                Parameters
+                ----------
+                event : FileSystemEvent
+                    File system event.
+
+                Returns
+                -------
+                None.
+
+                """
+                # Reading a file (e.g., by the synchronisation itself) emits "opened" and
+                # "closed_no_write" events, which are ignored
+                if event.is_directory or event.event_type not in _CHANGE_EVENTS:
+                    return
+                if event.event_type == "moved":
+                    watcher.notify(os.fsdecode(event.dest_path), os.fsdecode(event.src_path))
+                else:
+                    watcher.notify(os.fsdecode(event.src_path))
+
+        observer = Observer()
+        observer.schedule(_EventHandler(), str(self.directory), recursive=True)
+        observer.start()
+
+        return observer
+
+    def run(
+        self,
+        callback: t.Optional[t.Callable[[SyncResult], None]] = None,
+        initial: bool = False,
+    ) -> None:
+        """Watch the directory and synchronise the changed files until stop is called.
+
+        Parameters
+        ----------
+        callback : callable, optional
+            Function that is called with each result as soon as a file is done. The default is
+            None.
+        initial : bool, optional
+            Synchronise all files once at the start (unchanged files are skipped based on the
+            sync manifest). The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._stopped.clear()
+
+        # Start the change detection before the initial synchronisation, so no change is missed
+        observer = None
+        if self.use_watchdog:
+            observer = self._start_observer()
+        else:
+            self._stats = None
+            self.scan()
+            threading.Thread(target=self._poll, name="gistyc-watch-poll", daemon=True).start()
+
+        try:
+            if initial:
+                initial_batch = find_files(self.directory, self.suffixes)
+                self._sync_batch([FileChange("M", path) for path in initial_batch], callback)
+
+            while not self._stopped.is_set():
+                batch = self._next_batch()
+                if batch:
+                    self._sync_batch(batch, callback)
+        finally:
+            self.stop()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def stop(self) -> None:
+        """Stop watching (run returns after the current batch).
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            self._stopped.set()
+            self._condition.notify_all()
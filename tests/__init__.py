@@ -1,4 +1,15 @@
+from . import test_aio
+from . import test_blocks
+from . import test_cache
 from . import test_cli
 from . import test_gistyc
+from . import test_import
+from . import test_index
+from . import test_instrument
+from . import test_mirror
+from . import test_ratelimit
+from . import test_sync
+from . import test_testing
+from . import test_watch
 
 from . import _resources
\ No newline at end of file
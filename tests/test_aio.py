@@ -0,0 +1,171 @@
+"""Testing suite for the asyncio GISTyc client."""
+
+# Import standard libraries
+import asyncio
+import os
+
+# Import installed libraries
+import pytest
+
+# Import GISTyc
+import gistyc
+from gistyc.blocks import gist_body
+from gistyc.ratelimit import RateLimiter
+from gistyc.testing import FakeGistAPI
+
+# The asyncio client requires aiohttp
+pytest.importorskip("aiohttp")
+
+# First, set the file name paths to the sample.py for creating and update the GISTs.
+CORE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+CSAMPLE_FILE_NAME = 'sample.py'
+CSAMPLE_FILE_PATH = os.path.join(CORE_PATH, '_resources/create', CSAMPLE_FILE_NAME)
+
+USAMPLE_FILE_NAME = 'sample.py'
+USAMPLE_FILE_PATH = os.path.join(CORE_PATH, '_resources/update', USAMPLE_FILE_NAME)
+
+UDIR = os.path.join(CORE_PATH, "_resources/update_dir")
+
+
+def test_aio_create_update_delete():
+    """
+    Testing the creation, update (by file name) and deletion of a GIST with the asyncio client.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    async def _run(fake_api):
+
+        # Initiate the AsyncGISTyc class with the fake API
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        async with gistyc.AsyncGISTyc(
+            auth_token='token', api_url=fake_api.url, rate_limiter=rate_limiter
+        ) as gist_api:
+
+            # Create a GIST
+            response_create_data = await gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            assert 'sample.py' in response_create_data['files'].keys()
+
+            # Update the GIST based on the file's name
+            response_update_data = await gist_api.update_gist(file_name=USAMPLE_FILE_PATH)
+            assert response_update_data['updated_at'] > response_update_data['created_at']
+
+            # An unchanged GIST is not updated
+            assert await gist_api.diff_gist(file_name=USAMPLE_FILE_PATH) == {}
+
+            # Delete the GIST based on the file's name
+            assert await gist_api.delete_gist(file_name=USAMPLE_FILE_PATH) == 204
+            assert fake_api.gists == {}
+
+    with FakeGistAPI() as fake_api:
+        asyncio.run(_run(fake_api))
+
+
+def test_aio_gather():
+    """
+    Testing the concurrent creation and deletion of GISTs with asyncio.gather.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    async def _run(fake_api):
+
+        # Initiate the AsyncGISTyc class with a concurrency limit
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        async with gistyc.AsyncGISTyc(
+            auth_token='token', api_url=fake_api.url, concurrency=2, rate_limiter=rate_limiter
+        ) as gist_api:
+
+            # Create GISTs for all files of the update directory concurrently
+            file_names = [
+                os.path.join(UDIR, "sample2.py"),
+                os.path.join(UDIR, "sample1/sample1.py"),
+            ]
+            responses = await asyncio.gather(*[gist_api.create_gist(k) for k in file_names])
+            assert [sorted(k['files'])[0] for k in responses] == ['sample2.py', 'sample1.py']
+
+            # Delete the GISTs concurrently
+            status_codes = await asyncio.gather(
+                *[gist_api.delete_gist(gist_id=k['id']) for k in responses]
+            )
+            assert status_codes == [204, 204]
+
+    with FakeGistAPI() as fake_api:
+        asyncio.run(_run(fake_api))
+
+
+def test_aio_retry_n_force():
+    """
+    Testing the retry of server errors and secondary rate limits and the forced update.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    async def _run(fake_api, gist_id):
+        rate_limiter = RateLimiter(mutation_interval=0.0, backoff_base=0.01)
+        async with gistyc.AsyncGISTyc(
+            auth_token='token', api_url=fake_api.url, rate_limiter=rate_limiter
+        ) as gist_api:
+
+            # A server error and a secondary rate limit are retried
+            fake_api.fail_next(503)
+            fake_api.fail_next(403, {"Retry-After": "0"})
+            assert await gist_api.diff_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id) == {}
+            assert [call.status_code for call in fake_api.calls] == [503, 403, 200]
+            assert gist_api.rate_limit.retries == 2
+
+            # An unchanged GIST is only updated if forced
+            await gist_api.update_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id)
+            assert 'PATCH' not in [call.method for call in fake_api.calls]
+            response_data = await gist_api.update_gist(
+                file_name=CSAMPLE_FILE_PATH, gist_id=gist_id, force=True
+            )
+            assert sorted(response_data['files']) == ['sample.py', 'sample_1.py', 'sample_2.py']
+            assert [call.method for call in fake_api.calls].count('PATCH') == 1
+
+    with FakeGistAPI() as fake_api:
+        files = gist_body(CSAMPLE_FILE_PATH)['files']
+        gist_id = fake_api.add_gist({name: file['content'] for name, file in files.items()})
+        asyncio.run(_run(fake_api, gist_id))
+
+
+def test_aio_truncated_n_missing():
+    """
+    Testing that truncated files are compared with their complete (raw) contents and that a
+    missing GIST raises a GISTNotFoundError.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    async def _run(fake_api, gist_id):
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        async with gistyc.AsyncGISTyc(
+            auth_token='token', api_url=fake_api.url, rate_limiter=rate_limiter
+        ) as gist_api:
+
+            # The truncated files are fetched through their raw URLs and are unchanged
+            assert await gist_api.diff_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id) == {}
+            assert any(call.path.startswith('/raw/') for call in fake_api.calls)
+
+            # A deleted GIST raises an exception
+            del fake_api.gists[gist_id]
+            with pytest.raises(gistyc.GISTNotFoundError):
+                await gist_api.diff_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id)
+
+    with FakeGistAPI(truncate_size=8) as fake_api:
+        files = gist_body(CSAMPLE_FILE_PATH)['files']
+        gist_id = fake_api.add_gist({name: file['content'] for name, file in files.items()})
+        asyncio.run(_run(fake_api, gist_id))
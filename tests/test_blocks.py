@@ -0,0 +1,195 @@
+"""Testing suite for the streaming code block parser."""
+
+# Import standard libraries
+import io
+import json
+
+# Import GISTyc
+import gistyc
+from gistyc.blocks import (
+    BlockSplitter,
+    NotebookSplitter,
+    _JSONStream,
+    block_pattern,
+    diff_blocks,
+    find_files,
+    get_splitter,
+    gist_body,
+    iter_blocks,
+    register_splitter,
+)
+
+
+def test_iter_blocks(tmp_path):
+    """
+    Testing the code block streaming: separators with a title and Windows line endings.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a file with Windows line endings, a titled separator and an empty last block
+    file_name = tmp_path / "sample.py"
+    file_name.write_bytes(b"import time\r\n#%%\r\nx = 1\r\n#%% Print the time\r\nprint(x)\r\n#%%")
+
+    # Each block is yielded with its GIST file name
+    assert list(iter_blocks(file_name)) == [
+        ("sample.py", "import time\n"),
+        ("sample_1.py", "x = 1\n"),
+        ("sample_2.py", "print(x)\n"),
+        ("sample_3.py", ""),
+    ]
+
+    # The REST API body is built from the same blocks
+    files = gist_body(file_name)["files"]
+    assert files["sample_2.py"] == {"content": "print(x)\n"}
+
+    # Python files are split at the original "#%%" separator only; files are read as UTF-8
+    file_name.write_bytes("x = 'é'\n# %% Not a separator\n#%%\ny = 2\n".encode("utf-8"))
+    assert list(iter_blocks(file_name)) == [
+        ("sample.py", "x = 'é'\n# %% Not a separator\n"),
+        ("sample_1.py", "y = 2\n"),
+    ]
+
+
+def test_diff_blocks(tmp_path):
+    """
+    Testing the streamed comparison: only changed blocks are kept.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a file and set the remote GIST files (one block modified, one vanished)
+    file_name = tmp_path / "sample.py"
+    file_name.write_text("import time\n#%%\nprint(1)\n")
+    remote_files = {
+        "sample.py": {"content": "import time\n"},
+        "sample_1.py": {"content": "print(0)\n"},
+        "sample_2.py": {"content": "# TBD\n"},
+    }
+
+    changed_files = diff_blocks(iter_blocks(file_name), remote_files, "sample.py")
+    assert changed_files == {"sample_1.py": {"content": "print(1)\n"}, "sample_2.py": None}
+
+
+def test_splitter_registry(tmp_path):
+    """
+    Testing the dispatch of the code block splitters by the file suffix.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # SQL and R files use their own separator conventions
+    sql_file = tmp_path / "query.sql"
+    sql_file.write_text("SELECT 1;\n-- %% Second query\nSELECT 2;\n")
+    assert [content for _, content in iter_blocks(sql_file)] == ["SELECT 1;\n", "SELECT 2;\n"]
+
+    r_file = tmp_path / "plot.R"
+    r_file.write_text("x <- 1\n## ---- plot\nplot(x)\n")
+    assert [name for name, _ in iter_blocks(r_file)] == ["plot.R", "plot_1.R"]
+
+    # An explicit separator overrides the convention of the suffix
+    assert len(list(iter_blocks(sql_file, sep="SELECT"))) == 3
+
+    # Register a new language; the directory scan finds all registered suffixes
+    register_splitter(".lua", BlockSplitter("Lua", r"--\s?%%"))
+    try:
+        assert get_splitter("script.LUA").language == "Lua"
+        (tmp_path / "script.lua").write_text("print(1)\n")
+        (tmp_path / "notes.txt").write_text("Not a script\n")
+        found = sorted(path.name for path in find_files(tmp_path))
+        assert found == ["plot.R", "query.sql", "script.lua"]
+        assert [path.name for path in find_files(tmp_path, {".sql"})] == ["query.sql"]
+    finally:
+        del gistyc.blocks.SPLITTERS[".lua"]
+
+
+def test_notebook_splitter(tmp_path):
+    """
+    Testing the streamed notebook ingestion: code cells become code blocks, markdown cells and
+    outputs (e.g., images) are skipped.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a notebook with a markdown cell, an image output and a text output
+    notebook = {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": ["# Title\n", "Text"]},
+            {
+                "cell_type": "code",
+                "execution_count": 1,
+                "metadata": {},
+                "outputs": [
+                    {"output_type": "display_data", "data": {"image/png": "iVBOR" * 1000}},
+                    {"output_type": "stream", "name": "stdout", "text": ["1\n", "2\n"]},
+                ],
+                "source": ["import time\n", 'print("\\"{[")'],
+            },
+            {"cell_type": "code", "metadata": {}, "outputs": [], "source": "x = 1\n"},
+        ],
+        "metadata": {"kernelspec": {"language": "python"}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    file_name = tmp_path / "tutorial.ipynb"
+    file_name.write_text(json.dumps(notebook, indent=1))
+
+    # The code cells are named like the code blocks of a script (small buffers test the chunking)
+    expected = [
+        ("tutorial.ipynb.py", 'import time\nprint("\\"{[")\n'),
+        ("tutorial.ipynb_1.py", "x = 1\n"),
+    ]
+    assert list(iter_blocks(file_name)) == expected
+    assert list(NotebookSplitter().iter_blocks(file_name, buffer_size=7)) == expected
+    assert gistyc.blocks.gist_file_name(file_name) == "tutorial.ipynb.py"
+
+    # A notebook and a script of the same name do not collide
+    (tmp_path / "tutorial.py").write_text("import time\n#%%\nx = 2\n")
+    script_blocks = [name for name, _ in iter_blocks(tmp_path / "tutorial.py")]
+    assert script_blocks == ["tutorial.py", "tutorial_1.py"]
+    assert not set(script_blocks) & {name for name, _ in iter_blocks(file_name)}
+    assert not block_pattern("tutorial.py").fullmatch("tutorial.ipynb_1.py")
+    assert not block_pattern("tutorial.ipynb.py").fullmatch("tutorial_1.py")
+
+    # Text outputs can be kept as comments
+    blocks = list(NotebookSplitter(strip_outputs=False).iter_blocks(file_name, buffer_size=5))
+    assert blocks[0][1] == 'import time\nprint("\\"{[")\n# 1\n# 2\n'
+
+
+def test_json_stream_large_value():
+    """
+    Testing that a value that spans many chunks is decoded with few (growing) reads.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    class _CountingIO(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    source = ["x = 1\n" * 100_000, 'print("\\"{[")\n']
+    file_obj = _CountingIO(json.dumps({"source": source, "execution_count": 12345}))
+    stream = _JSONStream(file_obj, buffer_size=7)
+    assert {key: stream.decode() for key in stream.iter_object()} == {
+        "source": source,
+        "execution_count": 12345,
+    }
+    assert file_obj.reads < 100
@@ -0,0 +1,79 @@
+"""Testing suite for the content cache of single GISTs."""
+
+# Import GISTyc
+from gistyc.cache import GISTContentCache, gist_revision
+
+
+def _gist(gist_id, revision, content):
+    """Create a minimal single GIST response."""
+    return {
+        "id": gist_id,
+        "history": [{"version": revision}],
+        "files": {"sample.py": {"filename": "sample.py", "content": content}},
+    }
+
+
+def test_content_cache(tmp_path):
+    """
+    Testing the LRU memory cache, the disk cache and the latest revision of a GIST.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The revision is the latest history version
+    assert gist_revision(_gist("a", "r1", "")) == "r1"
+    assert gist_revision({"id": "a"}) is None
+
+    # Memory only: the least recently used entry is evicted
+    content_cache = GISTContentCache(max_entries=2)
+    content_cache.put(_gist("a", "r1", "import time\n"), etag='"r1"')
+    content_cache.put(_gist("b", "r1", "import os\n"))
+    assert content_cache.get("a", "r1")["files"]["sample.py"]["content"] == "import time\n"
+    content_cache.put(_gist("c", "r1", "import re\n"))
+    assert content_cache.get("b", "r1") is None
+    assert content_cache.latest("a") == ("r1", '"r1"')
+
+    # Older revisions do not replace the latest revision
+    content_cache.put(_gist("a", "r0", "import sys\n"), latest=False)
+    assert content_cache.latest("a") == ("r1", '"r1"')
+
+    # Disk cache: the entries survive a new cache instance
+    content_cache = GISTContentCache(tmp_path, max_entries=1)
+    content_cache.put(_gist("a", "r2", "import time\n"), etag='"r2"')
+    content_cache.put_content("a", "r2", "big/file.py", "x" * 100)
+    content_cache = GISTContentCache(tmp_path)
+    assert content_cache.latest("a") == ("r2", '"r2"')
+    assert content_cache.get("a", "r2")["id"] == "a"
+    assert content_cache.get_content("a", "r2", "big/file.py") == "x" * 100
+    assert content_cache.get_content("a", "r1", "big/file.py") is None
+
+
+def test_content_cache_eviction(tmp_path):
+    """
+    Testing that a new latest revision removes the older revisions of a GIST from the disk and
+    that a removed GIST leaves no files.
+
+    Returns
+    -------
+    None.
+
+    """
+    content_cache = GISTContentCache(tmp_path)
+    content_cache.put(_gist("a", "r1", "import time\n"), etag='"r1"')
+    content_cache.put_content("a", "r1", "big.py", "x" * 100)
+    content_cache.put(_gist("a", "r0", "import os\n"), latest=False)
+
+    # The new latest revision replaces all older revisions (and their contents) on disk
+    content_cache.put(_gist("a", "r2", "import sys\n"), etag='"r2"')
+    assert sorted(path.name for path in (tmp_path / "a").iterdir()) == ["latest.json", "r2.json"]
+    assert GISTContentCache(tmp_path).get("a", "r1") is None
+    assert content_cache.get("a", "r2")["files"]["sample.py"]["content"] == "import sys\n"
+
+    # A removed GIST is dropped from memory and disk
+    content_cache.remove("a")
+    assert content_cache.latest("a") is None
+    assert content_cache.get("a", "r2") is None
+    assert not (tmp_path / "a").exists()
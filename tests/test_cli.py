@@ -2,6 +2,7 @@
 
 # Import standard libraries
 import ast
+import json
 import os
 import pathlib
 import time
@@ -11,6 +12,7 @@ from click.testing import CliRunner
 
 # Import GISTyc
 import gistyc
+from gistyc.testing import FakeGistAPI
 
 # First, set the file name paths to the sample.py for creating and update the GISTs.
 CORE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -249,3 +251,91 @@ def test_cli_dir_run():
         runner.invoke(
             gistyc.cli.run, ["--delete", "--auth-token", AUTH_TOKEN, "--file-name", python_filename]
         )
+
+
+def test_cli_stats(tmp_path):
+    """Testing the request statistics of the CLI routines.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create a GIST and write the statistics as JSON
+    runner = CliRunner()
+    stats_path = tmp_path / "stats.json"
+    with FakeGistAPI() as fake_api:
+        args = ["--auth-token", "token", "--no-cache", "--api-url", fake_api.url]
+        result = runner.invoke(
+            gistyc.cli.run,
+            ["--create", "--file-name", CSAMPLE_FILE_PATH, "--stats-json", str(stats_path)] + args,
+        )
+        assert result.exit_code == 0
+        stats = json.loads(stats_path.read_text())
+        assert stats["requests"] == 1
+        assert stats["endpoints"]["POST /gists"]["status_codes"] == {"201": 1}
+        assert stats["files"]["parse"] == 1
+        assert stats["bytes_sent"] > 0 and stats["bytes_received"] > 0
+
+        # Delete the GIST and print the summary
+        gist_id = ast.literal_eval(result.output)["id"]
+        result = runner.invoke(gistyc.cli.run, ["--delete", "--gist-id", gist_id, "--stats"] + args)
+        assert result.exit_code == 0
+        assert "DELETE /gists/{gist_id}" in result.output
+        assert fake_api.gists == {}
+
+
+def test_cli_update_unchanged():
+    """Testing that an update without changes is reported as unchanged (and not sent).
+
+    Returns
+    -------
+    None.
+
+    """
+    runner = CliRunner()
+    with FakeGistAPI() as fake_api:
+        gist_id = fake_api.add_gist(
+            {"sample.py": "import time\n", "sample_1.py": "time.sleep(1)\n"}
+        )
+        args = ["--update", "--auth-token", "token", "--file-name", CSAMPLE_FILE_PATH]
+        args += ["--gist-id", gist_id, "--no-cache", "--api-url", fake_api.url]
+
+        # The first update sends the changed code blocks, the second one nothing
+        result = runner.invoke(gistyc.cli.run, args)
+        assert result.exit_code == 0
+        assert ast.literal_eval(result.output)["id"] == gist_id
+        result = runner.invoke(gistyc.cli.run, args)
+        assert result.exit_code == 0
+        assert result.output == f"UNCHANGED {CSAMPLE_FILE_PATH} (GIST {gist_id})\n"
+        assert [call.method for call in fake_api.calls].count("PATCH") == 1
+
+
+def test_cli_dir_run_suffixes(tmp_path):
+    """Testing that gistyc_dir syncs Python files by default and other languages on request.
+
+    Returns
+    -------
+    None.
+
+    """
+    (tmp_path / "query.py").write_text("A = 1\n")
+    (tmp_path / "query.sql").write_text("SELECT 1;\n")
+    runner = CliRunner()
+    with FakeGistAPI() as fake_api:
+        args = ["--auth-token", "token", "--directory", str(tmp_path), "--no-cache"]
+        args += ["--api-url", fake_api.url, "--mutation-interval", "0"]
+
+        # Only the Python file is synced by default
+        result = runner.invoke(gistyc.cli.dir_run, args)
+        assert result.exit_code == 0
+        assert [list(gist["files"]) for gist in fake_api.gists.values()] == [["query.py"]]
+
+        # Other languages are opt-in
+        result = runner.invoke(gistyc.cli.dir_run, args + ["--suffix", "sql"])
+        assert result.exit_code == 0
+        assert sorted(name for gist in fake_api.gists.values() for name in gist["files"]) == [
+            "query.py",
+            "query.sql",
+        ]
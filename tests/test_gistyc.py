@@ -2,13 +2,18 @@
 
 # Import standard libraries
 import os
+import pathlib
 import time
 
 # Import installed libraries
 import pytest
+import requests
 
 # Import GISTyc
 import gistyc
+from gistyc.blocks import diff_files
+from gistyc.ratelimit import RateLimiter
+from gistyc.testing import FakeGistAPI, assert_max_calls
 
 # First, set the file name paths to the sample.py for creating and update the GISTs.
 CORE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +24,8 @@ CSAMPLE_FILE_PATH = os.path.join(CORE_PATH, '_resources/create', CSAMPLE_FILE_NA
 USAMPLE_FILE_NAME = 'sample.py'
 USAMPLE_FILE_PATH = os.path.join(CORE_PATH, '_resources/update', USAMPLE_FILE_NAME)
 
+SAMPLE2_FILE_PATH = os.path.join(CORE_PATH, '_resources/update_dir', 'sample2.py')
+
 # Get the GIST authentication token from the system environment
 AUTH_TOKEN = os.environ['GIST_TOKEN']
 
@@ -91,8 +98,9 @@ def test_gistyc_create_n_update():
     # Wait a second
     time.sleep(1)
 
-    # Update the GIST with the updated sample file (update is based on the file's name)
-    response_update_data = gist_api.update_gist(file_name=USAMPLE_FILE_PATH)
+    # Update the GIST with the updated sample file (update is based on the file's name). The
+    # content is unchanged, so the update must be forced
+    response_update_data = gist_api.update_gist(file_name=USAMPLE_FILE_PATH, force=True)
 
     # Check whether the update date time is larger, respectively "more recent" than the creation
     # date time
@@ -186,3 +194,395 @@ def test_gistyc_clean_ambiguous():
         if CSAMPLE_FILE_NAME in k['files']:
             response_data = gist_api.delete_gist(gist_id=k['id'])
             assert response_data == 204
+
+
+def test_gistyc_session_context():
+    """
+    Testing the pooled HTTP session: all calls share one session that is closed by the context
+    manager.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with FakeGistAPI() as fake_api:
+
+        # Initiate the GISTyc class as a context manager with a small connection pool
+        with gistyc.GISTyc('token', api_url=fake_api.url, pool_size=2, timeout=30.0,
+                           rate_limiter=RateLimiter(mutation_interval=0.0)) as gist_api:
+
+            # Create and delete a GIST through the same session
+            response_data = gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            assert 'sample.py' in response_data['files'].keys()
+
+            response_data = gist_api.delete_gist(gist_id=response_data['id'])
+            assert response_data == 204
+
+        # An injected session must not be closed by GISTyc
+        closed = []
+        session = requests.Session()
+        session.close = lambda: closed.append(True)
+        with gistyc.GISTyc('token', api_url=fake_api.url, session=session) as gist_api:
+            assert gist_api.session is session
+        assert not closed
+
+
+def test_gistyc_get_gists_concurrent():
+    """
+    Testing the concurrent pagination of the GIST listing. The order of the GISTs must not depend
+    on the number of workers.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Serve a listing of several pages
+    with FakeGistAPI() as fake_api:
+        fake_api.add_gists(250)
+        with gistyc.GISTyc('token', api_url=fake_api.url) as gist_api:
+
+            # Get the listing sequentially and concurrently
+            sequential_ids = [k['id'] for k in gist_api.get_gists(max_workers=1)]
+            concurrent_ids = [k['id'] for k in gist_api.get_gists(max_workers=8)]
+
+    assert sequential_ids == concurrent_ids
+    assert len(set(concurrent_ids)) == len(concurrent_ids) == 250
+
+
+def test_gistyc_index(tmp_path):
+    """
+    Testing the persistent GIST index: the GISTs are looked up in the index that is revalidated
+    and updated after each call.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with FakeGistAPI() as fake_api:
+        fake_api.add_gist({'other.py': 'import os\n'})
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+
+        # Initiate the GISTyc class with a persistent index
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path,
+                           rate_limiter=rate_limiter) as gist_api:
+
+            # Create a GIST; it is added to the index
+            response_create_data = gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            assert response_create_data['id'] in \
+                [k['id'] for k in gist_api.index.lookup(CSAMPLE_FILE_NAME)]
+
+        # A second instance uses the stored index; the listing is identical to a non-indexed one
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path,
+                           rate_limiter=rate_limiter) as gist_api:
+            indexed_ids = [k['id'] for k in gist_api.get_gists()]
+            with gistyc.GISTyc('token', api_url=fake_api.url) as other_api:
+                assert indexed_ids == [k['id'] for k in other_api.get_gists()]
+
+            # Update the GIST based on the file name and delete it
+            response_update_data = gist_api.update_gist(file_name=USAMPLE_FILE_PATH)
+            assert response_update_data['id'] == response_create_data['id']
+
+            response_data = gist_api.delete_gist(gist_id=response_update_data['id'])
+            assert response_data == 204
+            assert gist_api.index.lookup(CSAMPLE_FILE_NAME) == []
+
+
+def test_gistyc_catalog():
+    """
+    Testing the GIST catalog: hash-based file name look-ups and ambiguity detection.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build a catalog from a listing with a file name that is present in two GISTs
+    gist_catalog = gistyc.GISTCatalog(
+        [
+            {'id': 'a', 'files': {'sample.py': {}, 'sample_1.py': {}}},
+            {'id': 'b', 'files': {'sample.py': {}}},
+            {'id': 'c', 'files': {'other.py': {}}},
+        ]
+    )
+
+    # Check the look-ups in both directions
+    assert len(gist_catalog) == 3
+    assert 'sample_1.py' in gist_catalog
+    assert 'unknown.py' not in gist_catalog
+    assert gist_catalog.gist_ids('sample.py') == ['a', 'b']
+    assert gist_catalog.files('a') == ['sample.py', 'sample_1.py']
+
+    # The ambiguity is detected while building the catalog
+    assert gist_catalog.ambiguous == {'sample.py': ['a', 'b']}
+
+    # Removing a GIST resolves the ambiguity; updating a GIST replaces its files
+    gist_catalog.remove('b')
+    assert gist_catalog.ambiguous == {}
+    gist_catalog.add({'id': 'a', 'files': {'sample.py': {}}})
+    assert 'sample_1.py' not in gist_catalog
+
+
+def test_gistyc_update_unchanged():
+    """
+    Testing the content-hash based skip of unchanged GISTs. Only changed code blocks are sent.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with FakeGistAPI() as fake_api:
+
+        # Initiate the GISTyc class with the fake API
+        with gistyc.GISTyc('token', api_url=fake_api.url,
+                           rate_limiter=RateLimiter(mutation_interval=0.0)) as gist_api:
+
+            # Create a GIST
+            response_create_data = gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            gist_id = response_create_data['id']
+
+            # The GIST is identical to the creation sample file: no update is sent
+            assert gist_api.diff_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id) == {}
+            response_update_data = gist_api.update_gist(file_name=CSAMPLE_FILE_PATH,
+                                                        gist_id=gist_id)
+            assert response_update_data['updated_at'] == response_create_data['updated_at']
+
+            # The update sample file differs in all code blocks
+            changed_files = gist_api.diff_gist(file_name=USAMPLE_FILE_PATH, gist_id=gist_id)
+            assert set(changed_files) == {'sample.py', 'sample_1.py', 'sample_2.py'}
+
+            # Delete the GIST
+            response_data = gist_api.delete_gist(gist_id=gist_id)
+            assert response_data == 204
+
+
+def test_gistyc_diff_files():
+    """
+    Testing the minimal update request body: only added / modified code blocks are sent and
+    vanished code blocks are deleted (None). Other files of the GIST are kept.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Set the remote GIST files and the local code blocks (one block less, one block modified)
+    remote_files = {
+        'sample.py': {'content': 'import time\n'},
+        'sample_1.py': {'content': 'print(time.time())\n'},
+        'sample_2.py': {'content': '# TBD\n'},
+        'README.md': {'content': 'Not a code block'},
+    }
+    local_files = {
+        'sample.py': {'content': 'import time\n'},
+        'sample_1.py': {'content': 'print(time.time() + 1)\n'},
+    }
+
+    # Build the files of the update request body
+    changed_files = diff_files(local_files, remote_files, 'sample.py')
+    assert changed_files == {'sample_1.py': {'content': 'print(time.time() + 1)\n'},
+                             'sample_2.py': None}
+
+    # Nothing to send if the files are identical
+    remote_files = {**local_files, 'README.md': {'content': 'Not a code block'}}
+    assert diff_files(local_files, remote_files, 'sample.py') == {}
+
+
+def test_gistyc_get_gist():
+    """
+    Testing the single GIST fetch: an unchanged GIST is revalidated (304) from the content cache,
+    a known revision needs no REST API call and truncated contents are fetched lazily.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with FakeGistAPI() as fake_api:
+
+        # Initiate the GISTyc class with the fake API
+        with gistyc.GISTyc('token', api_url=fake_api.url,
+                           rate_limiter=RateLimiter(mutation_interval=0.0)) as gist_api:
+
+            # Create a GIST (the response is cached)
+            response_create_data = gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            gist_id = response_create_data['id']
+            revision = response_create_data['history'][0]['version']
+
+            # A known revision is served from the cache
+            with gist_api.measure() as stats:
+                assert gist_api.get_gist(gist_id, revision)['id'] == gist_id
+            assert stats.requests == 0
+
+            # The latest revision is revalidated; the second fetch is answered with 304
+            gist_data = gist_api.get_gist(gist_id)
+            with gist_api.measure() as stats:
+                assert gist_api.get_gist(gist_id) == gist_data
+            assert stats.requests == 1 and stats.status_code == 304
+
+            # A truncated content is fetched through its raw URL (once per revision)
+            cached_file = gist_api.content_cache.get(gist_id, revision)['files']['sample.py']
+            content = cached_file['content']
+            cached_file.update(content='', truncated=True)
+            with gist_api.measure() as stats:
+                assert gist_api.get_file_content(gist_id, 'sample.py') == content
+                assert gist_api.get_file_content(gist_id, 'sample.py') == content
+            assert stats.requests == 3
+            assert gist_api.get_file_content(gist_id, 'unknown.py') is None
+
+            # Delete the GIST
+            response_data = gist_api.delete_gist(gist_id=gist_id)
+            assert response_data == 204
+
+
+def test_gistyc_download_gist(tmp_path):
+    """
+    Testing the download of a GIST to disk: complete contents are written directly, truncated
+    contents are streamed through their raw URL.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Listing entries have no content; large files are truncated
+    assert gistyc.GISTyc.is_truncated({'size': 2 << 20})
+    assert not gistyc.GISTyc.is_truncated({'size': 10})
+    assert gistyc.GISTyc.is_truncated({'content': '', 'truncated': True})
+    assert not gistyc.GISTyc.is_truncated({'content': 'import time\n', 'truncated': False})
+
+    with FakeGistAPI() as fake_api:
+
+        # Initiate the GISTyc class with the fake API and a disk cache
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path / 'cache',
+                           rate_limiter=RateLimiter(mutation_interval=0.0)) as gist_api:
+
+            # Create and fetch a GIST and mark a file as truncated
+            response_create_data = gist_api.create_gist(file_name=CSAMPLE_FILE_PATH)
+            gist_id = response_create_data['id']
+            cached_file = gist_api.get_gist(gist_id)['files']['sample.py']
+            content = cached_file['content']
+            cached_file.update(content='', truncated=True)
+
+            # Download a truncated file: one revalidation and one raw download
+            with gist_api.measure() as stats:
+                target_path = gist_api.download_file(gist_id, 'sample.py', tmp_path / 'sample.py')
+            assert stats.requests == 2
+            assert target_path.read_text(encoding='utf-8') == content
+
+            # Download all files (concurrently)
+            target_paths = gist_api.download_gist(gist_id, tmp_path / 'gist')
+            assert sorted(target_paths) == sorted(response_create_data['files'])
+            assert target_paths['sample.py'].read_text(encoding='utf-8') == content
+            sample_1 = response_create_data['files']['sample_1.py']['content']
+            assert target_paths['sample_1.py'].read_text(encoding='utf-8') == sample_1
+            assert not list((tmp_path / 'gist').glob('*.part'))
+
+            # Delete the GIST
+            response_data = gist_api.delete_gist(gist_id=gist_id)
+            assert response_data == 204
+
+
+def test_gistyc_index_lookup(tmp_path):
+    """
+    Testing the GIST ID look-up by file name with the persistent index: each instance revalidates
+    the index once, so a stale index neither hides new GISTs nor ambiguous file names. Unknown
+    file names raise a GISTNotFoundError.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+        gist_id = fake_api.add_gist({'sample.py': 'import time\n'})
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+
+        # The first look-up fills the index with the listing
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path,
+                           rate_limiter=rate_limiter) as gist_api:
+            with assert_max_calls(gist_api, 1, 'GET /gists'):
+                assert gist_api._get_gist_id(file_name=pathlib.Path('sample.py')) == gist_id
+
+        # A second instance revalidates the index once (conditional request)
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path,
+                           rate_limiter=rate_limiter) as gist_api:
+            with assert_max_calls(gist_api, 1, 'GET /gists'):
+                response_data = gist_api.update_gist(file_name=USAMPLE_FILE_PATH)
+            assert response_data['id'] == gist_id
+
+            # A GIST created elsewhere is found by refreshing the catalog
+            other_id = fake_api.add_gist({'other.py': 'import os\n'})
+            with assert_max_calls(gist_api, 1, 'GET /gists'):
+                assert gist_api._get_gist_id(file_name=pathlib.Path('other.py')) == other_id
+
+            # An unknown file name raises a descriptive exception
+            with pytest.raises(gistyc.GISTNotFoundError, match='unknown.py'):
+                gist_api._get_gist_id(file_name=pathlib.Path('unknown.py'))
+
+        # A second GIST with the same file name is detected, although the index is stale
+        fake_api.add_gist({'sample.py': 'import sys\n'})
+        with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=tmp_path,
+                           rate_limiter=rate_limiter) as gist_api:
+            with pytest.raises(gistyc.GISTAmbiguityError):
+                gist_api._get_gist_id(file_name=pathlib.Path('sample.py'))
+
+
+def test_gistyc_catalog_cache():
+    """
+    Testing that the catalog is listed once and kept up to date by create, update and delete.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+        gist_id = fake_api.add_gist({'sample.py': 'import time\n'})
+        with gistyc.GISTyc('token', api_url=fake_api.url,
+                           rate_limiter=RateLimiter(mutation_interval=0.0)) as gist_api:
+            with assert_max_calls(gist_api, 1, 'GET /gists'):
+
+                # Several updates by file name share a single listing
+                assert gist_api.update_gist(file_name=USAMPLE_FILE_PATH)['id'] == gist_id
+                assert gist_api.update_gist(file_name=CSAMPLE_FILE_PATH)['id'] == gist_id
+
+                # Created and deleted GISTs are added to / removed from the cached catalog
+                new_id = gist_api.create_gist(file_name=SAMPLE2_FILE_PATH)['id']
+                assert gist_api.get_catalog().gist_ids('sample2.py') == [new_id]
+                assert gist_api.delete_gist(file_name=SAMPLE2_FILE_PATH) == 204
+                assert 'sample2.py' not in gist_api.get_catalog()
+
+            # A refresh lists the GISTs again, e.g., to find GISTs created elsewhere
+            other_id = fake_api.add_gist({'other.py': 'import os\n'})
+            assert gist_api.get_catalog(refresh=True).gist_ids('other.py') == [other_id]
+
+
+def test_gistyc_measure_pool(tmp_path):
+    """
+    Testing that a measurement includes the listing pages that are fetched by pool workers.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI(max_per_page=10) as fake_api:
+        fake_api.add_gists(25)
+        for cache_dir in (None, tmp_path):
+            with gistyc.GISTyc('token', api_url=fake_api.url, cache_dir=cache_dir) as gist_api:
+                with gist_api.measure() as stats:
+                    assert len(gist_api.get_gists()) == 25
+                assert stats.requests == 3
+                assert stats.status_code == 200
@@ -0,0 +1,97 @@
+"""Testing suite for the lazy package import and the CLI startup time."""
+
+# Import standard libraries
+import subprocess
+import sys
+
+# Import GISTyc
+import gistyc
+from gistyc.testing import import_time
+
+# Import time budgets in seconds (fastest of several fresh interpreters)
+IMPORT_BUDGET = 0.05
+CLI_IMPORT_BUDGET = 0.3
+
+
+def _loaded_modules(statement):
+    """
+    Get the heavy dependencies that are loaded after a statement (in a fresh interpreter).
+
+    Parameters
+    ----------
+    statement : str
+        Python statement.
+
+    Returns
+    -------
+    list
+        Loaded modules out of requests, urllib3, aiohttp, watchdog and click.
+
+    """
+    check = (
+        "import sys; print('LOADED', ','.join(module for module in "
+        "('requests', 'urllib3', 'aiohttp', 'watchdog', 'click') if module in sys.modules))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", f"{statement}; {check}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    loaded = process.stdout.strip().splitlines()[-1].split("LOADED", 1)[1]
+
+    return [module for module in loaded.strip().split(",") if module]
+
+
+def test_lazy_import():
+    """
+    Testing that the heavy dependencies are imported on first use only.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Neither the package nor the CLI (including --help) import the HTTP clients
+    assert _loaded_modules("import gistyc") == []
+    assert _loaded_modules("import gistyc.cli") == ["click"]
+    assert _loaded_modules(
+        "from gistyc.cli import dir_run; dir_run.main(['--help'], standalone_mode=False)"
+    ) == ["click"]
+
+    # The CLI imports the client, the engines and the instrumentation in its commands only
+    check = (
+        "import sys; print(','.join(sorted(module for module in sys.modules "
+        "if module.startswith('gistyc.'))))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", f"import gistyc.cli; {check}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert process.stdout.strip() == "gistyc.blocks,gistyc.cli"
+
+    # The HTTP session is created by the first request
+    assert _loaded_modules("import gistyc; gistyc.GISTyc('token')") == []
+    assert "requests" in _loaded_modules("import gistyc; gistyc.GISTyc('token').session")
+
+    # The public names are resolved on first access
+    assert "AsyncGISTyc" in dir(gistyc)
+    assert gistyc.SyncEngine is gistyc.sync.SyncEngine
+    assert gistyc.cli.dir_run is not None
+
+
+def test_import_time():
+    """
+    Testing the import time budgets of the package and the CLI.
+
+    Returns
+    -------
+    None.
+
+    """
+    assert import_time("import gistyc")["gistyc"] < IMPORT_BUDGET
+    assert import_time("import gistyc.cli")["gistyc.cli"] < CLI_IMPORT_BUDGET
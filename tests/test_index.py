@@ -0,0 +1,116 @@
+"""Testing suite for the persistent GIST index."""
+
+# Import GISTyc
+from gistyc.index import GISTIndex, ManifestEntry
+
+
+def _gist(gist_id, *file_names):
+    """Create a minimal GIST listing entry."""
+    return {
+        "id": gist_id,
+        "description": f"GIST {gist_id}",
+        "updated_at": "2021-01-01T00:00:00Z",
+        "files": {file_name: {"filename": file_name} for file_name in file_names},
+    }
+
+
+def test_index_pages_n_lookup(tmp_path):
+    """
+    Testing the storage of listing pages and the derived file name look-up.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create an index and store two pages
+    index = GISTIndex(tmp_path / "index.sqlite")
+    index.store_pages(
+        {1: ('"etag1"', [_gist("a", "sample.py", "sample_1.py")]), 2: ('"etag2"', [_gist("b")])},
+        last_page=2,
+    )
+
+    # Check the stored pages and ETags
+    assert index.page_count() == 2
+    assert index.page_etag(1) == '"etag1"'
+    assert index.get_page(2)[0]["id"] == "b"
+
+    # Check the file name look-up
+    assert [k["id"] for k in index.lookup("sample_1.py")] == ["a"]
+    assert index.lookup("unknown.py") == []
+
+    # Shrinking the listing removes the pages behind the last page
+    index.store_pages({1: ('"etag3"', [_gist("a", "sample.py")])}, last_page=1)
+    assert index.page_count() == 1
+    assert index.lookup("sample_1.py") == []
+    index.close()
+
+    # The index is persistent
+    index = GISTIndex(tmp_path / "index.sqlite")
+    assert index.page_etag(1) == '"etag3"'
+    index.close()
+
+
+def test_index_upsert_n_remove(tmp_path):
+    """
+    Testing the update of the index after creating, updating and deleting GISTs.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create an index for a token
+    index = GISTIndex.for_token("token", cache_dir=tmp_path)
+    assert "token" not in index.path.name
+
+    # Each API URL (e.g., of a GitHub Enterprise server) has its own index
+    enterprise_url = "https://github.example.com/api/v3"
+    assert GISTIndex.for_token("token", tmp_path, api_url=enterprise_url).path != index.path
+
+    # Created / updated GISTs are added; a same-name file makes the look-up ambiguous
+    index.upsert_gist(_gist("a", "sample.py"))
+    index.upsert_gist(_gist("b", "sample.py", "other.py"))
+    assert [k["id"] for k in index.lookup("sample.py")] == ["b", "a"]
+
+    # Updating a GIST replaces its files
+    index.upsert_gist(_gist("b", "other.py"))
+    assert [k["id"] for k in index.lookup("sample.py")] == ["a"]
+
+    # Deleted GISTs are removed
+    index.remove_gist("a")
+    assert index.lookup("sample.py") == []
+    index.close()
+
+
+def test_index_manifest(tmp_path):
+    """
+    Testing the storage of the sync manifest.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create an index and store two manifest entries
+    index = GISTIndex(tmp_path / "index.sqlite")
+    entries = [
+        ManifestEntry("/a/sample.py", 1, 10, "hash1", "a", "rev1"),
+        ManifestEntry("/a/other.py", 2, 20, "hash2", "b"),
+    ]
+    index.store_manifest(entries)
+
+    # Get the entries of known and unknown files
+    manifest = index.get_manifest(["/a/sample.py", "/a/other.py", "/a/unknown.py"])
+    assert manifest == {entry.path: entry for entry in entries}
+
+    # Replace and remove entries
+    index.store_manifest([ManifestEntry("/a/sample.py", 3, 30, "hash3", "a", "rev2")])
+    index.remove_manifest(["/a/other.py"])
+    manifest = index.get_manifest(["/a/sample.py", "/a/other.py"])
+    assert list(manifest) == ["/a/sample.py"]
+    assert manifest["/a/sample.py"].revision == "rev2"
+    index.close()
@@ -0,0 +1,92 @@
+"""Testing suite for the instrumentation events and the statistics collector."""
+
+# Import GISTyc
+from gistyc.instrument import CallLog, GISTEvent, StatsCollector, endpoint_name
+
+
+def test_endpoint_name():
+    """
+    Testing the aggregation of request URLs to endpoints.
+
+    Returns
+    -------
+    None.
+
+    """
+    assert endpoint_name("GET", "/gists?page=2&per_page=100") == "GET /gists"
+    assert endpoint_name("PATCH", "https://api.github.com/gists/abc123") == "PATCH /gists/{gist_id}"
+    assert endpoint_name("GET", f"/gists/abc123/{'a' * 40}") == "GET /gists/{gist_id}/{revision}"
+    assert endpoint_name("GET", "/gists/starred") == "GET /gists/starred"
+    assert endpoint_name("GET", "https://gist.githubusercontent.com/u/abc/raw/x.py") == "GET raw"
+
+    # The path prefix of a GitHub Enterprise API URL is removed
+    enterprise_url = "https://github.example.com/api/v3"
+    assert endpoint_name("GET", f"{enterprise_url}/gists?page=2") == "GET /gists"
+    assert endpoint_name("DELETE", f"{enterprise_url}/gists/abc123") == "DELETE /gists/{gist_id}"
+    assert endpoint_name("GET", f"{enterprise_url}/gists/abc/{'a' * 40}") == (
+        "GET /gists/{gist_id}/{revision}"
+    )
+    assert endpoint_name("GET", "https://github.example.com/gist/u/abc/raw/x.py") == "GET raw"
+
+
+def test_stats_collector():
+    """
+    Testing the aggregated statistics of the collector.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Add request, page, parse and cache events
+    stats = StatsCollector()
+    stats(GISTEvent("request", "GET /gists", 0.02, bytes_received=100, status_code=200))
+    stats(GISTEvent("request", "GET /gists", 3.0, status_code=304, retry=True))
+    stats(GISTEvent("request", "POST /gists", 0.2, bytes_sent=50, status_code=201))
+    stats(GISTEvent("page", "1", hit=True))
+    stats(GISTEvent("page", "2", hit=False))
+    stats(GISTEvent("parse", "sample.py", 0.5))
+    stats(GISTEvent("cache", "gist", hit=True))
+    stats(GISTEvent("cache", "content", hit=False))
+
+    # Check the totals and the histogram of an endpoint
+    stats_dict = stats.to_dict()
+    assert stats.requests == stats_dict["requests"] == 3
+    assert (stats_dict["bytes_sent"], stats_dict["bytes_received"]) == (50, 100)
+    assert stats_dict["retries"] == 1
+    assert stats_dict["pages"] == {"fetched": 1, "not_modified": 1}
+    assert stats_dict["files"] == {"parse": 1, "diff": 0}
+    assert stats_dict["cache"] == {"hits": 1, "misses": 1}
+    listing = stats_dict["endpoints"]["GET /gists"]
+    assert listing["status_codes"] == {"200": 1, "304": 1}
+    assert listing["histogram"]["<=25ms"] == 1 and listing["histogram"]["<=5000ms"] == 1
+
+    # The summary has a line per endpoint
+    assert "POST /gists" in stats.summary().splitlines()[-1]
+
+
+def test_call_log():
+    """
+    Testing the trace of the call log.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Only request events are recorded
+    call_log = CallLog()
+    call_log(GISTEvent("request", "GET /gists", 0.01, status_code=200, url="http://x/gists?page=1"))
+    call_log(GISTEvent("request", "PATCH /gists/{gist_id}", bytes_sent=10, url="http://x/gists/1"))
+    call_log(GISTEvent("request", "GET /gists", status_code=304, url="http://x/gists?page=1"))
+    call_log(GISTEvent("cache", "gist", hit=True))
+    assert len(call_log) == 3
+    assert call_log.count("GET /gists") == 2 and call_log.count("PATCH") == 1
+    assert call_log.endpoints() == {"GET /gists": 2, "PATCH /gists/{gist_id}": 1}
+
+    # The trace has a line per call
+    assert call_log.format().splitlines()[1] == "PATCH http://x/gists/1 None 10/0 bytes 0.0 ms"
+    call_log.clear()
+    assert call_log.count() == 0
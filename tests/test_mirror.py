@@ -0,0 +1,152 @@
+"""Testing suite for the GIST mirror."""
+
+# Import standard libraries
+import os
+import pathlib
+
+# Import installed libraries
+from click.testing import CliRunner
+
+# Import GISTyc
+import gistyc
+from gistyc.blocks import get_splitter, gist_body
+from gistyc.mirror import GISTMirror, group_gist_files
+from gistyc.ratelimit import RateLimiter
+from gistyc.testing import FakeGistAPI
+
+# Set the file paths of the sample files
+CORE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+CSAMPLE_FILE_PATH = os.path.join(CORE_PATH, "_resources/create", "sample.py")
+USAMPLE_FILE_PATH = os.path.join(CORE_PATH, "_resources/update", "sample.py")
+
+
+def test_group_gist_files():
+    """
+    Testing the reassembly of code block files into local files.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Code block files belong to their core file (if present), ordered by the block index
+    file_names = ["sample_10.py", "sample.py", "sample_2.py", "query_1.sql", "README.md"]
+    assert group_gist_files(file_names) == {
+        "README.md": ["README.md"],
+        "query_1.sql": ["query_1.sql"],
+        "sample.py": ["sample.py", "sample_2.py", "sample_10.py"],
+    }
+
+    # Only files of suffixes with a registered splitter are code blocks
+    file_names = ["notes.txt", "notes_1.txt", "plot.R", "plot_1.R"]
+    assert group_gist_files(file_names) == {
+        "notes.txt": ["notes.txt"],
+        "notes_1.txt": ["notes_1.txt"],
+        "plot.R": ["plot.R", "plot_1.R"],
+    }
+
+    # Joining the blocks reverses the split
+    contents = ["import time\n", "print(time.time())\n", "# TBD"]
+    assert get_splitter("sample.py").join_blocks(contents) == (
+        "import time\n#%%\nprint(time.time())\n#%%\n# TBD"
+    )
+    assert get_splitter("query.sql").join_blocks(["SELECT 1", "SELECT 2\n"]) == (
+        "SELECT 1\n--%%\nSELECT 2\n"
+    )
+
+
+def test_mirror(tmp_path):
+    """
+    Testing the incremental mirror: new GISTs are written (reassembled), unchanged GISTs are
+    skipped, changed GISTs are updated and deleted GISTs are removed.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create a GIST with three code blocks
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            gist_id = gist_api.create_gist(file_name=USAMPLE_FILE_PATH)["id"]
+            mirror = GISTMirror(gist_api, tmp_path, jobs=2)
+
+            # The first run writes the reassembled file
+            results = {result.gist_id: result for result in mirror.run()}
+            assert results[gist_id].action == "CREATE"
+            mirror_file = tmp_path / gist_id / "sample.py"
+            assert results[gist_id].files == [mirror_file]
+            assert mirror_file.read_text() == pathlib.Path(USAMPLE_FILE_PATH).read_text()
+
+            # The second run skips the unchanged GIST
+            results = {result.gist_id: result for result in mirror.run()}
+            assert results[gist_id].action == "UNCHANGED"
+
+            # A changed GIST is fetched again; vanished code blocks vanish locally as well
+            gist_api.update_gist(file_name=CSAMPLE_FILE_PATH, gist_id=gist_id)
+            results = {result.gist_id: result for result in mirror.run()}
+            assert results[gist_id].action == "UPDATE"
+            assert mirror_file.read_text() == pathlib.Path(CSAMPLE_FILE_PATH).read_text()
+
+            # The directory of a deleted GIST is removed
+            assert gist_api.delete_gist(gist_id=gist_id) == 204
+            results = {result.gist_id: result for result in mirror.run()}
+            assert results[gist_id].action == "DELETE"
+            assert not (tmp_path / gist_id).exists()
+
+
+def test_cli_pull_run(tmp_path):
+    """
+    Testing the mirror CLI.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create a GIST and mirror all GISTs
+    with FakeGistAPI() as fake_api:
+        files = gist_body(CSAMPLE_FILE_PATH)["files"]
+        gist_id = fake_api.add_gist({name: file["content"] for name, file in files.items()})
+
+        runner = CliRunner()
+        args = ["--directory", str(tmp_path), "--auth-token", "token", "--no-cache"]
+        result = runner.invoke(gistyc.cli.pull_run, args + ["--api-url", fake_api.url])
+        assert result.exit_code == 0
+        assert f"{gist_id}\nCREATE" in result.output
+        mirror_file = tmp_path / gist_id / "sample.py"
+        assert mirror_file.read_text() == pathlib.Path(CSAMPLE_FILE_PATH).read_text()
+
+
+def test_mirror_full_prune(tmp_path):
+    """
+    Testing that a full mirror run removes GISTs that have been deleted remotely and keeps files
+    of unregistered suffixes apart.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+        gist_id = fake_api.add_gist({"notes.txt": "A\n", "notes_1.txt": "B\n"})
+        other_id = fake_api.add_gist({"sample.py": "A = 1\n"})
+        with gistyc.GISTyc("token", api_url=fake_api.url) as gist_api:
+            mirror = GISTMirror(gist_api, tmp_path, jobs=2)
+            mirror.run()
+            assert (tmp_path / gist_id / "notes_1.txt").read_text() == "B\n"
+
+            # Delete a GIST remotely; a full run fetches all GISTs and prunes the deleted one
+            with gistyc.GISTyc(
+                "token", api_url=fake_api.url, rate_limiter=RateLimiter(mutation_interval=0.0)
+            ) as other_api:
+                assert other_api.delete_gist(gist_id=other_id) == 204
+            results = {result.gist_id: result.action for result in mirror.run(full=True)}
+            assert results == {gist_id: "UPDATE", other_id: "DELETE"}
+            assert not (tmp_path / other_id).exists()
+            assert other_id not in mirror.load_state()
@@ -0,0 +1,101 @@
+"""Testing suite for the rate limit scheduler."""
+
+# Import standard libraries
+from email.utils import formatdate
+import time
+
+# Import GISTyc
+from gistyc.ratelimit import RateLimiter
+
+
+def test_ratelimit_budget():
+    """
+    Testing the budget tracking based on the rate limit headers.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Initiate the scheduler and update it with a response
+    rate_limiter = RateLimiter()
+    reset = time.time() + 100
+    headers = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "4999",
+        "X-RateLimit-Reset": str(reset),
+    }
+    assert rate_limiter.update(200, headers, attempt=0) is None
+
+    # Check the budget
+    budget = rate_limiter.budget
+    assert (budget.limit, budget.remaining, budget.reset, budget.retries) == (5000, 4999, reset, 0)
+
+    # An exhausted budget delays the next request until the reset
+    rate_limiter.update(200, {**headers, "X-RateLimit-Remaining": "0"}, attempt=0)
+    assert 90 < rate_limiter.reserve("GET") <= 100
+
+
+def test_ratelimit_mutation_spacing():
+    """
+    Testing the spacing of content-creating requests. Other requests are not delayed.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Initiate the scheduler with an interval of 10 seconds
+    rate_limiter = RateLimiter(mutation_interval=10.0)
+
+    # The first content-creating request is sent immediately, the following ones are spaced
+    assert rate_limiter.reserve("POST") == 0.0
+    assert 9.0 < rate_limiter.reserve("PATCH") <= 10.0
+    assert 19.0 < rate_limiter.reserve("DELETE") <= 20.0
+
+    # GET requests are not delayed
+    assert rate_limiter.reserve("GET") == 0.0
+
+
+def test_ratelimit_retry():
+    """
+    Testing the retry decisions for rate limited responses.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Initiate the scheduler
+    rate_limiter = RateLimiter(max_retries=2, backoff_base=1.0, backoff_max=60.0)
+
+    # Regular errors are not retried
+    assert rate_limiter.update(404, {}, attempt=0) is None
+    assert rate_limiter.update(403, {}, attempt=0, message="Forbidden") is None
+
+    # The server's Retry-After header is used (delay in seconds or an HTTP date)
+    assert rate_limiter.update(429, {"Retry-After": "7"}, attempt=0) == 7.0
+    retry_date = formatdate(time.time() + 30, usegmt=True)
+    assert 25.0 < rate_limiter.update(429, {"Retry-After": retry_date}, attempt=0) <= 30.0
+    past_date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert rate_limiter.update(429, {"Retry-After": past_date}, attempt=0) == 0.0
+
+    # An invalid Retry-After header falls back to the exponential backoff with jitter
+    assert 0.5 <= rate_limiter.update(429, {"Retry-After": "soon"}, attempt=0) <= 1.0
+
+    # Secondary rate limits are retried with an exponential backoff with jitter
+    delay = rate_limiter.update(403, {}, attempt=1, message="secondary rate limit exceeded")
+    assert 1.0 <= delay <= 2.0
+
+    # The number of retries is limited
+    assert rate_limiter.update(429, {}, attempt=2) is None
+    assert rate_limiter.budget.retries == 5
+
+    # Server errors are only retried for idempotent methods (if the method is provided)
+    assert rate_limiter.update(503, {}, attempt=0) is None
+    assert rate_limiter.update(503, {}, attempt=0, method="POST") is None
+    assert 0.5 <= rate_limiter.update(502, {}, attempt=0, method="GET") <= 1.0
+    assert rate_limiter.update(500, {}, attempt=2, method="DELETE") is None
@@ -0,0 +1,494 @@
+"""Testing suite for the parallel directory synchronisation."""
+
+# Import standard libraries
+import os
+import pathlib
+
+# Import GISTyc
+import gistyc
+from gistyc.ratelimit import RateLimiter
+from gistyc.sync import FileChange, SyncEngine, parse_name_status
+from gistyc.testing import FakeGistAPI, assert_max_calls
+
+# Set the directory paths of the sample files
+CORE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+UDIR = os.path.join(CORE_PATH, "_resources/update_dir")
+
+
+def test_sync_engine():
+    """
+    Testing the parallel creation of GISTs from a directory. A second run reports all files as
+    unchanged.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Get the sample files
+    file_names = sorted(pathlib.Path(UDIR).rglob("*.py"))
+
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+
+        # Initiate the GISTyc class and the sync engine
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            sync_engine = SyncEngine(gist_api, jobs=2)
+
+            # Create the GISTs; the results keep the order of the input files
+            callback_results = []
+            results = sync_engine.run(file_names, callback=callback_results.append)
+            assert [result.file_name for result in results] == file_names
+            assert [result.action for result in results] == ["CREATE", "CREATE"]
+            assert sorted(callback_results, key=lambda result: result.file_name) == results
+
+            # A second run does not change anything
+            results = sync_engine.run(file_names)
+            assert [result.action for result in results] == ["UNCHANGED", "UNCHANGED"]
+            assert all(result.ok for result in results)
+
+            # Clean up the GISTs
+            for result in results:
+                assert gist_api.delete_gist(gist_id=result.gist_id) == 204
+
+
+def test_sync_engine_error():
+    """
+    Testing the error reporting of the sync engine: a missing file is reported as an error.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+
+        # Initiate the GISTyc class and the sync engine
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            sync_engine = SyncEngine(gist_api, jobs=2)
+
+            # Synchronise a file that does not exist, based on an empty catalog
+            results = sync_engine.run(
+                [pathlib.Path(UDIR, "missing.py")], gist_catalog=gistyc.GISTCatalog()
+            )
+            assert results[0].action == "ERROR"
+            assert not results[0].ok
+
+
+def test_sync_engine_manifest(tmp_path):
+    """
+    Testing the incremental synchronisation with the sync manifest: unchanged files are skipped
+    without any REST API call; only changed files are compared and updated.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Copy the sample files to a temporary directory
+    sample_dir = tmp_path / "samples"
+    sample_dir.mkdir()
+    for python_filepath in pathlib.Path(UDIR).rglob("*.py"):
+        (sample_dir / python_filepath.name).write_text(python_filepath.read_text())
+    file_names = sorted(sample_dir.glob("*.py"))
+
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+
+        # Initiate the GISTyc class with an index (that contains the sync manifest)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            sync_engine = SyncEngine(gist_api, jobs=2)
+
+            # Create the GISTs
+            results = sync_engine.run(file_names)
+            assert [result.action for result in results] == ["CREATE", "CREATE"]
+
+            # A second run does not need the REST API at all
+            calls = []
+            gist_api.session.hooks["response"].append(lambda resp, **kwargs: calls.append(resp))
+            results = sync_engine.run(file_names)
+            assert [result.action for result in results] == ["UNCHANGED", "UNCHANGED"]
+            assert calls == []
+
+            # Change a single file: only its GIST is compared and updated (without a listing)
+            with open(file_names[1], "a") as file_obj:
+                file_obj.write("\nTEST = 2\n")
+            results = sync_engine.run(file_names)
+            assert [result.action for result in results] == ["UNCHANGED", "UPDATE"]
+            assert len(calls) == 2
+
+            # Clean up the GISTs
+            for result in results:
+                assert gist_api.delete_gist(gist_id=result.gist_id) == 204
+
+
+def test_parse_name_status():
+    """
+    Testing the parsing of a "git diff --name-status" output.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Added, modified, deleted, renamed, copied and type-changed files
+    name_status = (
+        "A\tex/a.py\nM\tex/b.py\nD\tex/c.py\nR087\tex/d.py\tex/e.py\nC100\tex/f.py\tex/g.py\n"
+    )
+    name_status += "T\tex/h.py\n\n"
+    changes = parse_name_status(name_status, "/repo")
+    assert changes == [
+        FileChange("A", pathlib.Path("/repo/ex/a.py")),
+        FileChange("M", pathlib.Path("/repo/ex/b.py")),
+        FileChange("D", pathlib.Path("/repo/ex/c.py")),
+        FileChange("R", pathlib.Path("/repo/ex/e.py"), pathlib.Path("/repo/ex/d.py")),
+        FileChange("A", pathlib.Path("/repo/ex/g.py")),
+        FileChange("M", pathlib.Path("/repo/ex/h.py")),
+    ]
+
+    # Quoted paths (non-ASCII characters, tabs, quotes) and NUL separated outputs (-z)
+    name_status = 'M\t"ex/caf\\303\\251.py"\nA\t"ex/a\\tb \\"c\\".py"\n'
+    assert parse_name_status(name_status, "/repo") == [
+        FileChange("M", pathlib.Path("/repo/ex/café.py")),
+        FileChange("A", pathlib.Path('/repo/ex/a\tb "c".py')),
+    ]
+    name_status = "M\0ex/café.py\0R100\0ex/old name.py\0ex/new\tname.py\0D\0ex/c.py\0"
+    assert parse_name_status(name_status, "/repo") == [
+        FileChange("M", pathlib.Path("/repo/ex/café.py")),
+        FileChange(
+            "R", pathlib.Path("/repo/ex/new\tname.py"), pathlib.Path("/repo/ex/old name.py")
+        ),
+        FileChange("D", pathlib.Path("/repo/ex/c.py")),
+    ]
+
+
+def test_sync_engine_changes(tmp_path):
+    """
+    Testing the diff driven synchronisation: a renamed file keeps its GIST, a deleted file's GIST
+    is deleted.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create two files and their GISTs
+    old_path, del_path = tmp_path / "gistyc_old_name.py", tmp_path / "gistyc_deleted.py"
+    old_path.write_text("print(1)\n#%%\nprint(2)\n")
+    del_path.write_text("print(3)\n")
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            sync_engine = SyncEngine(gist_api, jobs=2)
+            results = sync_engine.run([old_path, del_path])
+            assert [result.action for result in results] == ["CREATE", "CREATE"]
+            gist_id = results[0].gist_id
+
+            # Rename one file (with a modified block) and delete the other one
+            new_path = tmp_path / "gistyc_new_name.py"
+            old_path.rename(new_path)
+            new_path.write_text("print(1)\n#%%\nprint(5)\n")
+            del_path.unlink()
+            changes = [FileChange("R", new_path, old_path), FileChange("D", del_path)]
+            results = sync_engine.run_changes(changes)
+            assert [result.action for result in results] == ["RENAME", "DELETE"]
+            assert results[0].gist_id == gist_id
+
+            # The GIST has been renamed and updated
+            gist_files = gist_api.get_catalog().files(gist_id)
+            assert sorted(gist_files) == ["gistyc_new_name.py", "gistyc_new_name_1.py"]
+            assert gist_api.diff_gist(new_path, gist_id=gist_id) == {}
+
+            # The renamed file is unchanged in the next run
+            assert [result.action for result in sync_engine.run([new_path])] == ["UNCHANGED"]
+
+            # Clean up the GIST
+            assert gist_api.delete_gist(gist_id=gist_id) == 204
+
+
+def test_gistyc_sync_many_n_apply(tmp_path):
+    """
+    Testing the batch API: sync many files with one listing, then execute a plan. Each result
+    contains the statistics of its REST API calls.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create two files
+    file_names = [tmp_path / "gistyc_batch_a.py", tmp_path / "gistyc_batch_b.py"]
+    for file_name in file_names:
+        file_name.write_text(f"print('{file_name.stem}')\n")
+
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+
+            # Create the GISTs: one listing, one POST per file
+            results = gist_api.sync_many(file_names, jobs=2)
+            assert [result.action for result in results] == ["CREATE", "CREATE"]
+            assert all(result.status_code == 201 and result.requests == 1 for result in results)
+            assert all(result.bytes_sent > 0 and result.latency > 0 for result in results)
+
+            # Update the first file with the known changed files and delete the second GIST
+            file_names[0].write_text("print('updated')\n")
+            plan = [
+                gistyc.PlanItem("UPDATE", file_names[0], gist_id=results[0].gist_id),
+                gistyc.PlanItem("DELETE", file_names[1], gist_id=results[1].gist_id),
+                gistyc.PlanItem("UNCHANGED", tmp_path / "other.py"),
+            ]
+            results = gist_api.apply(plan)
+            assert [result.action for result in results] == ["UPDATE", "DELETE", "UNCHANGED"]
+            assert [result.status_code for result in results] == [200, 204, None]
+            assert results[2].requests == 0
+
+            # Clean up the GIST
+            assert gist_api.delete_gist(gist_id=results[0].gist_id) == 204
+
+
+def test_sync_engine_plan(tmp_path):
+    """
+    Testing the dry-run planner: creates and diffs (files with a GIST, but without a manifest
+    entry) are planned with estimated requests and payload sizes, without any content-creating
+    request. Applying the plan executes it.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create one GIST; a second file is new
+    old_file, new_file = tmp_path / "gistyc_plan_old.py", tmp_path / "gistyc_plan_new.py"
+    old_file.write_text("print(1)\n")
+    new_file.write_text("print(2)\n#%%\nprint(3)\n")
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            gist_id = gist_api.create_gist(old_file)["id"]
+            sync_engine = SyncEngine(gist_api, jobs=2)
+
+            # Compute the plan; only the listing is requested
+            methods = []
+            gist_api.session.hooks["response"].append(
+                lambda resp, **kwargs: methods.append(resp.request.method)
+            )
+            sync_plan = sync_engine.plan([old_file, new_file])
+            assert set(methods) == {"GET"}
+            assert [(item.action, item.gist_id) for item in sync_plan.items] == [
+                ("DIFF", gist_id),
+                ("CREATE", None),
+            ]
+            assert sync_plan.requests == 3
+            assert (
+                sync_plan.payload_bytes == sum(item.payload_bytes for item in sync_plan.items) > 0
+            )
+            assert sync_plan.to_dict()["items"][1]["file_name"] == str(new_file)
+            assert sync_plan.conflicts == {}
+
+            # Execute the plan; the unchanged GIST is not updated
+            results = sync_engine.apply(sync_plan.items)
+            assert [result.action for result in results] == ["UNCHANGED", "CREATE"]
+
+            # Clean up the GISTs
+            for result in results:
+                assert gist_api.delete_gist(gist_id=result.gist_id) == 204
+
+
+def test_sync_engine_listing_budget(tmp_path):
+    """
+    Testing that a directory run lists the GISTs once: the GIST IDs of existing files are taken
+    from the listing and created GISTs are added to it.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+
+        # Five files with existing (outdated) GISTs, a new file and a new file name twice
+        file_names = []
+        for index in range(5):
+            fake_api.add_gist({f"file{index}.py": "OLD = 1\n"})
+            file_names.append(tmp_path / f"file{index}.py")
+            file_names[-1].write_text(f"NEW = {index}\n")
+        file_names.append(tmp_path / "new.py")
+        file_names[-1].write_text("NEW = 1\n")
+        for sub_dir in ("a", "b"):
+            (tmp_path / sub_dir).mkdir()
+            file_names.append(tmp_path / sub_dir / "dup.py")
+            file_names[-1].write_text("DUP = 1\n")
+
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            sync_engine = SyncEngine(gist_api, jobs=4)
+
+            # One listing page, GET + PATCH per existing file and one create (the dup.py files
+            # share their GIST file name and are conflicts)
+            with assert_max_calls(gist_api, 12) as call_log:
+                results = sync_engine.run(file_names)
+        assert [result.action for result in results[:6]] == ["UPDATE"] * 5 + ["CREATE"]
+        assert [result.action for result in results[6:]] == ["ERROR", "ERROR"]
+        assert call_log.count("GET /gists") == 1
+        assert call_log.count("POST") == 1
+
+
+def test_sync_engine_name_conflicts(tmp_path):
+    """
+    Testing that files that share their GIST file name are reported as conflicts and are not
+    merged into a single GIST.
+
+    Returns
+    -------
+    None.
+
+    """
+    file_names = []
+    for sub_dir in ("a", "b"):
+        (tmp_path / sub_dir).mkdir()
+        file_names.append(tmp_path / sub_dir / "utils.py")
+        file_names[-1].write_text(f"DIR = {sub_dir!r}\n")
+
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+            sync_engine = SyncEngine(gist_api)
+
+            sync_plan = sync_engine.plan(file_names)
+            assert not sync_plan.items
+            assert sync_plan.conflicts == {
+                file_names[0]: [str(file_names[1])],
+                file_names[1]: [str(file_names[0])],
+            }
+
+            results = sync_engine.run(file_names)
+        assert [result.action for result in results] == ["ERROR", "ERROR"]
+        assert all("shared with" in result.error for result in results)
+        assert not fake_api.gists
+
+
+def test_sync_engine_stale_manifest(tmp_path):
+    """
+    Testing that a GIST that has been deleted remotely is recreated and its stale manifest entry
+    is replaced.
+
+    Returns
+    -------
+    None.
+
+    """
+    file_name = tmp_path / "stale.py"
+    file_name.write_text("A = 1\n")
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            sync_engine = SyncEngine(gist_api)
+            (result,) = sync_engine.run([file_name])
+            assert result.action == "CREATE"
+
+            # Delete the GIST by another client and change the file
+            with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as other:
+                assert other.delete_gist(gist_id=result.gist_id) == 204
+            file_name.write_text("A = 2\n")
+
+            # The manifest entry is dropped and a new GIST is created
+            (new_result,) = sync_engine.run([file_name])
+            assert new_result.action == "CREATE" and new_result.gist_id != result.gist_id
+            entry = gist_api.index.get_manifest([str(file_name.resolve())])
+            assert entry[str(file_name.resolve())].gist_id == new_result.gist_id
+            assert fake_api.gists[new_result.gist_id]["files"]["stale.py"]["content"] == "A = 2\n"
+
+
+def test_sync_engine_plan_manifest(tmp_path):
+    """
+    Testing that the planner labels files by their manifest state: changed files with a known
+    GIST are updates, files without a manifest entry need a diff.
+
+    Returns
+    -------
+    None.
+
+    """
+    known_file, unknown_file = tmp_path / "known.py", tmp_path / "unknown.py"
+    known_file.write_text("A = 1\n")
+    unknown_file.write_text("B = 1\n")
+    with FakeGistAPI() as fake_api:
+        unknown_id = fake_api.add_gist({"unknown.py": "B = 1\n"})
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            sync_engine = SyncEngine(gist_api)
+            (result,) = sync_engine.run([known_file])
+            known_file.write_text("A = 2\n")
+
+            # The known file changed; the unknown file may or may not differ from its GIST
+            sync_plan = sync_engine.plan([known_file, unknown_file])
+            assert [(item.action, item.gist_id) for item in sync_plan.items] == [
+                ("UPDATE", result.gist_id),
+                ("DIFF", unknown_id),
+            ]
+
+            # Applying the plan compares the unknown file; it is not updated
+            results = sync_engine.apply(sync_plan.items)
+            assert [result.action for result in results] == ["UPDATE", "UNCHANGED"]
+
+
+def test_sync_engine_apply_manifest(tmp_path):
+    """
+    Testing the manifest of applied plans: it stores the state of the uploaded and compared files
+    (also if a file vanishes after its upload) and an already deleted GIST (404) is deleted.
+
+    Returns
+    -------
+    None.
+
+    """
+    gone_file, kept_file = tmp_path / "gone.py", tmp_path / "kept.py"
+    gone_file.write_text("A = 1\n")
+    kept_file.write_text("B = 1\n")
+    with FakeGistAPI() as fake_api:
+        kept_id = fake_api.add_gist({"kept.py": "B = 1\n"})
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            sync_engine = SyncEngine(gist_api)
+
+            # The file is removed while its GIST is created
+            def _remove_file(event):
+                if event.kind == "request" and event.name == "POST /gists":
+                    gone_file.unlink()
+
+            gist_api.add_hook(_remove_file)
+            results = sync_engine.apply(
+                [gistyc.PlanItem("CREATE", gone_file), gistyc.PlanItem("DIFF", kept_file)]
+            )
+            assert [result.action for result in results] == ["CREATE", "UNCHANGED"]
+            paths = [str(gone_file.resolve()), str(kept_file.resolve())]
+            entries = gist_api.index.get_manifest(paths)
+            assert entries[paths[0]].gist_id == results[0].gist_id
+            assert entries[paths[1]].gist_id == kept_id
+
+            # A GIST that has been deleted remotely is reported as deleted
+            del fake_api.gists[kept_id]
+            kept_file.unlink()
+            (result,) = sync_engine.run_changes([FileChange("D", kept_file)])
+            assert (result.action, result.status_code) == ("DELETE", 404)
+            assert list(gist_api.index.get_manifest(paths)) == [paths[0]]
@@ -0,0 +1,125 @@
+"""Testing suite for the local stand-in of the GIST REST API."""
+
+# Import installed libraries
+import pytest
+import requests
+
+# Import GISTyc
+import gistyc
+from gistyc.ratelimit import RateLimiter
+from gistyc.testing import FakeGistAPI, assert_max_calls
+
+
+def test_fake_api_listing():
+    """
+    Testing the paginated listing of the fake API and its conditional requests.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI(max_per_page=10) as fake_api:
+        gist_ids = fake_api.add_gists(25, files_per_gist=2)
+
+        # The listing is complete, ordered by the update datetime and has no contents
+        with gistyc.GISTyc(auth_token="token", api_url=fake_api.url) as gist_api:
+            gists = gist_api.get_gists()
+        assert [gist["id"] for gist in gists] == gist_ids[::-1]
+        assert sorted(gists[0]["files"]) == ["file24.py", "file24_1.py"]
+        assert "content" not in gists[0]["files"]["file24.py"]
+        # Pages 2 and 3 are fetched concurrently, i.e., in any order
+        assert sorted(call.path for call in fake_api.calls) == [
+            f"/gists?page={page}&per_page=100" for page in (1, 2, 3)
+        ]
+
+        # An unchanged page is answered with 304 and does not count against the rate limit
+        headers = {"Authorization": "token token"}
+        resp = requests.get(f"{fake_api.url}/gists?page=3&per_page=10", headers=headers)
+        assert resp.headers["X-RateLimit-Remaining"] == "4996"
+        headers["If-None-Match"] = resp.headers["ETag"]
+        resp = requests.get(f"{fake_api.url}/gists?page=3&per_page=10", headers=headers)
+        assert resp.status_code == 304
+        assert resp.headers["X-RateLimit-Remaining"] == "4996"
+
+
+def test_fake_api_gists():
+    """
+    Testing the GIST endpoints of the fake API: truncation, revisions, raw downloads and the
+    rate limit.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI(truncate_size=10) as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0, max_retries=0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+
+            # Large contents are truncated and fetched through the raw URL
+            gist_id = fake_api.add_gist({"big.py": "x" * 20 + "\n", "small.py": "y\n"})
+            gist_data = gist_api.get_gist(gist_id)
+            assert gist_data["files"]["big.py"]["truncated"]
+            assert gist_data["files"]["big.py"]["content"] == "x" * 10
+            assert gist_api.get_file_content(gist_id, "big.py") == "x" * 20 + "\n"
+
+            # Updates create new revisions; old revisions stay available
+            revision = gist_data["history"][0]["version"]
+            response_data = gist_api.update_gist(
+                "small.py", gist_id=gist_id, files={"small.py": {"content": "z\n"}}
+            )
+            assert response_data["history"][1]["version"] == revision
+            assert gist_api.get_gist(gist_id, revision)["files"]["small.py"]["content"] == "y\n"
+
+            # Deleted GISTs are gone
+            assert gist_api.delete_gist(gist_id=gist_id) == 204
+            assert gist_api.delete_gist(gist_id=gist_id) == 404
+            assert gist_api.rate_limit.remaining == fake_api.remaining
+
+    # An exhausted budget is answered with 403 (raw downloads are not rate limited)
+    with FakeGistAPI(rate_limit=2) as fake_api:
+        headers = {"Authorization": "token token"}
+        for remaining in ("1", "0"):
+            resp = requests.get(f"{fake_api.url}/gists", headers=headers)
+            assert resp.headers["X-RateLimit-Remaining"] == remaining
+        resp = requests.get(f"{fake_api.url}/gists", headers=headers)
+        assert resp.status_code == 403
+        assert "rate limit exceeded" in resp.json()["message"]
+
+
+def test_assert_max_calls(tmp_path):
+    """
+    Testing the request budgets: an update by file name costs one listing, a GET and a PATCH.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+        fake_api.add_gists(150)
+        gist_id = fake_api.add_gist({"sample.py": "print(1)\n"})
+        file_name = tmp_path / "sample.py"
+        file_name.write_text("print(2)\n")
+
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc("token", api_url=fake_api.url, rate_limiter=rate_limiter) as gist_api:
+
+            # Two listing pages, the GIST and the update
+            with assert_max_calls(gist_api, 4) as call_log:
+                with assert_max_calls(gist_api, 2, "GET /gists"):
+                    gist_api.update_gist(file_name)
+            assert call_log.endpoints() == {
+                "GET /gists": 2,
+                "GET /gists/{gist_id}": 1,
+                "PATCH /gists/{gist_id}": 1,
+            }
+            assert call_log.calls[-1].url == f"{fake_api.url}/gists/{gist_id}"
+            assert not gist_api.hooks
+
+            # Exceeded budgets fail with the trace of the calls
+            with pytest.raises(AssertionError, match="3 calls exceed the budget of 2"):
+                with assert_max_calls(gist_api, 2):
+                    gist_api.update_gist(file_name, gist_id=gist_id, force=True)
+                    gist_api.get_gists()
@@ -0,0 +1,220 @@
+"""Testing suite for the watch mode."""
+
+# Import standard libraries
+import queue
+import threading
+import time
+
+# Import installed libraries
+import pytest
+
+# Import GISTyc
+import gistyc
+from gistyc.ratelimit import RateLimiter
+from gistyc.sync import FileChange, SyncEngine
+from gistyc.testing import FakeGistAPI, assert_max_calls
+from gistyc.watch import DirectoryWatcher
+
+
+def _wait_for(condition, timeout=10.0):
+    """
+    Wait until a condition is met.
+
+    Parameters
+    ----------
+    condition : callable
+        Function without arguments that returns True once the condition is met.
+    timeout : float, optional
+        Timeout in seconds. The default is 10.0.
+
+    Returns
+    -------
+    None.
+
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timeout"
+        time.sleep(0.05)
+
+
+def _watch_n_edit(tmp_path, use_watchdog):
+    """
+    Watch a directory with a GIST and a new file: each save burst is synchronised once.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+    use_watchdog : bool
+        Use file system events instead of polling.
+
+    Returns
+    -------
+    None.
+
+    """
+    watch_dir = tmp_path / "watch"
+    (watch_dir / "sub").mkdir(parents=True)
+    file_name = watch_dir / "sample.py"
+    file_name.write_text("A = 1\n#%%\nB = 1\n")
+
+    with FakeGistAPI() as fake_api:
+        gist_id = fake_api.add_gist({"sample.py": "A = 1\n", "sample_1.py": "B = 1\n"})
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, cache_dir=tmp_path / "cache", rate_limiter=rate_limiter
+        ) as gist_api:
+            watcher = DirectoryWatcher(
+                SyncEngine(gist_api),
+                watch_dir,
+                debounce=0.2,
+                poll_interval=0.05,
+                use_watchdog=use_watchdog,
+            )
+            results = queue.Queue()
+            with assert_max_calls(gist_api, 1, "GET /gists"):
+                thread = threading.Thread(
+                    target=watcher.run, args=(results.put,), kwargs={"initial": True}
+                )
+                thread.start()
+                try:
+                    # The initial synchronisation finds the GIST in the listing
+                    assert results.get(timeout=10).action == "UNCHANGED"
+
+                    # A burst of saves is synchronised once, only the changed block is sent
+                    for value in (2, 3, 40):
+                        file_name.write_text(f"A = 1\n#%%\nB = {value}\n")
+                    result = results.get(timeout=10)
+                    assert (result.action, result.gist_id) == ("UPDATE", gist_id)
+                    assert fake_api.gists[gist_id]["files"]["sample_1.py"]["content"] == "B = 40\n"
+                    patch_call = [call for call in fake_api.calls if call.method == "PATCH"][-1]
+                    assert patch_call.bytes_sent < 80
+
+                    # New files in subdirectories are created without another listing
+                    (watch_dir / "sub" / "new.py").write_text("C = 1\n")
+                    (watch_dir / "notes.txt").write_text("Ignored\n")
+                    assert results.get(timeout=10).action == "CREATE"
+                    assert results.empty()
+
+                    # A moved file renames its GIST (no new GIST is created)
+                    file_name.rename(watch_dir / "renamed.py")
+                    result = results.get(timeout=10)
+                    assert (result.action, result.gist_id) == ("RENAME", gist_id)
+                    assert sorted(fake_api.gists[gist_id]["files"]) == [
+                        "renamed.py",
+                        "renamed_1.py",
+                    ]
+                    assert len(fake_api.gists) == 2
+
+                    # A deleted file drops its manifest entry; its GIST is kept
+                    new_path = str((watch_dir / "sub" / "new.py").resolve())
+                    _wait_for(lambda: gist_api.index.get_manifest([new_path]))
+                    (watch_dir / "sub" / "new.py").unlink()
+                    _wait_for(lambda: not gist_api.index.get_manifest([new_path]))
+                    assert len(fake_api.gists) == 2
+                    assert results.empty()
+                finally:
+                    watcher.stop()
+                    thread.join(timeout=10)
+            assert not thread.is_alive()
+
+
+def test_watch_polling(tmp_path):
+    """
+    Testing the watch mode with the polling fallback.
+
+    Returns
+    -------
+    None.
+
+    """
+    _watch_n_edit(tmp_path, use_watchdog=False)
+
+
+def test_watch_events(tmp_path):
+    """
+    Testing the watch mode with file system events.
+
+    Returns
+    -------
+    None.
+
+    """
+    pytest.importorskip("watchdog")
+    _watch_n_edit(tmp_path, use_watchdog=True)
+
+
+def test_watch_notify(tmp_path):
+    """
+    Testing the coalescing of file events into changes: moves are chained, files moved to another
+    suffix are deleted.
+
+    Returns
+    -------
+    None.
+
+    """
+    watcher = DirectoryWatcher(SyncEngine(gistyc.GISTyc("token")), tmp_path, debounce=0.0)
+    (tmp_path / "c.py").write_text("A = 1\n")
+    (tmp_path / "e.py").write_text("A = 1\n")
+
+    # a.py -> b.py -> c.py is a single move; d.py -> notes.txt is a deletion
+    watcher.notify(tmp_path / "a.py")
+    watcher.notify(tmp_path / "b.py", tmp_path / "a.py")
+    watcher.notify(tmp_path / "c.py", tmp_path / "b.py")
+    watcher.notify(tmp_path / "notes.txt", tmp_path / "d.py")
+    watcher.notify(tmp_path / "e.py")
+    assert watcher._next_batch() == [
+        FileChange("R", tmp_path / "c.py", tmp_path / "a.py"),
+        FileChange("D", tmp_path / "d.py"),
+        FileChange("M", tmp_path / "e.py"),
+    ]
+
+    # The polling detects moves by the inode of the vanished file
+    watcher.scan()
+    (tmp_path / "c.py").rename(tmp_path / "f.py")
+    (tmp_path / "e.py").unlink()
+    assert sorted(watcher.scan(), key=lambda change: change.status) == [
+        FileChange("D", tmp_path / "e.py"),
+        FileChange("R", tmp_path / "f.py", tmp_path / "c.py"),
+    ]
+
+
+def test_watch_error(tmp_path):
+    """
+    Testing that a failed batch is reported as an error and the watcher keeps watching.
+
+    Returns
+    -------
+    None.
+
+    """
+    with FakeGistAPI() as fake_api:
+        rate_limiter = RateLimiter(mutation_interval=0.0)
+        with gistyc.GISTyc(
+            "token", api_url=fake_api.url, retries=0, rate_limiter=rate_limiter
+        ) as gist_api:
+            watcher = DirectoryWatcher(
+                SyncEngine(gist_api), tmp_path, debounce=0.1, poll_interval=0.05, use_watchdog=False
+            )
+            results = queue.Queue()
+            thread = threading.Thread(target=watcher.run, args=(results.put,))
+            thread.start()
+            try:
+                # The listing fails (without retries): the file of the batch is reported
+                time.sleep(0.2)
+                fake_api.fail_next(500)
+                (tmp_path / "first.py").write_text("A = 1\n")
+                result = results.get(timeout=10)
+                assert (result.action, result.file_name) == ("ERROR", tmp_path / "first.py")
+                assert "500" in result.error
+
+                # The next batch fetches the listing again and is synchronised
+                (tmp_path / "first.py").write_text("A = 2\n")
+                assert results.get(timeout=10).action == "CREATE"
+                assert len(fake_api.gists) == 1
+            finally:
+                watcher.stop()
+                thread.join(timeout=10)
+            assert not thread.is_alive()